@@ -0,0 +1,43 @@
+"""add partial indexes for pending checklists and verified user search
+
+Revision ID: 3e9a6f21c845
+Revises: 8b52e1c0d7a3
+Create Date: 2026-10-19 17:05:12.904418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e9a6f21c845'
+down_revision = '8b52e1c0d7a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_checklists_reviewer_pending',
+        'checklists',
+        ['reviewer_id', 'updated_at', 'id'],
+        unique=False,
+        postgresql_include=['review_id', 'type'],
+        postgresql_where=sa.text('completed_at IS NULL'),
+    )
+
+    # pg_trgm is a trusted extension, so the database owner can create it
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_users_verified_search',
+        'users',
+        [sa.text('lower(name) gin_trgm_ops'), sa.text('lower(email) gin_trgm_ops')],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_where=sa.text('email_verified_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_verified_search', table_name='users')
+    op.drop_index('ix_checklists_reviewer_pending', table_name='checklists')
@@ -0,0 +1,89 @@
+"""add answers_mask to checklist_answers
+
+Revision ID: 6a0d2c9e4f17
+Revises: b3e1a7c52d04
+Create Date: 2026-10-19 13:40:02.117694
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a0d2c9e4f17'
+down_revision = 'b3e1a7c52d04'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+# Frozen copy of the AMSTAR 2 shapes and mask encoding of app.utils.amstar and
+# app.utils.answer_codec as of this revision, so later changes to those
+# modules do not change what this migration writes.
+# Options per answer column; checkboxes are numbered column by column.
+QUESTION_COLUMNS = {
+    'q1': (4, 1, 2),
+    'q2': (4, 3, 3),
+    'q3': (3, 2),
+    'q4': (3, 5, 3),
+    'q5': (2, 2),
+    'q6': (2, 2),
+    'q7': (1, 1, 3),
+    'q8': (5, 4, 3),
+    'q9a': (2, 2, 4),
+    'q9b': (2, 2, 4),
+    'q10': (1, 2),
+    'q11a': (3, 3),
+    'q11b': (4, 3),
+    'q12': (2, 3),
+    'q13': (2, 2),
+    'q14': (2, 2),
+    'q15': (1, 3),
+    'q16': (2, 2),
+}
+
+
+def try_encode(question_key, answers):
+    """Bitmask with bit i set when checkbox i is ticked, or None if the shape does not match."""
+    columns = QUESTION_COLUMNS.get(question_key)
+    if columns is None or len(answers) != len(columns):
+        return None
+    if any(len(column) != size for column, size in zip(answers, columns)):
+        return None
+    mask = 0
+    bit = 0
+    for column in answers:
+        for ticked in column:
+            if ticked:
+                mask |= 1 << bit
+            bit += 1
+    return mask
+
+
+def upgrade() -> None:
+    op.add_column('checklist_answers', sa.Column('answers_mask', sa.SmallInteger(), nullable=True))
+
+    # Backfill in keyset-paginated batches so large tables are not loaded at once
+    conn = op.get_bind()
+    last_id = None
+    while True:
+        query = "SELECT id, question_key, answers FROM checklist_answers"
+        params = {"limit": BATCH_SIZE}
+        if last_id is not None:
+            query += " WHERE id > :last_id"
+            params["last_id"] = last_id
+        rows = conn.execute(sa.text(query + " ORDER BY id LIMIT :limit"), params).all()
+        if not rows:
+            break
+        updates = [
+            {"id": row.id, "mask": mask}
+            for row in rows
+            if (mask := try_encode(row.question_key, row.answers)) is not None
+        ]
+        if updates:
+            conn.execute(sa.text("UPDATE checklist_answers SET answers_mask = :mask WHERE id = :id"), updates)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_column('checklist_answers', 'answers_mask')
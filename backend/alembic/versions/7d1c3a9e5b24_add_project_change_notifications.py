@@ -0,0 +1,81 @@
+"""add project change notifications
+
+Revision ID: 7d1c3a9e5b24
+Revises: e2b7c94d1f60
+Create Date: 2026-10-19 20:14:37.261904
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7d1c3a9e5b24'
+down_revision = 'e2b7c94d1f60'
+branch_labels = None
+depends_on = None
+
+NOTIFIED_TABLES = ['checklists', 'checklist_answers', 'checklist_answer_sets']
+
+
+def upgrade() -> None:
+    # Payloads only identify the changed row, well below NOTIFY's 8000 byte
+    # limit; clients fetch the data or pull /projects/{id}/changes
+    # (see app.core.project_events)
+    op.execute("""
+        CREATE FUNCTION notify_project_change() RETURNS trigger AS $$
+        DECLARE
+            rec record;
+            project uuid;
+            checklist uuid;
+            question text;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                rec := OLD;
+            ELSE
+                rec := NEW;
+            END IF;
+            IF TG_TABLE_NAME = 'checklists' THEN
+                -- Answer writes touch updated_at; that is reported by the answer event
+                IF TG_OP = 'UPDATE'
+                   AND NEW.completed_at IS NOT DISTINCT FROM OLD.completed_at
+                   AND NEW.reviewer_id IS NOT DISTINCT FROM OLD.reviewer_id
+                   AND NEW.type IS NOT DISTINCT FROM OLD.type THEN
+                    RETURN NULL;
+                END IF;
+                checklist := rec.id;
+                SELECT r.project_id INTO project FROM reviews r WHERE r.id = rec.review_id;
+            ELSE
+                checklist := rec.checklist_id;
+                IF TG_TABLE_NAME = 'checklist_answers' THEN
+                    question := rec.question_key;
+                END IF;
+                SELECT r.project_id INTO project
+                FROM checklists c JOIN reviews r ON r.id = c.review_id
+                WHERE c.id = checklist;
+            END IF;
+            -- Rows deleted by a cascade from their review have no project left
+            IF project IS NOT NULL THEN
+                PERFORM pg_notify('project_changes', json_build_object(
+                    'project_id', project,
+                    'table', TG_TABLE_NAME,
+                    'op', lower(TG_OP),
+                    'checklist_id', checklist,
+                    'question_key', question,
+                    'sync_version', rec.sync_version
+                )::text);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for table in NOTIFIED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_notify AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION notify_project_change()"
+        )
+
+
+def downgrade() -> None:
+    for table in NOTIFIED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_notify ON {table}")
+    op.execute("DROP FUNCTION notify_project_change()")
@@ -0,0 +1,70 @@
+"""drop redundant indexes
+
+Revision ID: 8b52e1c0d7a3
+Revises: d41f7a3b9e62
+Create Date: 2026-10-19 16:21:48.305512
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b52e1c0d7a3'
+down_revision = 'd41f7a3b9e62'
+branch_labels = None
+depends_on = None
+
+# (index, table, columns) made redundant by a primary key or a wider index
+# with the same leading column(s). Every insert maintained each of these.
+REDUNDANT_INDEXES = [
+    ('ix_users_id', 'users', ['id']),
+    ('ix_projects_id', 'projects', ['id']),
+    ('ix_reviews_id', 'reviews', ['id']),
+    ('ix_checklists_id', 'checklists', ['id']),
+    ('ix_checklist_answers_id', 'checklist_answers', ['id']),
+    # covered by ix_checklist_answers_checklist_question (checklist_id, question_key)
+    ('ix_checklist_answers_checklist_id', 'checklist_answers', ['checklist_id']),
+    # covered by the (project_id, user_id) primary key
+    ('ix_project_members_project_id', 'project_members', ['project_id']),
+    # covered by the (review_id, user_id) primary key
+    ('ix_review_assignments_review_id', 'review_assignments', ['review_id']),
+]
+
+
+def check_unique_emails() -> None:
+    """Abort with the offending addresses if users.email has duplicates."""
+    if context.is_offline_mode():
+        return
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT email, count(*) FROM users GROUP BY email HAVING count(*) > 1 ORDER BY email LIMIT 20"
+    )).all()
+    if duplicates:
+        listed = ', '.join(f'{email} ({count})' for email, count in duplicates)
+        raise RuntimeError(
+            'Cannot create unique index ix_users_email: users.email has duplicates: '
+            f'{listed}. Merge or remove the duplicate accounts and run the upgrade again.'
+        )
+
+
+def upgrade() -> None:
+    # Which duplicate account to keep is not ours to decide, so refuse to
+    # upgrade rather than dedupe
+    check_unique_emails()
+
+    for name, table, _ in REDUNDANT_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+    # 04917d61fe8f recreated ix_users_email as a plain index, leaving emails
+    # unenforced at the database level while the model declares them unique.
+    # One unique index both enforces that and serves lookups by email.
+    op.drop_index('ix_users_email', table_name='users', if_exists=True)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email', table_name='users')
+    op.create_index('ix_users_email', 'users', ['email'], unique=False)
+
+    for name, table, columns in reversed(REDUNDANT_INDEXES):
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
@@ -0,0 +1,29 @@
+"""add seed_state table
+
+Revision ID: b3e1a7c52d04
+Revises: f7c742f02751
+Create Date: 2026-10-19 09:12:41.508213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e1a7c52d04'
+down_revision = 'f7c742f02751'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('seed_state',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('applied_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('seed_state')
@@ -0,0 +1,28 @@
+"""index reviewer checklists by update time
+
+Revision ID: c6d83b0f5a19
+Revises: 3e9a6f21c845
+Create Date: 2026-10-19 17:48:36.551093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6d83b0f5a19'
+down_revision = '3e9a6f21c845'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves the work queue's keyset pages; its leading reviewer_id column
+    # replaces ix_checklists_reviewer_id for the foreign key
+    op.create_index('ix_checklists_reviewer_updated', 'checklists', ['reviewer_id', 'updated_at', 'id'], unique=False)
+    op.drop_index('ix_checklists_reviewer_id', table_name='checklists')
+
+
+def downgrade() -> None:
+    op.create_index('ix_checklists_reviewer_id', 'checklists', ['reviewer_id'], unique=False)
+    op.drop_index('ix_checklists_reviewer_updated', table_name='checklists')
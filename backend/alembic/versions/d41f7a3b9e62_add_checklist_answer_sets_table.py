@@ -0,0 +1,34 @@
+"""add checklist_answer_sets table
+
+Revision ID: d41f7a3b9e62
+Revises: 6a0d2c9e4f17
+Create Date: 2026-10-19 15:02:27.630118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41f7a3b9e62'
+down_revision = '6a0d2c9e4f17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Documents are created lazily on the first write in "document" mode, or
+    # in bulk with `python -m app.utils.answer_storage`, so nothing is
+    # backfilled here.
+    op.create_table('checklist_answer_sets',
+    sa.Column('checklist_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('answers', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['checklist_id'], ['checklists.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('checklist_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('checklist_answer_sets')
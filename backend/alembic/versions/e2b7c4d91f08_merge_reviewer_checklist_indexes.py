@@ -0,0 +1,46 @@
+"""merge reviewer checklist indexes
+
+Revision ID: e2b7c4d91f08
+Revises: a4f8e2c61b37
+Create Date: 2026-10-20 09:12:40.518233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7c4d91f08'
+down_revision = 'a4f8e2c61b37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ix_checklists_reviewer_pending (partial) and ix_checklists_reviewer_updated
+    # had the same key, and every answer write bumps updated_at, so both were
+    # rewritten on the hottest write path. One index with completed_at in its
+    # payload serves the work queue, the pending list (index-only, filtering
+    # on completed_at) and the reviewer_id foreign key.
+    op.create_index(
+        'ix_checklists_reviewer_queue',
+        'checklists',
+        ['reviewer_id', 'updated_at', 'id'],
+        unique=False,
+        postgresql_include=['review_id', 'type', 'completed_at'],
+    )
+    op.drop_index('ix_checklists_reviewer_pending', table_name='checklists')
+    op.drop_index('ix_checklists_reviewer_updated', table_name='checklists')
+
+
+def downgrade() -> None:
+    op.create_index('ix_checklists_reviewer_updated', 'checklists', ['reviewer_id', 'updated_at', 'id'], unique=False)
+    op.create_index(
+        'ix_checklists_reviewer_pending',
+        'checklists',
+        ['reviewer_id', 'updated_at', 'id'],
+        unique=False,
+        postgresql_include=['review_id', 'type'],
+        postgresql_where=sa.text('completed_at IS NULL'),
+    )
+    op.drop_index('ix_checklists_reviewer_queue', table_name='checklists')
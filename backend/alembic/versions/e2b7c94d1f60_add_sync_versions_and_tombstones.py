@@ -0,0 +1,96 @@
+"""add sync versions and tombstones
+
+Revision ID: e2b7c94d1f60
+Revises: c6d83b0f5a19
+Create Date: 2026-10-19 18:32:05.417736
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7c94d1f60'
+down_revision = 'c6d83b0f5a19'
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ['reviews', 'checklists', 'checklist_answers', 'checklist_answer_sets']
+TOMBSTONED_TABLES = ['reviews', 'checklists', 'checklist_answers']
+
+
+def upgrade() -> None:
+    op.create_table('sync_tombstones',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('row_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('sync_version', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sync_tombstones_project_version', 'sync_tombstones', ['project_id', 'sync_version'], unique=False)
+
+    # Existing rows keep version 0 and are picked up by a full sync (since=0).
+    # A constant default adds the column without rewriting the table.
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column('sync_version', sa.BigInteger(), server_default=sa.text('0'), nullable=False))
+
+    # The version is the id of the writing transaction, so it can be compared
+    # with a snapshot's xmin (see app.utils.sync.current_watermark)
+    op.execute("""
+        CREATE FUNCTION sync_bump_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.sync_version := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+        DECLARE
+            project uuid;
+        BEGIN
+            IF TG_TABLE_NAME = 'reviews' THEN
+                project := OLD.project_id;
+            ELSIF TG_TABLE_NAME = 'checklists' THEN
+                SELECT r.project_id INTO project FROM reviews r WHERE r.id = OLD.review_id;
+            ELSE
+                SELECT r.project_id INTO project
+                FROM checklists c JOIN reviews r ON r.id = c.review_id
+                WHERE c.id = OLD.checklist_id;
+            END IF;
+            -- Cascades delete the parent first, so a child deleted with its
+            -- parent finds nothing here and the parent's tombstone covers it
+            IF project IS NOT NULL AND EXISTS (SELECT 1 FROM projects WHERE id = project) THEN
+                INSERT INTO sync_tombstones (project_id, table_name, row_id, sync_version)
+                VALUES (project, TG_TABLE_NAME, OLD.id, pg_current_xact_id()::text::bigint);
+            END IF;
+            RETURN OLD;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for table in VERSIONED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_sync_version BEFORE INSERT OR UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION sync_bump_version()"
+        )
+    for table in TOMBSTONED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_sync_tombstone AFTER DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION sync_record_tombstone()"
+        )
+
+
+def downgrade() -> None:
+    for table in TOMBSTONED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_sync_tombstone ON {table}")
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_sync_version ON {table}")
+        op.drop_column(table, 'sync_version')
+    op.execute("DROP FUNCTION sync_record_tombstone()")
+    op.execute("DROP FUNCTION sync_bump_version()")
+    op.drop_index('ix_sync_tombstones_project_version', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
@@ -4,7 +4,8 @@ from app.api.v1.endpoints import (
     auth_router, users_router,
     projects_router, project_members_router, reviews_router,
     review_assignments_router, checklists_router, checklist_answers_router,
-    electric_proxy_router
+    electric_proxy_router, notifications_router, admin_router,
+    changes_router, sync_router, live_router
 )
 
 api_router = APIRouter()
@@ -21,12 +22,24 @@ api_router.include_router(projects_router, prefix="/projects", tags=["projects"]
 # Include project members endpoints
 api_router.include_router(project_members_router, prefix="/projects", tags=["project-members"])
 
+# Include project notification endpoints
+api_router.include_router(notifications_router, prefix="/projects", tags=["notifications"])
+
+# Include project change feed (delta sync and SSE events) endpoints
+api_router.include_router(changes_router, prefix="/projects", tags=["sync"])
+
+# Include offline journal (batch sync) endpoints
+api_router.include_router(sync_router, prefix="/sync", tags=["sync"])
+
 # Include review endpoints
 api_router.include_router(reviews_router, prefix="/reviews", tags=["reviews"])
 
 # Include review assignment endpoints
 api_router.include_router(review_assignments_router, prefix="/reviews", tags=["review-assignments"])
 
+# Include live review session (WebSocket) endpoints
+api_router.include_router(live_router, prefix="/reviews", tags=["live"])
+
 # Include checklist endpoints
 api_router.include_router(checklists_router, prefix="/checklists", tags=["checklists"])
 
@@ -34,4 +47,7 @@ api_router.include_router(checklists_router, prefix="/checklists", tags=["checkl
 api_router.include_router(checklist_answers_router, prefix="/checklists", tags=["checklist-answers"])
 
 # Include electric proxy endpoints
-api_router.include_router(electric_proxy_router, prefix="/electric-proxy", tags=["electric-proxy"])
\ No newline at end of file
+api_router.include_router(electric_proxy_router, prefix="/electric-proxy", tags=["electric-proxy"])
+
+# Include admin endpoints
+api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
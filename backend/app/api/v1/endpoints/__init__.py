@@ -7,6 +7,11 @@ from .review_assignments import router as review_assignments_router
 from .checklists import router as checklists_router
 from .checklist_answers import router as checklist_answers_router
 from .electric_proxy import router as electric_proxy_router
+from .notifications import router as notifications_router
+from .admin import router as admin_router
+from .changes import router as changes_router
+from .sync import router as sync_router
+from .live import router as live_router
 
 __all__ = [
     "auth_router", 
@@ -17,5 +22,10 @@ __all__ = [
     "review_assignments_router",
     "checklists_router",
     "checklist_answers_router",
-    "electric_proxy_router"
+    "electric_proxy_router",
+    "notifications_router",
+    "admin_router",
+    "changes_router",
+    "sync_router",
+    "live_router"
 ]
@@ -0,0 +1,73 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiler import profile_store
+from app.core.slow_queries import slow_query_log
+from app.models.user import User
+from app.utils.auth import get_current_admin
+
+router = APIRouter()
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(current_user: User = Depends(get_current_admin)):
+    """
+    Recent slow SQL statements recorded by this worker.
+    
+    Returns the raw entries (newest first, with EXPLAIN plans when sampled)
+    and a per-statement summary ordered by total time.
+    """
+    return {
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "summary": slow_query_log.summary(),
+        "entries": slow_query_log.snapshot(),
+    }
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(current_user: User = Depends(get_current_admin)):
+    """
+    Clear this worker's slow query log.
+    """
+    slow_query_log.clear()
+    return None
+
+
+@router.get("/profiles")
+async def get_profiles(current_user: User = Depends(get_current_admin)):
+    """
+    Routes profiled by this worker, with request and sample counts.
+    """
+    return {
+        "enabled": settings.PROFILING_ENABLED,
+        "interval_ms": settings.PROFILING_INTERVAL_MS,
+        "routes": profile_store.summary(),
+    }
+
+
+@router.get("/profiles/collapsed", response_class=PlainTextResponse)
+async def download_profile(
+    route: Optional[str] = Query(None, description='Route as "METHOD /path/template"; all routes if omitted'),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Download aggregated profiles as collapsed stacks.
+    
+    The output can be fed to flamegraph.pl or opened in speedscope.
+    """
+    return PlainTextResponse(
+        profile_store.collapsed(route),
+        headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'},
+    )
+
+
+@router.delete("/profiles", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_profiles(current_user: User = Depends(get_current_admin)):
+    """
+    Clear this worker's aggregated profiles.
+    """
+    profile_store.clear()
+    return None
@@ -1,19 +1,21 @@
+import uuid
 from datetime import datetime, timezone
 from typing import Dict
 
 from app.core.config import settings
+from app.core.revocations import revocations
 from app.db.session import get_session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse, PasswordResetRequest, PasswordResetConfirm
 from app.utils.auth import (
     create_access_token,
-    create_refresh_token,
     generate_verification_code,
     get_password_hash,
     verify_password,
     verify_token,
 )
 from app.utils.email import send_verification_email, send_password_reset_email
+from app.utils.refresh_tokens import issue_refresh_token, revoke_family, revoke_user_tokens, rotate_refresh_token
 from app.utils.validation import is_strong_password
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer
@@ -28,6 +30,22 @@ router = APIRouter()
 security = HTTPBearer(auto_error=False)
 
 
+def set_refresh_cookie(response: Response, refresh_token: str) -> None:
+    """Set the refresh token as an HttpOnly cookie."""
+    response.set_cookie(
+        key="refresh",
+        value=refresh_token,
+        httponly=True,
+        secure=True,
+        samesite="lax",
+        path="/",
+        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS
+        * 24
+        * 60
+        * 60,  # Convert days to seconds
+    )
+
+
 # ---------------- MODELS ----------------
 class TokenResponse(BaseModel):
     accessToken: str
@@ -153,23 +171,13 @@ async def signin(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Email not verified"
         )
 
-    # Create tokens
-    access_token = create_access_token({"sub": str(user.id)})
-    refresh_token = create_refresh_token({"sub": str(user.id)})
+    # Create tokens; the sign-in starts a new refresh token family
+    refresh_token, family_id = await issue_refresh_token(db, user.id)
+    await db.commit()
+    access_token = create_access_token({"sub": str(user.id), "fam": str(family_id)})
 
     # Set refresh token as HttpOnly cookie
-    response.set_cookie(
-        key="refresh",
-        value=refresh_token,
-        httponly=True,
-        secure=True,
-        samesite="lax",
-        path="/",
-        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS
-        * 24
-        * 60
-        * 60,  # Convert days to seconds
-    )
+    set_refresh_cookie(response, refresh_token)
 
     return TokenResponse(accessToken=access_token)
 
@@ -181,7 +189,9 @@ async def refresh_token(
     """
     Refresh access token using refresh token from cookie.
 
-    No request body required. Uses refresh token from HttpOnly cookie.
+    No request body required. Uses refresh token from HttpOnly cookie, which
+    is rotated: the presented token is consumed and its successor set as the
+    new cookie. Revoked sign-ins are rejected before any database access.
     """
     # Get refresh token from cookie
     refresh_token = request.cookies.get("refresh")
@@ -192,25 +202,17 @@ async def refresh_token(
         )
 
     try:
-        # Verify refresh token
+        # Verify refresh token (including the in-memory revocation check)
         payload = verify_token(refresh_token, "refresh")
-        user_id = payload.get("sub")
 
-        if not user_id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
-            )
-
-        # Check if user still exists
-        result = await db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
-            )
+        # Rotate it; tokens of deleted users are gone with the user
+        user_id, family_id, successor = await rotate_refresh_token(db, payload)
+        await db.commit()
+        if successor is not None:
+            set_refresh_cookie(response, successor)
 
         # Create new access token
-        new_access_token = create_access_token({"sub": str(user.id)})
+        new_access_token = create_access_token({"sub": str(user_id), "fam": str(family_id)})
 
         return TokenResponse(accessToken=new_access_token)
 
@@ -221,12 +223,29 @@ async def refresh_token(
 
 
 @router.post("/signout")
-async def signout(response: Response):
+async def signout(
+    request: Request, response: Response, db: AsyncSession = Depends(get_session)
+):
     """
-    Sign out user by clearing refresh token cookie.
+    Sign out user by revoking the sign-in and clearing refresh token cookie.
 
-    No request body required. Clears the refresh token cookie.
+    No request body required. The refresh token family in the cookie is
+    revoked on every worker, which also invalidates the access tokens
+    minted from it. Clears the refresh token cookie.
     """
+    refresh_token = request.cookies.get("refresh")
+    if refresh_token:
+        try:
+            payload = verify_token(refresh_token, "refresh")
+            family_id = uuid.UUID(payload["fam"])
+        except (HTTPException, KeyError, TypeError, ValueError):
+            # Expired, revoked or pre-rotation tokens have nothing to revoke
+            family_id = None
+        if family_id is not None:
+            revoked = await revoke_family(db, family_id)
+            await db.commit()
+            revocations.add(revoked)
+
     response.delete_cookie(key="refresh", path="/", secure=True, samesite="lax")
     return {"message": "Successfully signed out"}
 
@@ -428,7 +447,10 @@ async def reset_password(
     user.password_reset_at = datetime.now(timezone.utc)
     user.password_reset_requested_at = None
     db.add(user)
+    # Sign out every existing session
+    revoked = await revoke_user_tokens(db, user.id)
     await db.commit()
+    revocations.add(revoked)
     
     return {"message": "Password reset successful"}
     
@@ -0,0 +1,124 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import exists, or_, select
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.project_events import format_event, project_events
+from app.db.session import get_session
+from app.models.user import User
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.schemas.sync import ProjectChangesResponse, SyncedAnswer, SyncedChecklist, SyncedReview, Tombstone
+from app.utils.auth import get_current_user
+from app.utils.serialization import ORJSONResponse, rows_to_dicts
+from app.utils.sync import current_watermark, project_changes
+
+router = APIRouter()
+
+
+async def check_can_sync(db: AsyncSession, current_user: User, project_id: UUID) -> None:
+    """Raise 404/403 unless the user owns or is a member of the project."""
+    is_member = exists().where(
+        ProjectMember.project_id == Project.id,
+        ProjectMember.user_id == current_user.id,
+    )
+    result = await db.execute(
+        select(or_(Project.owner_id == current_user.id, is_member)).where(Project.id == project_id)
+    )
+    can_read = result.scalar_one_or_none()
+    
+    if can_read is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    if not can_read:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You must be a project owner or member to sync this project"
+        )
+
+
+@router.get("/{project_id}/changes", response_model=ProjectChangesResponse)
+async def get_project_changes(
+    project_id: UUID,
+    since: int = Query(0, ge=0, description="Watermark from the previous pull; 0 for everything"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Get the reviews, checklists and answers of a project changed since a
+    watermark, and the ones deleted since then.
+    
+    Project owners and members can pull changes. Store the returned
+    `watermark` and send it as `since` next time; rows changed around the
+    watermark may be sent twice, so apply them as upserts. See app.utils.sync.
+    """
+    await check_can_sync(db, current_user, project_id)
+    
+    # Taken before reading, so anything committing meanwhile is pulled next time
+    watermark = await current_watermark(db)
+    changes = await project_changes(db, project_id, since)
+    return ORJSONResponse({
+        "watermark": watermark,
+        "reviews": rows_to_dicts(changes["reviews"], SyncedReview),
+        "checklists": rows_to_dicts(changes["checklists"], SyncedChecklist),
+        "answers": rows_to_dicts(changes["answers"], SyncedAnswer),
+        "deleted": rows_to_dicts(changes["deleted"], Tombstone),
+    })
+
+
+@router.get("/{project_id}/events")
+async def stream_project_events(
+    project_id: UUID,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Stream checklist and answer changes of a project as Server-Sent Events.
+    
+    Project owners and members can subscribe. Each event is named after the
+    changed table (`checklists`, `checklist_answers` or
+    `checklist_answer_sets`) and carries the checklist id, question key and
+    `sync_version`. A `resync` event means events were dropped (the client
+    fell behind or the server reconnected to the database); pull
+    `/projects/{project_id}/changes` to catch up, as after opening the
+    stream. Answers 503 if the server cannot listen for changes right now.
+    See app.core.project_events.
+    """
+    await check_can_sync(db, current_user, project_id)
+    # The stream outlives the request's session; give its connection back now
+    await db.close()
+    
+    try:
+        subscription = await project_events.subscribe(project_id)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Change events are temporarily unavailable",
+            headers={"Retry-After": "5"},
+        )
+    
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+                # Comments keep idle connections open through proxies
+                yield ": keep-alive\n\n" if event is None else format_event(event)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            project_events.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
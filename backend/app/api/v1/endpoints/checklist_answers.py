@@ -1,17 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import exists, func, or_, select
 from uuid import UUID
 
+from app.core.config import settings
 from app.db.session import get_session
 from app.models.user import User
 from app.models.checklist import Checklist
 from app.models.checklist_answer import ChecklistAnswer
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.review import Review
 from app.schemas.checklist import ChecklistAnswerCreate, ChecklistAnswerResponse
+from app.utils.answer_codec import (
+    AMSTAR_ANSWERS_MEDIA_TYPE,
+    PackedAnswer,
+    decode_answers,
+    pack_checklist,
+    try_encode,
+    unpack_checklist,
+)
+from app.utils.answer_storage import load_answers, patch_document
 from app.utils.auth import get_current_user
+from app.utils.etags import checklist_etag, etag_matches, not_modified, set_etag
+from app.utils.serialization import rows_response
 
 router = APIRouter()
 
+_answer_list = TypeAdapter(List[ChecklistAnswerCreate])
+
+_PACKED_RESPONSE = {200: {"content": {AMSTAR_ANSWERS_MEDIA_TYPE: {}}}}
+
+
+def accept_quality(accept: str, media_type: str) -> float:
+    """q-value of ``media_type`` in an Accept header, from its most specific matching range."""
+    main_type = media_type.split("/")[0]
+    best = (-1, 0.0)
+    for media_range in accept.split(","):
+        kind, *params = (part.strip() for part in media_range.split(";"))
+        kind = kind.lower()
+        if kind == media_type:
+            specificity = 2
+        elif kind == f"{main_type}/*":
+            specificity = 1
+        elif kind == "*/*":
+            specificity = 0
+        else:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if specificity > best[0]:
+            best = (specificity, quality)
+    return best[1]
+
+
+def wants_packed(request: Request) -> bool:
+    """
+    Whether the client asked for the compact binary answers format: it must
+    be named explicitly with q > 0 and rank at least as high as JSON, so
+    wildcards and ``;q=0`` keep the JSON default.
+    """
+    accept = request.headers.get("accept", "")
+    if AMSTAR_ANSWERS_MEDIA_TYPE not in accept.lower():
+        return False
+    packed = accept_quality(accept, AMSTAR_ANSWERS_MEDIA_TYPE)
+    return packed > 0 and packed >= accept_quality(accept, "application/json")
+
+
+def pack_answers(answers: List[ChecklistAnswer]) -> Optional[bytes]:
+    """The packed checklist, or None if an answer does not fit the AMSTAR shape."""
+    packed: Dict[str, PackedAnswer] = {}
+    for answer in answers:
+        mask = answer.answers_mask
+        if mask is None:
+            mask = try_encode(answer.question_key, answer.answers)
+        if mask is None:
+            return None
+        packed[answer.question_key] = PackedAnswer(mask, answer.critical)
+    return pack_checklist(packed)
+
+
+def packed_response(answers: List[ChecklistAnswer]) -> Response:
+    content = pack_answers(answers)
+    if content is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"Answers cannot be represented in {AMSTAR_ANSWERS_MEDIA_TYPE}"
+        )
+    return Response(content=content, media_type=AMSTAR_ANSWERS_MEDIA_TYPE)
+
 
 @router.post("/{checklist_id}/answers", response_model=ChecklistAnswerResponse, status_code=status.HTTP_201_CREATED)
 async def create_or_update_answer(
@@ -49,6 +135,15 @@ async def create_or_update_answer(
     #         detail="Cannot edit a completed checklist"
     #     )
     
+    if settings.ANSWER_STORAGE == "document":
+        answers = await patch_document(
+            db, checklist_id, {answer_in.question_key: (answer_in.answers, answer_in.critical)}
+        )
+        # Touch the parent checklist to update its updated_at
+        checklist.updated_at = func.now()
+        await db.commit()
+        return next(answer for answer in answers if answer.question_key == answer_in.question_key)
+    
     # Check if the answer for this question already exists
     result = await db.execute(
         select(ChecklistAnswer).where(
@@ -62,9 +157,9 @@ async def create_or_update_answer(
     if existing_answer:
         # Update the existing answer
         existing_answer.answers = answer_in.answers
+        existing_answer.answers_mask = try_encode(answer_in.question_key, answer_in.answers)
         existing_answer.critical = answer_in.critical
         # Touch the parent checklist to update its updated_at
-        from sqlalchemy.sql import func
         checklist.updated_at = func.now()
         await db.commit()
         await db.refresh(existing_answer)
@@ -75,14 +170,167 @@ async def create_or_update_answer(
         checklist_id=checklist_id,
         question_key=answer_in.question_key,
         answers=answer_in.answers,
+        answers_mask=try_encode(answer_in.question_key, answer_in.answers),
         critical=answer_in.critical
     )
     
     db.add(answer)
     # Touch the parent checklist to update its updated_at
-    from sqlalchemy.sql import func
     checklist.updated_at = func.now()
     await db.commit()
     await db.refresh(answer)
     
-    return answer
\ No newline at end of file
+    return answer
+
+
+@router.get("/{checklist_id}/answers", response_model=List[ChecklistAnswerResponse], responses=_PACKED_RESPONSE)
+async def get_answers(
+    checklist_id: UUID,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Get every answer of a checklist.
+    
+    Project owners and members can read answers. Send
+    `Accept: application/vnd.corates.amstar-answers` for the bit-packed
+    encoding described in app.utils.answer_codec instead of JSON.
+    
+    Responses carry the checklist's weak ETag; If-None-Match with the
+    current one returns 304 without loading the answers.
+    """
+    is_member = exists().where(
+        ProjectMember.project_id == Review.project_id,
+        ProjectMember.user_id == current_user.id,
+    )
+    result = await db.execute(
+        select(
+            Checklist.id,
+            Checklist.updated_at,
+            Checklist.completed_at,
+            Checklist.reviewer_id,
+            or_(Project.owner_id == current_user.id, is_member).label("can_read"),
+        )
+        .join(Review, Review.id == Checklist.review_id)
+        .join(Project, Project.id == Review.project_id)
+        .where(Checklist.id == checklist_id)
+    )
+    row = result.one_or_none()
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Checklist not found"
+        )
+    
+    if not row.can_read:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You must be a project owner or member to read answers"
+        )
+    
+    etag = checklist_etag(row)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    answers = await load_answers(db, checklist_id)
+    
+    if wants_packed(request):
+        response = packed_response(answers)
+    else:
+        response = rows_response(answers, ChecklistAnswerResponse)
+    # Both representations share the weak ETag, so caches must key on Accept
+    response.headers["Vary"] = "Accept"
+    return set_etag(response, etag)
+
+
+@router.put("/{checklist_id}/answers", response_model=List[ChecklistAnswerResponse], responses=_PACKED_RESPONSE)
+async def save_answers(
+    checklist_id: UUID,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Create or update several answers of a checklist at once.
+    
+    The body is either a JSON list of answers (as for POST) or, with
+    `Content-Type: application/vnd.corates.amstar-answers`, the bit-packed
+    encoding. Questions not in the body are left unchanged. The response
+    lists every answer of the checklist, negotiated like GET, except that
+    answers which cannot be packed are returned as JSON instead of a 406.
+    
+    Only the assigned reviewer can save answers.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        if content_type == AMSTAR_ANSWERS_MEDIA_TYPE:
+            incoming = {
+                key: (decode_answers(key, packed.mask), packed.mask, packed.critical)
+                for key, packed in unpack_checklist(body).items()
+            }
+        elif content_type == "application/json":
+            incoming = {
+                item.question_key: (item.answers, try_encode(item.question_key, item.answers), item.critical)
+                for item in _answer_list.validate_json(body)
+            }
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Send application/json or {AMSTAR_ANSWERS_MEDIA_TYPE}"
+            )
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    
+    result = await db.execute(select(Checklist).where(Checklist.id == checklist_id))
+    checklist = result.scalar_one_or_none()
+    
+    if not checklist:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Checklist not found"
+        )
+    
+    if checklist.reviewer_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the assigned reviewer can create or update answers"
+        )
+    
+    if settings.ANSWER_STORAGE == "document":
+        answers = await patch_document(
+            db, checklist_id, {key: (grid, critical) for key, (grid, _, critical) in incoming.items()}
+        )
+    else:
+        result = await db.execute(select(ChecklistAnswer).where(ChecklistAnswer.checklist_id == checklist_id))
+        existing = {answer.question_key: answer for answer in result.scalars().all()}
+        
+        for question_key, (grid, mask, critical) in incoming.items():
+            answer = existing.get(question_key)
+            if answer is None:
+                answer = existing[question_key] = ChecklistAnswer(checklist_id=checklist_id, question_key=question_key)
+                db.add(answer)
+            answer.answers = grid
+            answer.answers_mask = mask
+            answer.critical = critical
+    
+    if incoming:
+        # Touch the parent checklist to update its updated_at
+        checklist.updated_at = func.now()
+    await db.commit()
+    
+    if settings.ANSWER_STORAGE != "document":
+        # Reload so server-side updated_at values are current
+        answers = await load_answers(db, checklist_id)
+    
+    # The write is committed, so an answer that cannot be packed falls back
+    # to JSON rather than reporting a 406 for a save that succeeded
+    content = pack_answers(answers) if wants_packed(request) else None
+    if content is not None:
+        response = Response(content=content, media_type=AMSTAR_ANSWERS_MEDIA_TYPE)
+    else:
+        response = rows_response(answers, ChecklistAnswerResponse)
+    response.headers["Vary"] = "Accept"
+    return response
@@ -1,20 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
+from sqlalchemy import exists, or_, select, text
 from uuid import UUID
 from datetime import datetime
 
 from app.db.session import get_session
 from app.models.user import User
+from app.models.project import Project
+from app.models.project_member import ProjectMember
 from app.models.review import Review
 from app.models.checklist import Checklist
 from app.models.review_assignment import ReviewAssignment
-from app.schemas.checklist import ChecklistCreate, ChecklistResponse, ChecklistUpdate
+from app.schemas.checklist import (
+    ChecklistAnswerResponse,
+    ChecklistBatchRequest,
+    ChecklistBatchResponse,
+    ChecklistCreate,
+    ChecklistResponse,
+    ChecklistUpdate,
+    ChecklistWithAnswersResponse,
+    VersionedChecklistResponse,
+)
+from app.utils.answer_storage import load_answers, load_answers_many
 from app.utils.auth import get_current_user
+from app.utils.etags import checklist_etag, etag_matches, not_modified, same_etag, set_etag
+from app.utils.serialization import ORJSONResponse, row_to_dict, rows_to_dicts, schema_fields
 
 router = APIRouter()
 
 
+def readable_checklists(current_user: User):
+    """Checklists with a can_read flag: the user owns or is a member of the project."""
+    is_member = exists().where(
+        ProjectMember.project_id == Review.project_id,
+        ProjectMember.user_id == current_user.id,
+    )
+    return (
+        select(Checklist, or_(Project.owner_id == current_user.id, is_member).label("can_read"))
+        .join(Review, Review.id == Checklist.review_id)
+        .join(Project, Project.id == Review.project_id)
+    )
+
+
+def with_answers(checklist: Checklist, answers, model=ChecklistWithAnswersResponse, **extra) -> dict:
+    """Body of ``model`` for a checklist and its answers, built without validation (app.utils.serialization)."""
+    body = row_to_dict(checklist, schema_fields(model, ("answers", *extra)))
+    body["answers"] = rows_to_dicts(answers, ChecklistAnswerResponse)
+    body.update(extra)
+    return body
+
+
 @router.post("", response_model=ChecklistResponse, status_code=status.HTTP_201_CREATED)
 async def create_checklist(
     checklist_in: ChecklistCreate,
@@ -26,11 +61,19 @@ async def create_checklist(
     
     User must be assigned to the review to create a checklist.
     """
-    # Verify the review exists
-    result = await db.execute(select(Review).where(Review.id == checklist_in.review_id))
-    review = result.scalar_one_or_none()
+    # Verify the review exists and look up the reviewer's assignment in one query
+    reviewer_id = checklist_in.reviewer_id or current_user.id
+    result = await db.execute(
+        select(Review.id, ReviewAssignment.user_id)
+        .outerjoin(
+            ReviewAssignment,
+            (ReviewAssignment.review_id == Review.id) & (ReviewAssignment.user_id == reviewer_id)
+        )
+        .where(Review.id == checklist_in.review_id)
+    )
+    row = result.one_or_none()
     
-    if not review:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Review not found"
@@ -44,14 +87,7 @@ async def create_checklist(
         )
 
     # Assign the reviewer to the review if not already assigned
-    reviewer_id = checklist_in.reviewer_id or current_user.id
-    assignment_exists = await db.execute(
-        select(ReviewAssignment).where(
-            ReviewAssignment.review_id == checklist_in.review_id,
-            ReviewAssignment.user_id == reviewer_id
-        )
-    )
-    if not assignment_exists.scalar_one_or_none():
+    if row.user_id is None:
         db.add(ReviewAssignment(review_id=checklist_in.review_id, user_id=reviewer_id))
 
     # Create the checklist
@@ -68,6 +104,81 @@ async def create_checklist(
     return checklist
 
 
+@router.post("/batch", response_model=ChecklistBatchResponse)
+async def get_checklists_batch(
+    batch: ChecklistBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Fetch several checklists at once, returning bodies only for changed ones.
+    
+    Map each checklist id to the ETag the client holds (or null). Checklists
+    whose ETag still matches are listed in `unchanged`; the others come back
+    in full with their new ETag. Unknown and unreadable checklists are listed
+    in `missing`.
+    """
+    ids = list(batch.checklists)
+    result = await db.execute(readable_checklists(current_user).where(Checklist.id.in_(ids)))
+    readable = {row.Checklist.id: row.Checklist for row in result.all() if row.can_read}
+    
+    unchanged = []
+    changed = {}
+    for checklist_id, checklist in readable.items():
+        etag = checklist_etag(checklist)
+        if same_etag(etag, batch.checklists[checklist_id]):
+            unchanged.append(checklist_id)
+        else:
+            changed[checklist_id] = etag
+    
+    answers = await load_answers_many(db, list(changed)) if changed else {}
+    return ORJSONResponse({
+        "changed": [
+            with_answers(readable[checklist_id], answers[checklist_id], VersionedChecklistResponse, etag=etag)
+            for checklist_id, etag in changed.items()
+        ],
+        "unchanged": unchanged,
+        "missing": [checklist_id for checklist_id in ids if checklist_id not in readable],
+    })
+
+
+@router.get("/{checklist_id}", response_model=ChecklistWithAnswersResponse)
+async def get_checklist(
+    checklist_id: UUID,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Get a checklist with all its answers.
+    
+    Project owners and members can read checklists. The response carries a
+    weak ETag; while the checklist is unchanged, sending it back in
+    If-None-Match returns 304 Not Modified without loading the answers.
+    """
+    result = await db.execute(readable_checklists(current_user).where(Checklist.id == checklist_id))
+    row = result.one_or_none()
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Checklist not found"
+        )
+    
+    if not row.can_read:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You must be a project owner or member to read checklists"
+        )
+    
+    etag = checklist_etag(row.Checklist)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    answers = await load_answers(db, checklist_id)
+    return set_etag(ORJSONResponse(with_answers(row.Checklist, answers)), etag)
+
+
 @router.put("/{checklist_id}/complete", response_model=ChecklistResponse)
 async def complete_checklist(
     checklist_id: UUID,
@@ -1,44 +1,75 @@
-from fastapi import APIRouter, Request, Response
-import httpx
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.core.config import settings
+from app.utils.lazy import lazy_import
+
+# Loaded on the first proxied request
+httpx = lazy_import("httpx")
 
 router = APIRouter()
 
 ELECTRIC_URL = "http://electric:3000"
 
+# Tables that stop receiving writes when ANSWER_STORAGE is "document"; a
+# shape of one would silently serve stale data (see app.utils.answer_storage)
+DOCUMENT_MODE_STALE_TABLES = {"checklist_answers"}
+
 @router.get("/{path:path}")
 async def electric_proxy(path: str, request: Request):
     """
     Simple proxy to ElectricSQL with HTTP/2 support.
     Forwards all headers and query parameters to Electric server.
+
+    The body is streamed through as Electric sent it, still compressed if
+    the client's Accept-Encoding let Electric compress it, so the
+    compression middleware leaves it alone.
     """
+    table = request.query_params.get("table", "").rsplit(".", 1)[-1].strip('"')
+    if settings.ANSWER_STORAGE == "document" and table in DOCUMENT_MODE_STALE_TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{table} is not kept up to date with ANSWER_STORAGE=document; read answers through the API and the project change feed",
+        )
+
     # Build the Electric URL
     url = f"{ELECTRIC_URL}/{path}"
-    
-    # Forward query parameters 
+
+    # Forward query parameters
     query_string = str(request.query_params)
     if query_string:
         url = f"{url}?{query_string}"
-    
+
     # Forward headers (excluding host and other hop-by-hop headers)
     headers = {
         key: value for key, value in request.headers.items()
         if key.lower() not in ['host', 'connection', 'transfer-encoding']
     }
-    
+
     # Make the request to ElectricSQL
-    async with httpx.AsyncClient(http2=True, timeout=30.0) as client:
-        response = await client.get(url, headers=headers)
-        
-        # Forward all response headers, especially Electric-specific ones
-        response_headers = {}
-        for key, value in response.headers.items():
-            # Keep all Electric headers and standard headers
-            if key.lower() not in ['content-length', 'transfer-encoding', 'connection']:
-                response_headers[key] = value
-        
-        return Response(
-            content=response.content,
-            status_code=response.status_code,
-            headers=response_headers,
-            media_type=response.headers.get('content-type', 'application/json')
-        )
+    client = httpx.AsyncClient(http2=True, timeout=30.0)
+    try:
+        response = await client.send(client.build_request("GET", url, headers=headers), stream=True)
+    except BaseException:
+        await client.aclose()
+        raise
+
+    # Forward all response headers, especially Electric-specific ones
+    response_headers = {}
+    for key, value in response.headers.items():
+        # Keep all Electric headers and standard headers
+        if key.lower() not in ['content-length', 'transfer-encoding', 'connection']:
+            response_headers[key] = value
+
+    async def close():
+        await response.aclose()
+        await client.aclose()
+
+    return StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        headers=response_headers,
+        media_type=response.headers.get('content-type', 'application/json'),
+        background=BackgroundTask(close)
+    )
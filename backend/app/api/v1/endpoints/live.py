@@ -0,0 +1,147 @@
+import asyncio
+import uuid
+
+from typing import List, Optional, Set
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import exists, or_, select
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.live_hub import Peer, live_hub, presence_entry
+from app.db.session import AsyncSessionLocal, get_session
+from app.models.checklist import Checklist
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.review import Review
+from app.models.user import User
+from app.schemas.live import AnswerPatchMessage, live_message_adapter
+from app.utils.auth import verify_token
+
+router = APIRouter()
+
+# Browsers cannot set headers on WebSockets, and a query string ends up in
+# access logs, so the access token travels as the second offered subprotocol:
+# new WebSocket(url, ["bearer", accessToken])
+BEARER_SUBPROTOCOL = "bearer"
+
+
+def subprotocol_token(subprotocols: List[str]) -> Optional[str]:
+    """The access token offered as ``["bearer", token]``, if any."""
+    if len(subprotocols) == 2 and subprotocols[0] == BEARER_SUBPROTOCOL:
+        return subprotocols[1]
+    return None
+
+
+async def review_checklist_ids(db: AsyncSession, review_id: UUID) -> Set[UUID]:
+    result = await db.execute(select(Checklist.id).where(Checklist.review_id == review_id))
+    return set(result.scalars())
+
+
+async def patch_checklist_allowed(review_id: UUID, checklist_id: UUID, known: Set[UUID], rejected: Set[UUID]) -> bool:
+    """
+    Whether a patch's checklist belongs to the review. Checklists created
+    after joining are picked up by reloading once per unknown id.
+    """
+    if checklist_id in known:
+        return True
+    if checklist_id in rejected:
+        return False
+    async with AsyncSessionLocal() as db:
+        known.update(await review_checklist_ids(db, review_id))
+    if checklist_id in known:
+        return True
+    rejected.add(checklist_id)
+    return False
+
+
+@router.websocket("/{review_id}/live")
+async def review_live_session(
+    websocket: WebSocket,
+    review_id: UUID,
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Live session for merging the checklists of a review.
+
+    Clients authenticate by offering the subprotocols `["bearer", <access
+    token>]`; the server accepts with `bearer`. Project owners and members
+    can join. Clients send `patch` messages
+    (an answer being edited: checklist_id, question_key, answers, critical;
+    the checklist must belong to the review)
+    and `presence` messages (free-form state such as the focused question).
+    The server replies with a `welcome` listing who is present, then sends
+    `batch` frames holding the latest patch per question and presence per
+    participant since the previous frame (null presence: the participant
+    left). Patches are relayed, not saved; the merged answers are saved
+    through the checklist answer endpoints. See app.core.live_hub.
+    """
+    try:
+        token = subprotocol_token(websocket.scope.get("subprotocols", []))
+        if token is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
+        payload = verify_token(token, "access")
+        user_id = uuid.UUID(payload.get("sub"))
+    except (HTTPException, TypeError, ValueError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Could not validate credentials")
+        return
+
+    is_member = exists().where(
+        ProjectMember.project_id == Project.id,
+        ProjectMember.user_id == User.id,
+    )
+    result = await db.execute(
+        select(User.name, or_(Project.owner_id == User.id, is_member).label("can_join"))
+        .select_from(Review)
+        .join(Project, Project.id == Review.project_id)
+        .join(User, User.id == user_id)
+        .where(Review.id == review_id)
+    )
+    row = result.one_or_none()
+    if row is None or not row.can_join:
+        await db.close()
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Review not found or not accessible")
+        return
+    # Patches are only relayed for the review's own checklists
+    checklist_ids = await review_checklist_ids(db, review_id)
+    unknown_checklist_ids: Set[UUID] = set()
+    # The session would otherwise hold a pooled connection for the whole session
+    await db.close()
+
+    await websocket.accept(subprotocol=BEARER_SUBPROTOCOL)
+    peer = Peer(user_id, row.name, websocket.send_text, live_hub.flush_interval)
+    present = await live_hub.join(review_id, peer)
+    await peer.send_message({"type": "welcome", "peer_id": peer.id, "presence": present})
+    sender = asyncio.create_task(peer.run_sender())
+
+    try:
+        while True:
+            text = await websocket.receive_text()
+            if len(text) > settings.LIVE_MAX_MESSAGE_BYTES:
+                await peer.send_message({"type": "error", "detail": "Message too large"})
+                continue
+            try:
+                message = live_message_adapter.validate_json(text)
+            except ValidationError as e:
+                await peer.send_message({"type": "error", "detail": e.errors(include_url=False, include_context=False)})
+                continue
+
+            if isinstance(message, AnswerPatchMessage):
+                if not await patch_checklist_allowed(review_id, message.checklist_id, checklist_ids, unknown_checklist_ids):
+                    await peer.send_message({"type": "error", "detail": "Checklist is not part of this review"})
+                    continue
+                patch = message.model_dump(mode="json", exclude={"type"})
+                live_hub.publish(review_id, patches=[{**patch, "user_id": str(user_id)}], origin=peer.id)
+            else:
+                live_hub.publish(review_id, presence={peer.id: presence_entry(peer, message.state)}, origin=peer.id)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        try:
+            await sender
+        except asyncio.CancelledError:
+            pass
+        live_hub.leave(review_id, peer)
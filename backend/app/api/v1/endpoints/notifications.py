@@ -0,0 +1,47 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from uuid import UUID
+
+from app.db.session import get_session
+from app.models.user import User
+from app.models.project import Project
+from app.utils.auth import get_current_user
+from app.utils.batch_mailer import build_reminder_messages, deliver, get_pending_reviewers
+
+router = APIRouter()
+
+
+@router.post("/{project_id}/reminders", status_code=status.HTTP_202_ACCEPTED)
+async def send_checklist_reminders(
+    project_id: UUID,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Email every reviewer with incomplete checklists in the project.
+    
+    Only the project owner can send reminders. Messages are rendered here and
+    delivered in the background over a single SMTP session.
+    """
+    result = await db.execute(select(Project).where(Project.id == project_id))
+    project = result.scalar_one_or_none()
+    
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    if project.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the project owner can send reminders"
+        )
+    
+    reviewers = await get_pending_reviewers(db, project_id)
+    messages = build_reminder_messages(project.id, project.name, reviewers)
+    background_tasks.add_task(deliver, messages)
+    
+    return {"message": "Reminders queued", "recipients": len(messages)}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
 from typing import List
@@ -10,6 +10,7 @@ from app.models.user import User
 from app.models.project import Project
 from app.utils.auth import get_current_user
 from app.schemas.user import UserSearchResponse
+from app.utils.batch_mailer import send_project_invitations
 
 router = APIRouter()
 
@@ -17,6 +18,7 @@ router = APIRouter()
 @router.post("/{project_id}/members/add-by-email", status_code=status.HTTP_201_CREATED)
 async def add_project_member_by_email(
     project_id: UUID,
+    background_tasks: BackgroundTasks,
     email: EmailStr = Body(..., embed=True),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_session)
@@ -26,6 +28,7 @@ async def add_project_member_by_email(
     
     Only the project owner can add members to the project.
     The user must have a verified email address.
+    Newly added members are sent an invitation email in the background.
     """
     # Verify the project exists and current user is the owner
     result = await db.execute(select(Project).where(Project.id == project_id))
@@ -72,13 +75,20 @@ async def add_project_member_by_email(
     ON CONFLICT (project_id, user_id) DO NOTHING
     """)
     
-    await db.execute(
+    result = await db.execute(
         query,
         {"project_id": project_id, "user_id": user.id, "role": "member"}
     )
     
     await db.commit()
     
+    # Only notify users that were not already members
+    if result.rowcount:
+        background_tasks.add_task(
+            send_project_invitations,
+            project.id, project.name, current_user.name, [(user.email, user.name)]
+        )
+    
     return {
         "message": "User added to project successfully",
         "user": UserSearchResponse(
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
+from sqlalchemy import exists, select, text
 from uuid import UUID
 
 from app.db.session import get_session
 from app.models.user import User
 from app.models.review import Review
 from app.models.project import Project
+from app.models.project_member import ProjectMember
 from app.utils.auth import get_current_user
 
 router = APIRouter()
@@ -24,74 +25,54 @@ async def assign_reviewer(
     
     Only the project owner or project members can assign reviewers.
     """
-    # Verify the review exists
-    result = await db.execute(select(Review).where(Review.id == review_id))
-    review = result.scalar_one_or_none()
+    # Fetch the review's project with every permission check in one query
+    current_is_member = exists().where(
+        ProjectMember.project_id == Project.id,
+        ProjectMember.user_id == current_user.id,
+    )
+    assignee_exists = exists().where(User.id == user_id)
+    assignee_is_member = exists().where(
+        ProjectMember.project_id == Project.id,
+        ProjectMember.user_id == user_id,
+    )
+    result = await db.execute(
+        select(
+            Project.owner_id,
+            current_is_member.label("current_is_member"),
+            assignee_exists.label("assignee_exists"),
+            assignee_is_member.label("assignee_is_member"),
+        )
+        .join(Review, Review.project_id == Project.id)
+        .where(Review.id == review_id)
+    )
+    row = result.one_or_none()
     
-    if not review:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Review not found"
         )
     
-    # Get the project
-    result = await db.execute(select(Project).where(Project.id == review.project_id))
-    project = result.scalar_one_or_none()
-    
-    # Check if current user is project owner
-    is_owner = project.owner_id == current_user.id
-    
-    # If not owner, check if user is a project member
-    if not is_owner:
-        # Query project_members table
-        query = text("""
-        SELECT 1 FROM project_members
-        WHERE project_id = :project_id AND user_id = :user_id
-        """)
-        
-        result = await db.execute(
-            query,
-            {"project_id": project.id, "user_id": current_user.id}
+    # Only the project owner or project members can assign reviewers
+    if row.owner_id != current_user.id and not row.current_is_member:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You must be a project owner or member to assign reviewers"
         )
-        
-        is_member = result.scalar_one_or_none() is not None
-        
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You must be a project owner or member to assign reviewers"
-            )
     
     # Verify the user being assigned exists
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    
-    if not user:
+    if not row.assignee_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
     # Check if the user is a member of the project
-    if user_id != project.owner_id:
-        # Query project_members table
-        query = text("""
-        SELECT 1 FROM project_members
-        WHERE project_id = :project_id AND user_id = :user_id
-        """)
-        
-        result = await db.execute(
-            query,
-            {"project_id": project.id, "user_id": user_id}
+    if user_id != row.owner_id and not row.assignee_is_member:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User must be a project member to be assigned as a reviewer"
         )
-        
-        is_project_member = result.scalar_one_or_none() is not None
-        
-        if not is_project_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User must be a project member to be assigned as a reviewer"
-            )
     
     # Insert into review_assignments table
     query = text("""
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
+from sqlalchemy import delete, exists, func, or_, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from uuid import UUID
 
 from app.db.session import get_session
+from app.models.checklist import Checklist
 from app.models.review import Review
 from app.models.project import Project
+from app.models.project_member import ProjectMember
 from app.models.user import User
-from app.schemas.review import ReviewCreate, ReviewResponse
+from app.schemas.review import ReviewCreate, ReviewResponse, ReviewWithChecklistsResponse
 from app.utils.auth import get_current_user
+from app.utils.etags import etag_matches, make_etag, not_modified, set_etag
 
 router = APIRouter()
 
@@ -71,6 +75,75 @@ async def create_review(
     return review
 
 
+@router.get("/{review_id}", response_model=ReviewWithChecklistsResponse)
+async def get_review(
+    review_id: UUID,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Get a review with its checklists (without answers).
+    
+    Project owners and members can read reviews. The weak ETag covers the
+    review and the version of every checklist in it; If-None-Match with the
+    current one returns 304 before the checklists are loaded.
+    """
+    is_member = exists().where(
+        ProjectMember.project_id == Review.project_id,
+        ProjectMember.user_id == current_user.id,
+    )
+    # Every checklist's version in one string, so the ETag needs no second query
+    checklist_versions = (
+        select(func.string_agg(
+            func.concat_ws(":", Checklist.id, Checklist.updated_at, Checklist.completed_at, Checklist.reviewer_id),
+            aggregate_order_by(",", Checklist.id),
+        ))
+        .where(Checklist.review_id == Review.id)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(
+            Review,
+            or_(Project.owner_id == current_user.id, is_member).label("can_read"),
+            checklist_versions.label("checklist_versions"),
+        )
+        .join(Project, Project.id == Review.project_id)
+        .where(Review.id == review_id)
+    )
+    row = result.one_or_none()
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Review not found"
+        )
+    
+    if not row.can_read:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You must be a project owner or member to read reviews"
+        )
+    
+    review = row.Review
+    etag = make_etag(review.id, review.name, row.checklist_versions)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    result = await db.execute(
+        select(Checklist).where(Checklist.review_id == review_id).order_by(Checklist.id)
+    )
+    set_etag(response, etag)
+    return ReviewWithChecklistsResponse(
+        id=review.id,
+        project_id=review.project_id,
+        name=review.name,
+        created_at=review.created_at,
+        checklists=result.scalars().all()
+    )
+
+
 # Delete a review (only project owner can delete)
 from fastapi import Path
 
@@ -80,22 +153,22 @@ async def delete_review(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_session)
 ):
-    # Fetch the review and its project
-    result = await db.execute(select(Review).where(Review.id == review_id))
-    review = result.scalar_one_or_none()
-    if not review:
+    # Fetch the review together with its project owner
+    result = await db.execute(
+        select(Project.owner_id)
+        .join(Review, Review.project_id == Project.id)
+        .where(Review.id == review_id)
+    )
+    owner_id = result.scalar_one_or_none()
+    if owner_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
 
-    # Fetch the project
-    result = await db.execute(select(Project).where(Project.id == review.project_id))
-    project = result.scalar_one_or_none()
-    if not project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-
     # Only the project owner can delete
-    if project.owner_id != current_user.id:
+    if owner_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the project owner can delete reviews")
 
-    await db.delete(review)
+    # Checklists, answers and assignments go with it via ON DELETE CASCADE,
+    # instead of the ORM loading and deleting each child row
+    await db.execute(delete(Review).where(Review.id == review_id))
     await db.commit()
     return None
\ No newline at end of file
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_session
+from app.models.user import User
+from app.schemas.sync import SyncBatchRequest, SyncBatchResponse
+from app.utils.auth import get_current_user
+from app.utils.sync import apply_operations
+
+router = APIRouter()
+
+
+@router.post("/batch", response_model=SyncBatchResponse)
+async def sync_batch(
+    batch: SyncBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Apply a journal of offline edits in one transaction.
+    
+    Operations are applied in order and each gets a result: `applied` (with
+    the row's new `sync_version`), `conflict` (the answer changed since the
+    client's `base_version`; `current` holds the server's answer) or
+    `rejected`. Replaying a journal is safe: operations already applied are
+    reported as applied again. See app.utils.sync.
+    """
+    results = await apply_operations(db, current_user, batch.operations)
+    await db.commit()
+    return SyncBatchResponse(results=results)
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import status as http_status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func
-from typing import List, Optional
+from sqlalchemy import select, or_, func, null, literal, tuple_
+from typing import List, Literal, Optional
 
 from app.db.session import get_session
+from app.models.checklist import Checklist
+from app.models.project import Project
+from app.models.review import Review
+from app.models.review_assignment import ReviewAssignment
 from app.models.user import User
+from app.schemas.checklist import ChecklistResponse, QueuePageResponse
 from app.schemas.user import UserResponse, UserSearchResponse
+from app.utils.amstar import QUESTION_KEYS
+from app.utils.answer_storage import answered_count
 from app.utils.auth import get_current_user
+from app.utils.pagination import decode_cursor, encode_cursor
 
 router = APIRouter()
 
@@ -30,6 +39,117 @@ async def get_current_user_profile(
     )
 
 
+@router.get("/me/checklists", response_model=List[ChecklistResponse])
+async def get_my_checklists(
+    status: Optional[Literal["pending", "completed"]] = Query(None, description="Only open or only completed checklists"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of checklists to return"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Get the checklists assigned to the current user, most recently updated first.
+    
+    `status=pending` returns the open work queue. It is served by an
+    index-only scan of ix_checklists_reviewer_queue, so it selects only the
+    columns that index holds; completed_at is NULL by definition.
+    """
+    if status == "pending":
+        query = (
+            select(
+                Checklist.id,
+                Checklist.review_id,
+                Checklist.reviewer_id,
+                Checklist.type,
+                null().label("completed_at"),
+                Checklist.updated_at,
+            )
+            .where(Checklist.reviewer_id == current_user.id, Checklist.completed_at.is_(None))
+        )
+    else:
+        query = select(
+            Checklist.id,
+            Checklist.review_id,
+            Checklist.reviewer_id,
+            Checklist.type,
+            Checklist.completed_at,
+            Checklist.updated_at,
+        ).where(Checklist.reviewer_id == current_user.id)
+        if status == "completed":
+            query = query.where(Checklist.completed_at.isnot(None))
+    
+    result = await db.execute(
+        query.order_by(Checklist.updated_at.desc(), Checklist.id.desc()).limit(limit)
+    )
+    return result.all()
+
+
+@router.get("/me/queue", response_model=QueuePageResponse)
+async def get_my_queue(
+    status: Optional[Literal["pending", "completed"]] = Query(None, description="Only open or only completed checklists"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of checklists per page"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Get the current user's work queue: every checklist they are assigned to
+    review, with its review, project and progress, most recently updated first.
+    
+    Pages are keyset-paginated on (updated_at, id) and read one range of
+    the reviewer's checklist index, so every page costs the same however
+    deep it is. A checklist updated while paging moves to the front of the
+    queue and is not repeated on later pages.
+    """
+    query = (
+        select(
+            Checklist.id.label("checklist_id"),
+            Checklist.review_id,
+            Review.name.label("review_name"),
+            Review.project_id,
+            Project.name.label("project_name"),
+            Checklist.type,
+            Checklist.completed_at,
+            Checklist.updated_at,
+            answered_count(Checklist.id).label("answered"),
+            literal(len(QUESTION_KEYS)).label("total"),
+        )
+        .join(
+            ReviewAssignment,
+            (ReviewAssignment.review_id == Checklist.review_id) & (ReviewAssignment.user_id == Checklist.reviewer_id)
+        )
+        .join(Review, Review.id == Checklist.review_id)
+        .join(Project, Project.id == Review.project_id)
+        .where(Checklist.reviewer_id == current_user.id)
+    )
+    if status == "pending":
+        query = query.where(Checklist.completed_at.is_(None))
+    elif status == "completed":
+        query = query.where(Checklist.completed_at.isnot(None))
+    
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        query = query.where(tuple_(Checklist.updated_at, Checklist.id) < tuple_(*after))
+    
+    # One extra row tells whether there is a next page
+    result = await db.execute(
+        query.order_by(Checklist.updated_at.desc(), Checklist.id.desc()).limit(limit + 1)
+    )
+    rows = result.all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].updated_at, rows[-1].checklist_id)
+    
+    return QueuePageResponse(items=rows, next_cursor=next_cursor)
+
+
 @router.get("/search", response_model=List[UserSearchResponse])
 async def search_users(
     q: Optional[str] = Query(None, description="Search query for name or email"),
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -14,6 +15,62 @@ class Settings(BaseSettings):
     API_PREFIX: str = "/api/v1"
     ENV: str = "dev"
     LOG_LEVEL: str = "INFO"
+    SEED_ON_STARTUP: bool = Field(default=False, description="Apply demo seed data during app startup (otherwise run `python -m app.utils.seed`)")
+
+    # Server (python -m app.server)
+    SERVER_HOST: str = Field(default="0.0.0.0", description="Address the production server binds to")
+    SERVER_PORT: int = Field(default=8000, description="Port the production server binds to")
+    WEB_CONCURRENCY: int = Field(default=0, description="Worker processes; 0 starts one per CPU available to the process or container")
+    GRACEFUL_TIMEOUT: int = Field(default=30, description="Seconds workers get to finish in-flight requests on shutdown or restart")
+    KEEPALIVE_TIMEOUT: int = Field(default=5, description="Seconds an idle keep-alive connection is held open")
+
+    # Readiness
+    WARMUP_ENABLED: bool = Field(default=True, description="Warm the pool, hot statements and auth backends before /healthz/ready reports ready")
+    WARMUP_POOL_CONNECTIONS: int = Field(default=5, description="Connections opened during warm-up (capped at the pool size)")
+    WARMUP_RETRY_SECONDS: float = Field(default=2.0, description="Delay before retrying a warm-up step that failed, e.g. while the database is unreachable")
+
+    # Observability
+    METRICS_ENABLED: bool = Field(default=True, description="Record per-request timings, send Server-Timing headers and serve /metrics")
+    METRICS_ALLOWED_IPS: str | list[str] = Field(
+        default="127.0.0.1,::1",
+        description="Comma-separated addresses or CIDR networks allowed to scrape /metrics; others get 404",
+    )
+    QUERY_DEBUG: bool = Field(default=False, description="Dev/test mode: report per-request query counts, budget overruns and repeated statements in X-Query-* headers")
+    QUERY_BUDGET_DEFAULT: int = Field(default=10, description="Statements allowed per request for routes without an explicit budget")
+    N_PLUS_ONE_THRESHOLD: int = Field(default=3, description="Executions of the same statement within one request that are flagged as a likely N+1")
+    SLOW_QUERY_THRESHOLD_MS: float = Field(default=100.0, description="Statements slower than this are kept in the slow query log")
+    SLOW_QUERY_LOG_SIZE: int = Field(default=200, description="Number of slow statements kept in memory per worker")
+    SLOW_QUERY_EXPLAIN: bool = Field(default=False, description="In dev, re-run sampled slow SELECTs with EXPLAIN (ANALYZE, BUFFERS)")
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = Field(default=0.1, description="Fraction of slow SELECTs to explain when SLOW_QUERY_EXPLAIN is on")
+    PROFILING_ENABLED: bool = Field(default=False, description="Install the sampling profiler middleware")
+    PROFILING_SAMPLE_RATE: float = Field(default=0.01, description="Fraction of requests profiled when profiling is enabled")
+    PROFILING_INTERVAL_MS: float = Field(default=2.0, description="Stack sampling interval for profiled requests")
+    PROFILING_TOKEN: str = Field(default="", description="Requests with an X-Profile header equal to this token are always profiled (empty disables)")
+    ADMIN_EMAILS: str | list[str] = Field(
+        default_factory=list,
+        description="Comma-separated list or JSON list of users allowed to use the admin endpoints",
+    )
+
+    # Storage
+    ANSWER_STORAGE: Literal["rows", "document"] = Field(
+        default="rows",
+        description="Checklist answer layout: one row per question (rows) or one JSONB document per checklist (document); document mode stops updating checklist_answers, so Electric shapes of it are refused",
+    )
+
+    # Compression
+    COMPRESSION_ENABLED: bool = Field(default=True, description="Compress JSON and text responses (brotli if installed, else gzip)")
+    COMPRESSION_MIN_BYTES: int = Field(default=1024, description="Responses smaller than this are sent uncompressed")
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6, description="zlib level for gzip responses")
+    COMPRESSION_BROTLI_QUALITY: int = Field(default=4, description="Brotli quality; 4-5 trade a little size for much less CPU than 11")
+
+    # Push events
+    EVENTS_QUEUE_SIZE: int = Field(default=100, description="Events buffered per SSE client; a client that falls further behind is told to resync")
+    EVENTS_HEARTBEAT_SECONDS: float = Field(default=15.0, description="Idle interval after which SSE streams send a keep-alive comment")
+
+    LIVE_FLUSH_INTERVAL_MS: float = Field(default=50.0, description="Live review sockets coalesce outbound patches and presence for this long before sending")
+    LIVE_MAX_MESSAGE_BYTES: int = Field(default=4096, description="Largest message a live review socket accepts from a client")
+    LIVE_NOTIFY_BRIDGE: bool = Field(default=True, description="Relay live review messages between workers via Postgres NOTIFY (not needed with a single worker)")
+    LIVE_PRESENCE_HEARTBEAT_SECONDS: float = Field(default=15.0, description="Workers re-announce their live review participants this often; others drop a silent worker's participants after three missed heartbeats")
 
     # CORS
     ALLOWED_ORIGINS: str | list[str] = Field(
@@ -26,6 +83,7 @@ class Settings(BaseSettings):
     ALGORITHM: str = Field(default="HS256", description="JWT algorithm")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=15, description="Access token expiration in minutes")
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7, description="Refresh token expiration in days")
+    REFRESH_REUSE_GRACE_SECONDS: int = Field(default=10, description="A rotated refresh token presented again within this window is treated as a concurrent refresh, not as theft")
 
     # SMTP Email Settings
     SMTP_HOST: str = Field(default="smtp.gmail.com", description="SMTP server host")
@@ -35,6 +93,7 @@ class Settings(BaseSettings):
     EMAIL_FROM: str = Field(default="", description="Email sender address")
     EMAIL_FROM_NAME: str = Field(default="CoRATES", description="Email sender name")
     FRONTEND_URL: str = Field(default="http://localhost:5173", description="Frontend URL for links in emails")
+    SMTP_RATE_LIMIT_PER_SECOND: float = Field(default=10.0, description="Max bulk emails per second per SMTP relay (0 disables)")
 
     class Config:
         env_file = ".env"
@@ -54,6 +113,10 @@ def get_settings() -> Settings:
     # Normalize ALLOWED_ORIGINS to a list
     if isinstance(settings.ALLOWED_ORIGINS, str):
         settings.ALLOWED_ORIGINS = _as_list(settings.ALLOWED_ORIGINS)
+    if isinstance(settings.ADMIN_EMAILS, str):
+        settings.ADMIN_EMAILS = _as_list(settings.ADMIN_EMAILS)
+    if isinstance(settings.METRICS_ALLOWED_IPS, str):
+        settings.METRICS_ALLOWED_IPS = _as_list(settings.METRICS_ALLOWED_IPS)
     return settings
 
 
@@ -0,0 +1,122 @@
+"""
+Shared Postgres LISTEN connection.
+
+Each worker keeps one dedicated asyncpg connection (outside the SQLAlchemy
+pool) that LISTENs on every channel a feature registered, and dispatches
+notifications to in-process handlers. Handlers run on the event loop and must
+not block. If the connection drops it is re-established with backoff, and
+each channel's ``on_reconnect`` callback is told that notifications may have
+been missed in between.
+"""
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str], None]
+
+# Reconnect backoff, doubled after each failed attempt
+RECONNECT_DELAY = 0.5
+MAX_RECONNECT_DELAY = 30.0
+
+
+def listener_dsn(database_url: str) -> str:
+    """The asyncpg DSN of a SQLAlchemy database URL."""
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class PgListener:
+    """One LISTEN connection per worker, fanned out to in-process handlers."""
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self.handlers: Dict[str, List[Handler]] = {}
+        self.reconnect_handlers: Dict[str, List[Callable[[], None]]] = {}
+        self.connection: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lost: Optional[asyncio.Event] = None
+        self._notify_lock = asyncio.Lock()
+        # Set while LISTENing; lets callers load state without missing notifications
+        self.connected = asyncio.Event()
+
+    async def listen(self, channel: str, handler: Handler, on_reconnect: Optional[Callable[[], None]] = None) -> None:
+        """Register a handler for a channel, starting the connection on first use."""
+        new_channel = channel not in self.handlers
+        self.handlers.setdefault(channel, []).append(handler)
+        if on_reconnect is not None:
+            self.reconnect_handlers.setdefault(channel, []).append(on_reconnect)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        elif new_channel and self.connection is not None and not self.connection.is_closed():
+            await self.connection.add_listener(channel, self._dispatch)
+
+    async def notify(self, channel: str, payload: str) -> bool:
+        """NOTIFY over the LISTEN connection; False if it is not connected."""
+        if self.connection is None or self.connection.is_closed():
+            return False
+        # A connection runs one statement at a time
+        async with self._notify_lock:
+            await self.connection.execute("SELECT pg_notify($1, $2)", channel, payload)
+        return True
+
+    def dispatch(self, channel: str, payload: str) -> None:
+        for handler in self.handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception(f"Notification handler for {channel} failed")
+
+    def _dispatch(self, connection, pid, channel, payload) -> None:
+        self.dispatch(channel, payload)
+
+    async def _connect(self) -> None:
+        self._lost = asyncio.Event()
+        self.connection = await asyncpg.connect(self.dsn)
+        self.connection.add_termination_listener(lambda connection: self._lost.set())
+        for channel in list(self.handlers):
+            await self.connection.add_listener(channel, self._dispatch)
+
+    async def _run(self) -> None:
+        delay = RECONNECT_DELAY
+        connected_before = False
+        while True:
+            try:
+                await self._connect()
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning(f"LISTEN connection failed, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                continue
+
+            delay = RECONNECT_DELAY
+            self.connected.set()
+            if connected_before:
+                for callbacks in self.reconnect_handlers.values():
+                    for callback in callbacks:
+                        callback()
+            connected_before = True
+            await self._lost.wait()
+            self.connected.clear()
+            logger.warning("LISTEN connection lost, reconnecting")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected.clear()
+        if self.connection is not None and not self.connection.is_closed():
+            await self.connection.close()
+        self.connection = None
+
+
+listener = PgListener(listener_dsn(settings.DATABASE_URL))
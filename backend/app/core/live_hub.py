@@ -0,0 +1,308 @@
+"""
+In-process pub/sub for live review sessions.
+
+Reviewers merging checklists of a review join its room over a WebSocket
+(app.api.v1.endpoints.live). Answer patches and presence updates published to
+a room are not sent one by one: each peer keeps the latest patch per
+(checklist, question) and the latest presence per participant, and a sender
+task flushes them as one frame every ``LIVE_FLUSH_INTERVAL_MS``. A burst of
+edits to the same question costs one message, and a slow client only ever
+has one frame's worth of pending state, however far behind it is.
+
+With several workers, participants of one review may sit on different
+workers. Published messages are then also batched per room and relayed with
+``pg_notify`` over the worker's LISTEN connection (app.core.listener); every
+other worker delivers them to its local peers. Relayed presence belongs to
+the worker it came from: each worker re-announces its participants every
+``LIVE_PRESENCE_HEARTBEAT_SECONDS``, and the others drop a worker's
+participants when it goes silent (it crashed or lost its connection) or when
+their own LISTEN connection reconnected, until the next announcement.
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.listener import PgListener, listener
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "review_live"
+
+# NOTIFY payloads must stay below 8000 bytes
+MAX_NOTIFY_BYTES = 7500
+
+# Heartbeats a worker may miss before its participants are dropped
+MISSED_HEARTBEATS = 3
+
+PatchKey = Tuple[str, str]
+
+
+class Batch:
+    """Patches and presence changes coalesced by key, latest wins."""
+
+    __slots__ = ("patches", "presence")
+
+    def __init__(self):
+        self.patches: Dict[PatchKey, dict] = {}
+        # Peer id -> presence, or None once the peer left
+        self.presence: Dict[str, Optional[dict]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.patches or self.presence)
+
+    def add(self, patches: List[dict], presence: Dict[str, Optional[dict]]) -> None:
+        for patch in patches:
+            self.patches[(patch["checklist_id"], patch["question_key"])] = patch
+        self.presence.update(presence)
+
+    def merge(self, newer: "Batch") -> None:
+        self.patches.update(newer.patches)
+        self.presence.update(newer.presence)
+
+    def to_message(self) -> dict:
+        return {"patches": list(self.patches.values()), "presence": self.presence}
+
+
+class Peer:
+    """A participant's connection; ``send`` delivers one text frame."""
+
+    def __init__(self, user_id: UUID, name: str, send: Callable[[str], Awaitable[None]], flush_interval: float):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.name = name
+        self.send = send
+        self.flush_interval = flush_interval
+        self.pending = Batch()
+        self._ready = asyncio.Event()
+        self._send_lock = asyncio.Lock()
+
+    def enqueue(self, patches: List[dict], presence: Dict[str, Optional[dict]]) -> None:
+        self.pending.add(patches, presence)
+        if self.pending:
+            self._ready.set()
+
+    def take(self) -> dict:
+        batch, self.pending = self.pending, Batch()
+        self._ready.clear()
+        return {"type": "batch", **batch.to_message()}
+
+    async def send_message(self, message: dict) -> None:
+        async with self._send_lock:
+            await self.send(json.dumps(message, separators=(",", ":")))
+
+    async def run_sender(self) -> None:
+        """Send pending state until cancelled or the connection fails, at most once per flush interval."""
+        while True:
+            await self._ready.wait()
+            # Debounce: let the rest of a burst coalesce into this frame
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.send_message(self.take())
+            except Exception as e:
+                # The socket is gone; the endpoint's receive loop ends the session
+                logger.debug(f"Live peer {self.id} send failed: {e!r}")
+                return
+
+
+def presence_entry(peer: Peer, state: dict) -> dict:
+    return {"user_id": str(peer.user_id), "name": peer.name, "state": state}
+
+
+def notify_payloads(worker_id: str, review_id: UUID, message: dict) -> Iterator[str]:
+    """JSON payloads for a room's batch, split so each fits in one NOTIFY."""
+    payload = json.dumps({"worker": worker_id, "review_id": str(review_id), **message}, separators=(",", ":"))
+    if len(payload.encode()) <= MAX_NOTIFY_BYTES:
+        yield payload
+        return
+    patches = message["patches"]
+    if len(patches) <= 1 and not message["presence"]:
+        logger.warning(f"Dropping live message for review {review_id}: too large to relay")
+        return
+    if len(patches) > 1:
+        half = len(patches) // 2
+        yield from notify_payloads(worker_id, review_id, {"patches": patches[:half], "presence": message["presence"]})
+        yield from notify_payloads(worker_id, review_id, {"patches": patches[half:], "presence": {}})
+    else:
+        yield from notify_payloads(worker_id, review_id, {"patches": patches, "presence": {}})
+        yield from notify_payloads(worker_id, review_id, {"patches": [], "presence": message["presence"]})
+
+
+class LiveHub:
+    """Rooms of live review peers in this worker, bridged to other workers."""
+
+    def __init__(self, listener: PgListener, bridge: bool, flush_interval: float, heartbeat_interval: float = 15.0):
+        self.listener = listener
+        self.bridge = bridge
+        self.flush_interval = flush_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.rooms: Dict[UUID, Dict[str, Peer]] = {}
+        # Everyone present per review, including peers on other workers
+        self.presence: Dict[UUID, Dict[str, dict]] = {}
+        # Other workers' peers per review, and when each worker was last heard
+        self.remote: Dict[str, Dict[UUID, Set[str]]] = {}
+        self.remote_seen: Dict[str, float] = {}
+        self.outbox: Dict[UUID, Batch] = {}
+        self.worker_id: Optional[str] = None
+        self._bridge_down = False
+        self._bridge_task: Optional[asyncio.Task] = None
+
+    async def _start(self) -> None:
+        # Generated here rather than at import so forked workers differ
+        self.worker_id = uuid.uuid4().hex
+        if self.bridge:
+            await self.listener.listen(CHANNEL, self.receive, on_reconnect=self.resync_remote)
+            self._bridge_task = asyncio.create_task(self._run_bridge())
+
+    async def join(self, review_id: UUID, peer: Peer, state: Optional[dict] = None) -> Dict[str, dict]:
+        """Add a peer to a room; returns who is already present."""
+        if self.worker_id is None:
+            await self._start()
+        present = dict(self.presence.get(review_id, {}))
+        self.rooms.setdefault(review_id, {})[peer.id] = peer
+        self.publish(review_id, presence={peer.id: presence_entry(peer, state or {})}, origin=peer.id)
+        return present
+
+    def leave(self, review_id: UUID, peer: Peer) -> None:
+        room = self.rooms.get(review_id)
+        if room is None or room.pop(peer.id, None) is None:
+            return
+        if not room:
+            del self.rooms[review_id]
+        self.publish(review_id, presence={peer.id: None}, origin=peer.id)
+
+    def publish(
+        self,
+        review_id: UUID,
+        patches: Optional[List[dict]] = None,
+        presence: Optional[Dict[str, Optional[dict]]] = None,
+        origin: Optional[str] = None,
+    ) -> None:
+        """Deliver to the room's local peers (except ``origin``) and queue for other workers."""
+        patches, presence = patches or [], presence or {}
+        self.deliver(review_id, patches, presence, origin)
+        if self.bridge:
+            self.outbox.setdefault(review_id, Batch()).add(patches, presence)
+
+    def deliver(self, review_id: UUID, patches: List[dict], presence: Dict[str, Optional[dict]], origin: Optional[str] = None) -> None:
+        known = self.presence.setdefault(review_id, {})
+        # Only changes go to peers, so re-announced presence costs them nothing
+        changed: Dict[str, Optional[dict]] = {}
+        for peer_id, entry in presence.items():
+            if entry is None:
+                if known.pop(peer_id, None) is not None:
+                    changed[peer_id] = None
+            elif known.get(peer_id) != entry:
+                known[peer_id] = entry
+                changed[peer_id] = entry
+        if not known:
+            del self.presence[review_id]
+        if not (patches or changed):
+            return
+        for peer in self.rooms.get(review_id, {}).values():
+            if peer.id != origin:
+                peer.enqueue(patches, changed)
+
+    def receive(self, payload: str) -> None:
+        """Handle a batch relayed by another worker."""
+        message = json.loads(payload)
+        worker = message.get("worker")
+        if worker == self.worker_id:
+            return
+        self.remote_seen[worker] = time.monotonic()
+        review_id = UUID(message["review_id"])
+        presence = message.get("presence", {})
+        if presence:
+            rooms = self.remote.setdefault(worker, {})
+            owned = rooms.setdefault(review_id, set())
+            for peer_id, entry in presence.items():
+                if entry is None:
+                    owned.discard(peer_id)
+                else:
+                    owned.add(peer_id)
+            if not owned:
+                del rooms[review_id]
+        self.deliver(review_id, message.get("patches", []), presence)
+
+    def drop_worker(self, worker: str) -> None:
+        """Remove the peers another worker announced, as if they had left."""
+        self.remote_seen.pop(worker, None)
+        for review_id, peer_ids in self.remote.pop(worker, {}).items():
+            self.deliver(review_id, [], {peer_id: None for peer_id in peer_ids})
+
+    def expire_remote(self, now: float) -> None:
+        """Drop the peers of workers that missed their heartbeats."""
+        deadline = now - self.heartbeat_interval * MISSED_HEARTBEATS
+        for worker, seen in list(self.remote_seen.items()):
+            if seen < deadline:
+                logger.info(f"Live review worker {worker} went silent; dropping its participants")
+                self.drop_worker(worker)
+
+    def announce(self) -> None:
+        """Queue the presence of every local peer for the other workers."""
+        for review_id, room in self.rooms.items():
+            known = self.presence.get(review_id, {})
+            presence = {peer_id: known[peer_id] for peer_id in room if peer_id in known}
+            if presence:
+                self.outbox.setdefault(review_id, Batch()).add([], presence)
+
+    def resync_remote(self) -> None:
+        """After a LISTEN reconnect, forget remote peers until they are announced again."""
+        for worker in list(self.remote):
+            self.drop_worker(worker)
+        self.remote_seen.clear()
+        self.announce()
+
+    async def flush_outbox(self) -> None:
+        """Relay queued batches; if the bridge is down they are kept for the next flush."""
+        outbox, self.outbox = self.outbox, {}
+        pending = list(outbox.items())
+        for index, (review_id, batch) in enumerate(pending):
+            for payload in notify_payloads(self.worker_id, review_id, batch.to_message()):
+                if not await self.listener.notify(CHANNEL, payload):
+                    if not self._bridge_down:
+                        logger.warning("Live review bridge not connected; relaying once it reconnects")
+                        self._bridge_down = True
+                    self.requeue(pending[index:])
+                    return
+        self._bridge_down = False
+
+    def requeue(self, batches: List[Tuple[UUID, Batch]]) -> None:
+        """Put unsent batches back under anything published since, which is newer."""
+        for review_id, batch in batches:
+            newer = self.outbox.get(review_id)
+            if newer is not None:
+                batch.merge(newer)
+            self.outbox[review_id] = batch
+
+    async def _run_bridge(self) -> None:
+        next_heartbeat = time.monotonic() + self.heartbeat_interval
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            now = time.monotonic()
+            if now >= next_heartbeat:
+                next_heartbeat = now + self.heartbeat_interval
+                self.announce()
+                self.expire_remote(now)
+            if self.outbox:
+                try:
+                    await self.flush_outbox()
+                except Exception:
+                    logger.exception("Failed to relay live review messages")
+
+    async def stop(self) -> None:
+        if self._bridge_task is not None:
+            self._bridge_task.cancel()
+            self._bridge_task = None
+
+
+live_hub = LiveHub(
+    listener,
+    settings.LIVE_NOTIFY_BRIDGE,
+    settings.LIVE_FLUSH_INTERVAL_MS / 1000,
+    settings.LIVE_PRESENCE_HEARTBEAT_SECONDS,
+)
@@ -0,0 +1,166 @@
+"""
+In-process request metrics.
+
+Per-request statistics are collected in a ``RequestStats`` object held in a
+context variable, filled in by the timing middleware (app.middleware.timing)
+and the SQLAlchemy cursor events (app.event_handlers.db_timing). Completed
+requests are aggregated into a small Prometheus-compatible registry that is
+rendered by the /metrics endpoint. Values are per worker process, and the
+endpoint only answers scrapers in METRICS_ALLOWED_IPS (loopback by default).
+"""
+import ipaddress
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class RequestStats:
+    """Timing and query counters for the request being handled."""
+
+    __slots__ = ("scope", "db_statements", "db_time", "statement_counts")
+
+    def __init__(self, scope: Optional[dict] = None, track_statements: bool = False):
+        self.scope = scope
+        self.db_statements = 0
+        self.db_time = 0.0
+        # Executions per normalized statement, only kept for query debugging
+        self.statement_counts: Optional[Dict[str, int]] = {} if track_statements else None
+
+    def record_statement(self, statement: str, duration: float) -> None:
+        self.db_statements += 1
+        self.db_time += duration
+        if self.statement_counts is not None:
+            shape = " ".join(statement.split())
+            self.statement_counts[shape] = self.statement_counts.get(shape, 0) + 1
+
+    @property
+    def route(self) -> Optional[str]:
+        """"METHOD /route/template" once the router has matched the request."""
+        route = self.scope.get("route") if self.scope else None
+        return f"{self.scope['method']} {route.path}" if route is not None else None
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self.values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound:g}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {total:g}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class MetricsRegistry:
+    """Aggregates completed requests by method, route template and status."""
+
+    def __init__(self):
+        route = ("method", "route")
+        self.requests = Counter("http_requests_total", "Total HTTP requests.", route + ("status",))
+        self.duration = Histogram(
+            "http_request_duration_seconds", "Wall time spent handling a request.", route, LATENCY_BUCKETS
+        )
+        self.db_duration = Histogram(
+            "http_request_db_duration_seconds", "Time spent in SQL statements per request.", route, LATENCY_BUCKETS
+        )
+        self.db_statements = Histogram(
+            "http_request_db_statements", "SQL statements executed per request.", route, STATEMENT_BUCKETS
+        )
+        self.request_bytes = Counter("http_request_size_bytes_total", "Request body bytes received.", route)
+        self.response_bytes = Counter("http_response_size_bytes_total", "Response body bytes sent.", route)
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        stats: RequestStats,
+        request_bytes: int,
+        response_bytes: int,
+    ) -> None:
+        labels = (method, route)
+        self.requests.inc(labels + (str(status),))
+        self.duration.observe(labels, duration)
+        self.db_duration.observe(labels, stats.db_time)
+        self.db_statements.observe(labels, stats.db_statements)
+        self.request_bytes.inc(labels, request_bytes)
+        self.response_bytes.inc(labels, response_bytes)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in (
+            self.requests, self.duration, self.db_duration,
+            self.db_statements, self.request_bytes, self.response_bytes,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def scrape_allowed(host: Optional[str], allowed: Iterable[str]) -> bool:
+    """Whether a client address falls in one of the allowed addresses or networks."""
+    if host is None:
+        return False
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    if address.version == 6 and address.ipv4_mapped is not None:
+        address = address.ipv4_mapped
+    return any(address in ipaddress.ip_network(network, strict=False) for network in allowed)
+
+
+registry = MetricsRegistry()
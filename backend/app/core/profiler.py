@@ -0,0 +1,126 @@
+"""
+Statistical request profiler.
+
+While a profiled request is in flight, a background thread samples the stack
+of the thread running it every PROFILING_INTERVAL_MS. Only samples whose
+stack passes through that request's own middleware frame are kept, so time
+the event loop spends idle or running other requests is not attributed to
+it. Samples are aggregated per route as collapsed stacks ("a;b;c 12"), the
+input format of flamegraph.pl, speedscope and inferno.
+
+Work handed to the threadpool (sync endpoints, run_in_executor) runs on other
+threads and is not captured.
+"""
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Dict, List, Optional, Tuple
+
+# Distinct stacks kept per route; further new stacks are counted as truncated
+MAX_STACKS_PER_ROUTE = 5000
+TRUNCATED = ("[truncated]",)
+
+
+def frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}"
+
+
+def collapse(frame: Optional[FrameType], root: FrameType) -> Optional[Tuple[str, ...]]:
+    """
+    Stack from ``root`` down to ``frame``, outermost first, or None when
+    ``root`` is not on the stack.
+    """
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        if frame is root:
+            labels.reverse()
+            return tuple(labels)
+        frame = frame.f_back
+    return None
+
+
+class StackSampler:
+    """Samples one thread's stack below ``root`` until stopped."""
+
+    def __init__(self, thread_id: int, root: FrameType, interval: float):
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        self.root = None
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            stack = collapse(sys._current_frames().get(self.thread_id), self.root)
+            if stack is not None:
+                self.stacks[stack] += 1
+
+
+class RouteProfile:
+    def __init__(self):
+        self.requests = 0
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    def add(self, stacks: Counter) -> None:
+        self.requests += 1
+        for stack, count in stacks.items():
+            self.samples += count
+            if stack in self.stacks or len(self.stacks) < MAX_STACKS_PER_ROUTE:
+                self.stacks[stack] += count
+            else:
+                self.stacks[TRUNCATED] += count
+
+
+class ProfileStore:
+    """Aggregated profiles keyed by "METHOD /route/template"."""
+
+    def __init__(self):
+        self.routes: Dict[str, RouteProfile] = {}
+        self._lock = threading.Lock()
+
+    def add(self, route: str, stacks: Counter) -> None:
+        with self._lock:
+            self.routes.setdefault(route, RouteProfile()).add(stacks)
+
+    def summary(self) -> List[dict]:
+        with self._lock:
+            return [
+                {"route": route, "requests": profile.requests, "samples": profile.samples}
+                for route, profile in sorted(self.routes.items(), key=lambda item: item[1].samples, reverse=True)
+            ]
+
+    def collapsed(self, route: Optional[str] = None) -> str:
+        """
+        Collapsed stack text for one route, or for every route with the route
+        as the root frame.
+        """
+        lines = []
+        with self._lock:
+            for name, profile in self.routes.items():
+                if route is not None and name != route:
+                    continue
+                prefix = () if route is not None else (name,)
+                for stack, count in profile.stacks.items():
+                    lines.append(f"{';'.join(prefix + stack)} {count}")
+        return "\n".join(sorted(lines)) + ("\n" if lines else "")
+
+    def clear(self) -> None:
+        with self._lock:
+            self.routes.clear()
+
+
+profile_store = ProfileStore()
@@ -0,0 +1,113 @@
+"""
+Per-project change events for Server-Sent Events streams.
+
+Triggers on checklists, checklist_answers and checklist_answer_sets
+``pg_notify`` a small JSON payload on the ``project_changes`` channel (see
+migration 7d1c3a9e5b24). The worker's shared LISTEN connection
+(app.core.listener) hands each payload to ``ProjectEvents``, which routes it
+to the subscriptions of that project only.
+
+Every subscription has a bounded queue. A client that cannot keep up is not
+allowed to hold events back or grow memory: its queue is cleared and replaced
+with a single ``resync`` event, after which the client pulls
+``/projects/{id}/changes`` to catch up. The same happens to everyone when the
+LISTEN connection had to reconnect and notifications may have been lost.
+"""
+import asyncio
+import json
+import logging
+from typing import Dict, Optional, Set
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.listener import PgListener, listener
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "project_changes"
+
+RESYNC = {"table": "resync"}
+
+# How long subscribe() waits for the LISTEN connection before failing, so a
+# stream never opens while its notifications would be lost
+CONNECT_TIMEOUT = 10.0
+
+
+class Subscription:
+    """One SSE client's view of a project."""
+
+    def __init__(self, project_id: UUID, max_queued: int):
+        self.project_id = project_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.dropped = 0
+
+    def push(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow: drop what is queued and tell the client to resync
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """The next event, or None if none arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ProjectEvents:
+    """Fan-out of change notifications to the subscriptions of each project."""
+
+    def __init__(self, listener: PgListener, max_queued: int):
+        self.listener = listener
+        self.max_queued = max_queued
+        self.subscriptions: Dict[UUID, Set[Subscription]] = {}
+        self._listening = False
+
+    async def subscribe(self, project_id: UUID) -> Subscription:
+        """
+        A subscription to a project's events, once LISTEN is active; raises
+        asyncio.TimeoutError if the connection does not come up in time.
+        """
+        if not self._listening:
+            self._listening = True
+            await self.listener.listen(CHANNEL, self.dispatch, on_reconnect=self.resync_all)
+        await asyncio.wait_for(self.listener.connected.wait(), CONNECT_TIMEOUT)
+        subscription = Subscription(project_id, self.max_queued)
+        self.subscriptions.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self.subscriptions.get(subscription.project_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscriptions[subscription.project_id]
+
+    def dispatch(self, payload: str) -> None:
+        event = json.loads(payload)
+        try:
+            project_id = UUID(event.pop("project_id"))
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Ignoring malformed {CHANNEL} notification: {payload[:200]}")
+            return
+        for subscription in self.subscriptions.get(project_id, ()):
+            subscription.push(event)
+
+    def resync_all(self) -> None:
+        for subscriptions in self.subscriptions.values():
+            for subscription in subscriptions:
+                subscription.push(RESYNC)
+
+
+def format_event(event: dict) -> str:
+    """An event in text/event-stream framing; the event name is the table."""
+    data = {key: value for key, value in event.items() if key != "table"}
+    return f"event: {event['table']}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+project_events = ProjectEvents(listener, settings.EVENTS_QUEUE_SIZE)
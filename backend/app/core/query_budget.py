@@ -0,0 +1,70 @@
+"""
+Query budgets and N+1 detection for development and tests.
+
+With QUERY_DEBUG enabled, the timing middleware compares each request's SQL
+statements against the budget for its route and looks for the same statement
+shape being executed repeatedly (the usual sign of a per-row lookup in a
+loop). Findings are logged and reported in response headers:
+
+    X-Query-Count            statements executed before the response started
+    X-Query-Budget           the budget that applied to the route
+    X-Query-Budget-Exceeded  present when the budget was exceeded
+    X-Query-Repeated         worst repeated statement shape, e.g. "4x SELECT ..."
+
+The test APIClient fails any request whose budget was exceeded, so a query
+regression in an endpoint fails the tests that exercise it.
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import RequestStats
+
+logger = logging.getLogger(__name__)
+
+# Per-endpoint budgets keyed by "METHOD route template", including the
+# current-user lookup done by authentication. Unlisted routes use
+# settings.QUERY_BUDGET_DEFAULT.
+QUERY_BUDGETS: Dict[str, int] = {
+    "POST /api/v1/reviews/{review_id}/assign/{user_id}": 3,
+    "DELETE /api/v1/reviews/{review_id}": 3,
+    "POST /api/v1/checklists": 5,
+    "GET /api/v1/users/me/checklists": 2,
+    "GET /api/v1/users/me/queue": 2,
+}
+
+# Longest statement text echoed back in X-Query-Repeated
+MAX_SHAPE_LENGTH = 200
+
+
+def get_budget(method: str, route: str) -> int:
+    return QUERY_BUDGETS.get(f"{method} {route}", settings.QUERY_BUDGET_DEFAULT)
+
+
+def repeated_statements(stats: RequestStats, threshold: int) -> List[Tuple[str, int]]:
+    """Statement shapes executed at least ``threshold`` times, most frequent first."""
+    repeated = [(shape, count) for shape, count in stats.statement_counts.items() if count >= threshold]
+    return sorted(repeated, key=lambda item: item[1], reverse=True)
+
+
+def check_request(method: str, route: Optional[str], stats: RequestStats) -> List[Tuple[bytes, bytes]]:
+    """Evaluate a request against its budget; returns headers to add to the response."""
+    budget = get_budget(method, route) if route else settings.QUERY_BUDGET_DEFAULT
+    headers = [
+        (b"x-query-count", str(stats.db_statements).encode()),
+        (b"x-query-budget", str(budget).encode()),
+    ]
+
+    if stats.db_statements > budget:
+        logger.warning(f"Query budget exceeded: {method} {route} ran {stats.db_statements} statements (budget {budget})")
+        headers.append((b"x-query-budget-exceeded", b"1"))
+
+    repeated = repeated_statements(stats, settings.N_PLUS_ONE_THRESHOLD)
+    for shape, count in repeated:
+        logger.warning(f"Possible N+1 in {method} {route}: {count}x {shape}")
+    if repeated:
+        shape, count = repeated[0]
+        value = f"{count}x {shape[:MAX_SHAPE_LENGTH]}"
+        headers.append((b"x-query-repeated", value.encode("latin-1", "replace")))
+
+    return headers
@@ -0,0 +1,164 @@
+"""
+Startup warm-up and readiness.
+
+Liveness (/healthz, /healthz/live) only says the process is serving.
+Readiness (/healthz/ready) stays 503 until this worker has warmed up in the
+background, so a load balancer does not send the first users of a deploy to
+a cold worker. The steps, each timed and retried until it succeeds:
+
+1. revocations: the revoked token index is loaded and kept in sync
+   (app.core.revocations). It runs first and even with warm-up disabled:
+   until it has loaded, tokens of revoked sign-ins would be accepted
+2. seed: apply the seed data, when SEED_ON_STARTUP is set
+3. database: the database answers
+4. pool: WARMUP_POOL_CONNECTIONS connections are opened and left in the pool
+5. statements: the hottest queries, including the principal lookup of
+   get_current_user, are compiled (SQLAlchemy caches per engine) and
+   prepared on every pooled connection (asyncpg caches per connection)
+6. auth: the JWT and bcrypt backends are loaded
+
+A worker reports not ready again once shutdown starts, so it is drained.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import AsyncExitStack
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.revocations import revocations
+from app.db.session import AsyncSessionLocal, engine
+from app.models.checklist import Checklist
+from app.models.checklist_answer import ChecklistAnswer
+from app.models.user import User
+from app.utils.auth import create_access_token, pwd_context, verify_token
+from app.utils.seed import seed_database
+
+logger = logging.getLogger(__name__)
+
+Step = Callable[[], Awaitable[None]]
+
+# Matches no row; the statements only need to be compiled and prepared
+NIL = uuid.UUID(int=0)
+
+# Shaped exactly like the endpoint queries so they hit the same cache entries
+HOT_STATEMENTS = (
+    select(User).where(User.id == NIL),
+    select(Checklist).where(Checklist.id == NIL),
+    select(ChecklistAnswer).where(ChecklistAnswer.checklist_id == NIL),
+)
+
+
+async def seed() -> None:
+    try:
+        await seed_database()
+    except Exception as e:
+        logger.error(f"Failed to seed database: {e}")
+
+
+async def check_database() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def hold_connections(stack: AsyncExitStack) -> List[AsyncConnection]:
+    """Check out as many connections as the pool keeps, all at once."""
+    count = min(settings.WARMUP_POOL_CONNECTIONS, engine.pool.size())
+    return [await stack.enter_async_context(engine.connect()) for _ in range(count)]
+
+
+async def fill_pool() -> None:
+    async with AsyncExitStack() as stack:
+        for conn in await hold_connections(stack):
+            await conn.execute(text("SELECT 1"))
+
+
+async def prepare_statements() -> None:
+    async with AsyncExitStack() as stack:
+        for conn in await hold_connections(stack):
+            # Through a session, so the ORM compile path is the one cached
+            async with AsyncSessionLocal(bind=conn) as session:
+                for statement in HOT_STATEMENTS:
+                    await session.execute(statement)
+
+
+async def warm_auth() -> None:
+    verify_token(create_access_token({"sub": str(NIL)}))
+    pwd_context.handler().get_backend()
+
+
+def warmup_steps() -> List[Tuple[str, Step]]:
+    steps: List[Tuple[str, Step]] = [("revocations", revocations.start)]
+    if settings.SEED_ON_STARTUP:
+        steps.append(("seed", seed))
+    if settings.WARMUP_ENABLED:
+        steps += [
+            ("database", check_database),
+            ("pool", fill_pool),
+            ("statements", prepare_statements),
+            ("auth", warm_auth),
+        ]
+    return steps
+
+
+class Readiness:
+    """Runs the warm-up steps in the background and records their timings."""
+
+    def __init__(self, retry_seconds: float):
+        self.retry_seconds = retry_seconds
+        self.ready = False
+        self.stopping = False
+        # Step that failed and is being retried; details go to the log only
+        self.retrying: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, steps: List[Tuple[str, Step]]) -> None:
+        self._task = asyncio.create_task(self._run(steps))
+
+    async def _run(self, steps: List[Tuple[str, Step]]) -> None:
+        started = time.perf_counter()
+        for name, step in steps:
+            step_started = time.perf_counter()
+            while True:
+                try:
+                    await step()
+                    break
+                except Exception as e:
+                    self.retrying = name
+                    logger.warning(f"Warm-up step {name} failed, retrying: {e}")
+                    await asyncio.sleep(self.retry_seconds)
+            self.timings[name] = round((time.perf_counter() - step_started) * 1000, 1)
+        self.timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+        self.retrying = None
+        self.ready = True
+        logger.info(f"Ready after {self.timings['total']} ms of warm-up")
+
+    async def stop(self) -> None:
+        self.stopping = True
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def report(self) -> dict:
+        """Body of the readiness endpoint."""
+        if self.stopping:
+            status = "stopping"
+        else:
+            status = "ready" if self.ready else "warming_up"
+        body = {"status": status, "warmup_ms": dict(self.timings)}
+        if self.retrying is not None:
+            body["retrying"] = self.retrying
+        return body
+
+
+readiness = Readiness(settings.WARMUP_RETRY_SECONDS)
@@ -0,0 +1,115 @@
+"""
+In-memory index of revoked refresh-token families.
+
+Every sign-in starts a family of rotating refresh tokens
+(app.utils.refresh_tokens), and the access tokens minted from them carry the
+family id in a ``fam`` claim. Revoking a family (sign-out, reuse of a
+rotated refresh token, password reset) sets revoked_at on its rows and
+``pg_notify``s the family id on the ``token_revocations`` channel in the same
+transaction. Each worker's shared LISTEN connection (app.core.listener) feeds
+those ids into ``RevocationIndex``, so verify_token rejects every token of a
+revoked family with one dict lookup instead of a query per request.
+
+An entry is kept for REFRESH_TOKEN_EXPIRE_DAYS, after which every token of
+the family has expired anyway. The index is loaded from the table during
+warm-up (app.core.readiness), and again whenever the LISTEN connection had
+to reconnect and notifications may have been missed.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.listener import PgListener, listener
+from app.db.session import AsyncSessionLocal
+from app.models.refresh_token import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "token_revocations"
+
+# How long start() waits for the LISTEN connection before failing, so the
+# readiness step reports the problem and retries
+CONNECT_TIMEOUT = 10.0
+
+# Expired entries are swept at most this often, so adding stays O(1)
+PRUNE_INTERVAL = 60.0
+
+
+class RevocationIndex:
+    """Revoked family ids of this worker, kept in sync over LISTEN/NOTIFY."""
+
+    def __init__(self, listener: PgListener, retention_seconds: float):
+        self.listener = listener
+        self.retention_seconds = retention_seconds
+        # family id -> time.time() after which the entry can be dropped
+        self.families: Dict[str, float] = {}
+        self._next_prune = 0.0
+        self._listening = False
+        self._reload: Optional[asyncio.Task] = None
+
+    def is_revoked(self, family: Optional[str]) -> bool:
+        return family is not None and family in self.families
+
+    def add(self, families: Iterable) -> None:
+        until = time.time() + self.retention_seconds
+        self._merge({str(family): until for family in families})
+
+    def _merge(self, entries: Dict[str, float]) -> None:
+        for family, until in entries.items():
+            if until > self.families.get(family, 0):
+                self.families[family] = until
+        now = time.time()
+        if now >= self._next_prune:
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """Drop expired entries; next time when the oldest expires, but not within PRUNE_INTERVAL."""
+        self.families = {family: until for family, until in self.families.items() if until > now}
+        oldest = min(self.families.values(), default=float("inf"))
+        self._next_prune = max(oldest, now + PRUNE_INTERVAL)
+
+    def receive(self, payload: str) -> None:
+        try:
+            UUID(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed {CHANNEL} notification: {payload[:200]}")
+            return
+        self.add([payload])
+
+    async def load(self) -> None:
+        """Merge the families revoked within the retention window from the table."""
+        since = datetime.now(timezone.utc) - timedelta(seconds=self.retention_seconds)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(RefreshToken.family_id, func.max(RefreshToken.revoked_at))
+                .where(RefreshToken.revoked_at > since)
+                .group_by(RefreshToken.family_id)
+            )
+            rows = result.all()
+        self._merge({str(family): revoked_at.timestamp() + self.retention_seconds for family, revoked_at in rows})
+
+    async def start(self) -> None:
+        """LISTEN first, then load, so no revocation falls in between."""
+        if not self._listening:
+            self._listening = True
+            await self.listener.listen(CHANNEL, self.receive, on_reconnect=self.resync)
+        await asyncio.wait_for(self.listener.connected.wait(), CONNECT_TIMEOUT)
+        await self.load()
+
+    def resync(self) -> None:
+        self._reload = asyncio.create_task(self._resync())
+
+    async def _resync(self) -> None:
+        try:
+            await self.load()
+        except Exception:
+            logger.exception("Reloading revoked token families failed")
+
+
+revocations = RevocationIndex(listener, settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60)
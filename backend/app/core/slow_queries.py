@@ -0,0 +1,147 @@
+"""
+Slow statement log.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are recorded by the cursor
+events in app.event_handlers.db_timing into a fixed-size ring buffer, with the
+calling route and the shape (types, not values) of their parameters. The
+buffer is served by the admin endpoints in app.api.v1.endpoints.admin.
+
+In dev (ENV=dev with SLOW_QUERY_EXPLAIN enabled) a sample of slow SELECTs is
+re-run as ``EXPLAIN (ANALYZE, BUFFERS)`` on a separate connection, off the
+request path, and the plan is attached to the entry so sequential scans and
+missing indexes stand out.
+"""
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# At most this many EXPLAIN runs in flight, so a burst of slow queries
+# cannot pile extra load onto the database
+MAX_CONCURRENT_EXPLAINS = 2
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    parameters: str
+    duration_ms: float
+    route: Optional[str]
+    recorded_at: float = field(default_factory=time.time)
+    plan: Optional[str] = None
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Describe bound parameters by type only, so no user data is kept."""
+    if executemany and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def is_explainable(statement: str) -> bool:
+    # EXPLAIN ANALYZE executes the statement, so only ever re-run reads
+    head = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return head in ("SELECT", "WITH") and "FOR UPDATE" not in statement.upper()
+
+
+class SlowQueryLog:
+    def __init__(self, size: int):
+        self.entries: Deque[SlowQuery] = deque(maxlen=size)
+        self._explaining: Set[asyncio.Task] = set()
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        duration: float,
+        route: Optional[str],
+        executemany: bool = False,
+    ) -> SlowQuery:
+        entry = SlowQuery(
+            statement=" ".join(statement.split()),
+            parameters=parameter_shape(parameters, executemany),
+            duration_ms=round(duration * 1000, 2),
+            route=route,
+        )
+        self.entries.append(entry)
+        logger.warning(f"Slow query ({entry.duration_ms} ms) in {route or 'background'}: {entry.statement}")
+
+        if self._should_explain(statement, executemany):
+            self._schedule_explain(entry, statement, parameters)
+        return entry
+
+    def _should_explain(self, statement: str, executemany: bool) -> bool:
+        return (
+            settings.SLOW_QUERY_EXPLAIN
+            and settings.ENV == "dev"
+            and not executemany
+            and len(self._explaining) < MAX_CONCURRENT_EXPLAINS
+            and is_explainable(statement)
+            and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        )
+
+    def _schedule_explain(self, entry: SlowQuery, statement: str, parameters: Any) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # Fresh context: the EXPLAIN must not count towards the current request
+        task = loop.create_task(self._explain(entry, statement, parameters), context=contextvars.Context())
+        self._explaining.add(task)
+        task.add_done_callback(self._explaining.discard)
+
+    async def _explain(self, entry: SlowQuery, statement: str, parameters: Any) -> None:
+        from app.db.session import engine
+
+        try:
+            async with engine.connect() as conn:
+                # Rolled back when the connection is released
+                result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                entry.plan = "\n".join(row[0] for row in result)
+        except Exception as e:
+            logger.error(f"Failed to explain slow query: {e}")
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Entries newest first."""
+        return [asdict(entry) for entry in reversed(self.entries)]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Entries grouped by statement, slowest total first."""
+        groups: Dict[str, Dict[str, Any]] = {}
+        for entry in self.entries:
+            group = groups.setdefault(entry.statement, {
+                "statement": entry.statement,
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "routes": set(),
+                "seq_scan": False,
+            })
+            group["count"] += 1
+            group["total_ms"] = round(group["total_ms"] + entry.duration_ms, 2)
+            group["max_ms"] = max(group["max_ms"], entry.duration_ms)
+            if entry.route:
+                group["routes"].add(entry.route)
+            if entry.plan and "Seq Scan" in entry.plan:
+                group["seq_scan"] = True
+        for group in groups.values():
+            group["routes"] = sorted(group["routes"])
+        return sorted(groups.values(), key=lambda group: group["total_ms"], reverse=True)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_LOG_SIZE)
@@ -0,0 +1,47 @@
+"""
+SQLAlchemy cursor events that time every statement and attribute it to the
+request being handled (see app.core.metrics.current_request). Statements over
+SLOW_QUERY_THRESHOLD_MS also go to the slow query log (app.core.slow_queries).
+
+The asyncio dialects run cursor execution inside a greenlet that shares the
+calling task's context, so the context variable set by the timing middleware
+is visible here.
+"""
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import current_request
+from app.core.slow_queries import slow_query_log
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = current_request.get()
+    if stats is not None:
+        stats.record_statement(statement, duration)
+    if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS and not statement.startswith("EXPLAIN"):
+        route = stats.route if stats is not None else None
+        slow_query_log.record(statement, parameters, duration, route, executemany)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute is skipped for failed statements
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def register_query_timing(engine) -> None:
+    """Attach the timing listeners to an Engine or AsyncEngine (idempotent)."""
+    sync_engine: Engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
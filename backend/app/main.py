@@ -1,16 +1,20 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from scalar_fastapi import get_scalar_api_reference
 
 from app.core.config import settings
-from app.db.session import get_session
+from app.core.listener import listener
+from app.core.live_hub import live_hub
+from app.core.metrics import registry, scrape_allowed
+from app.core.readiness import readiness, warmup_steps
+from app.db.session import engine, get_session
+from app.event_handlers.db_timing import register_query_timing
+from app.middleware import CompressionMiddleware, ProfilerMiddleware, TimingMiddleware
 from app.api.v1 import api_router
-from app.utils.seed import seed_database
 
 logger = logging.getLogger(__name__)
 
@@ -22,22 +26,17 @@ async def lifespan(app: FastAPI):
     Handles startup and shutdown events.
     """
     # Startup
-    logger.info("Application startup: checking if database needs seeding")
-    try:
-        # First try the improved seed function that processes init.sql
-        await seed_database()
-        
-        # As a fallback, also try to seed just the demo users
-        # This ensures we at least have login credentials even if other seed data fails
-        from app.utils.seed import seed_demo_users
-        await seed_demo_users()
-    except Exception as e:
-        logger.error(f"Failed to seed database: {e}")
+    # Seeding (normally run once at deploy time via `python -m app.utils.seed`)
+    # and warm-up run in the background; /healthz/ready reports when done
+    readiness.start(warmup_steps())
     
     yield
     
     # Shutdown
     logger.info("Application shutdown")
+    await readiness.stop()
+    await live_hub.stop()
+    await listener.stop()
 
 
 app = FastAPI(
@@ -55,6 +54,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
+# Inside the timing middleware, so response sizes are the compressed ones
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Added last so it wraps everything, including CORS preflight responses
+if settings.METRICS_ENABLED or settings.QUERY_DEBUG:
+    register_query_timing(engine)
+    app.add_middleware(TimingMiddleware, query_debug=settings.QUERY_DEBUG)
+
 # Global exception handler for consistent error responses
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
@@ -82,18 +93,38 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 
 @app.get("/healthz")
+@app.get("/healthz/live")
 def healthz():
+    """Liveness: the process is up and serving requests."""
     return {"status": "ok"}
 
 
+@app.get("/healthz/ready")
+def healthz_ready():
+    """Readiness: 503 until this worker has warmed up, with the warm-up timings."""
+    return JSONResponse(readiness.report(), status_code=200 if readiness.ready else 503)
+
+
 @app.get("/healthz/db")
 async def healthz_db(session: AsyncSession = Depends(get_session)):
     await session.execute(text("SELECT 1"))
     return {"db": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    """Prometheus text exposition of this worker's request metrics, for local scrapers only."""
+    client = request.client.host if request.client else None
+    if not settings.METRICS_ENABLED or not scrape_allowed(client, settings.METRICS_ALLOWED_IPS):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/scalar", include_in_schema=False)
 async def scalar_html():
+    # Imported on first use; only the docs page needs it
+    from scalar_fastapi import get_scalar_api_reference
+
     return get_scalar_api_reference(
         openapi_url=app.openapi_url,
         title=app.title,
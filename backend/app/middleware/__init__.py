@@ -0,0 +1,5 @@
+from .compression import CompressionMiddleware
+from .profiling import ProfilerMiddleware
+from .timing import TimingMiddleware
+
+__all__ = ["CompressionMiddleware", "ProfilerMiddleware", "TimingMiddleware"]
@@ -0,0 +1,205 @@
+"""
+Response compression middleware.
+
+JSON bodies (answers, change feeds, the OpenAPI schema) and proxied Electric
+shape logs are highly repetitive and shrink several times over. Responses are
+compressed with brotli when the ``brotli`` package is installed and the
+client accepts it, otherwise with gzip, if:
+
+* the content type is in the allowlist (never ``text/event-stream``),
+* the body reaches COMPRESSION_MIN_BYTES (smaller bodies gain nothing),
+* the response is not already encoded, e.g. an upstream Electric body
+  passed through by the proxy, and does not say ``Cache-Control:
+  no-transform``,
+* the request is not an Electric long-poll (``live=true``), whose response
+  must reach the client the moment it is written.
+
+Streaming responses are compressed chunk by chunk, flushing after each one
+so streamed data is not held back. ETags here are weak, so they stay valid
+for the compressed representation. Implemented as plain ASGI like the timing
+middleware, so nothing is buffered beyond the size threshold.
+"""
+import zlib
+from typing import List, Optional
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+# Streams that must never be buffered or compressed
+UNCOMPRESSIBLE_TYPES = ("text/event-stream",)
+
+
+def accepted_encodings(header: str) -> List[str]:
+    """Codings of an Accept-Encoding header with a non-zero q-value."""
+    codings = []
+    for part in header.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        if coding and q > 0:
+            codings.append(coding.strip())
+    return codings
+
+
+def choose_encoding(header: str) -> Optional[str]:
+    codings = accepted_encodings(header)
+    if brotli is not None and "br" in codings:
+        return "br"
+    if "gzip" in codings or "*" in codings:
+        return "gzip"
+    return None
+
+
+def is_long_poll(scope: Scope) -> bool:
+    """Electric live requests wait for changes; compression must not delay them."""
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get("live", [""])[0] == "true"
+
+
+def is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", ""):
+        return False
+    content_type = headers.get("content-type", "").lower()
+    if content_type.startswith(UNCOMPRESSIBLE_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class Compressor:
+    """gzip or brotli with the same streaming interface."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits 31: zlib stream with a gzip header and trailer
+            self._gzip = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress and flush, so everything given so far can be decoded."""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._gzip.compress(data) + self._gzip.flush()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None,
+    ):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_BYTES if minimum_size is None else minimum_size
+        self.gzip_level = settings.COMPRESSION_GZIP_LEVEL if gzip_level is None else gzip_level
+        self.brotli_quality = settings.COMPRESSION_BROTLI_QUALITY if brotli_quality is None else brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None or is_long_poll(scope):
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor: Optional[Compressor] = None
+        passthrough = False
+        buffered: List[bytes] = []
+        buffered_size = 0
+
+        def mark_compressed(length: Optional[int]) -> None:
+            start["headers"] = list(start.get("headers", []))
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            if length is None:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(length)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor, passthrough, buffered_size
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if message["status"] < 200 or message["status"] in (204, 304) or not is_compressible(headers):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held until we know whether the body is worth compressing
+                    start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is not None:
+                chunk = compressor.compress(body) if more_body else compressor.finish(body)
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            buffered.append(body)
+            buffered_size += len(body)
+            if buffered_size < self.minimum_size:
+                if more_body:
+                    return
+                # Ended below the threshold: send it as it is
+                passthrough = True
+                await send(start)
+                await send({"type": "http.response.body", "body": b"".join(buffered)})
+                return
+
+            compressor = Compressor(encoding, self.gzip_level, self.brotli_quality)
+            data = b"".join(buffered)
+            buffered.clear()
+            if more_body:
+                # Streaming: length unknown, flush as chunks arrive
+                mark_compressed(None)
+                await send(start)
+                await send({"type": "http.response.body", "body": compressor.compress(data), "more_body": True})
+            else:
+                compressed = compressor.finish(data)
+                mark_compressed(len(compressed))
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
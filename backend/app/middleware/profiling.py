@@ -0,0 +1,69 @@
+"""
+Opt-in sampling profiler middleware.
+
+Profiles a random PROFILING_SAMPLE_RATE fraction of requests, plus any
+request sent with ``X-Profile: <PROFILING_TOKEN>``. Unsampled requests pay a
+single random() call; with PROFILING_ENABLED off the middleware is not
+installed at all. Aggregated profiles are downloaded from
+/api/v1/admin/profiles (see app.core.profiler).
+"""
+import hmac
+import random
+import sys
+import threading
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.profiler import ProfileStore, StackSampler, profile_store
+
+PROFILE_HEADER = b"x-profile"
+
+# Profiled requests allowed at once, to bound sampling overhead under load
+MAX_CONCURRENT_PROFILES = 4
+
+
+class ProfilerMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore = profile_store,
+        sample_rate: Optional[float] = None,
+        interval_ms: Optional[float] = None,
+        token: Optional[str] = None,
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.interval = (settings.PROFILING_INTERVAL_MS if interval_ms is None else interval_ms) / 1000
+        self.token = (settings.PROFILING_TOKEN if token is None else token).encode()
+        self.active = 0
+
+    def should_profile(self, scope: Scope) -> bool:
+        if self.active >= MAX_CONCURRENT_PROFILES:
+            return False
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(threading.get_ident(), sys._getframe(), self.interval)
+        self.active += 1
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stacks = sampler.stop()
+            self.active -= 1
+            route = scope.get("route")
+            if route is not None:
+                self.store.add(f"{scope['method']} {route.path}", stacks)
@@ -0,0 +1,90 @@
+"""
+Per-request timing middleware.
+
+Measures wall time, SQL statement count and time (via app.core.metrics), and
+request/response body sizes for every HTTP request. The breakdown is returned
+to the client in a ``Server-Timing`` header and aggregated by route template
+into the metrics registry served at /metrics.
+
+Implemented as plain ASGI rather than BaseHTTPMiddleware so streaming
+responses are not buffered and the request runs in the same task (and
+context) as the endpoint.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import MetricsRegistry, RequestStats, current_request, registry as default_registry
+from app.core.query_budget import check_request
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def server_timing(total: float, stats: RequestStats) -> str:
+    """Format a Server-Timing header value; durations are in milliseconds."""
+    return (
+        f"app;dur={total * 1000:.1f}, "
+        f"db;dur={stats.db_time * 1000:.1f};desc=\"{stats.db_statements} queries\""
+    )
+
+
+class TimingMiddleware:
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = default_registry, query_debug: bool = False):
+        self.app = app
+        self.registry = registry
+        # Check query budgets and repeated statements (dev/test only)
+        self.query_debug = query_debug
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope, track_statements=self.query_debug)
+        token = current_request.set(stats)
+        start = time.perf_counter()
+        status = 500
+        response_bytes = 0
+        # Content-Length covers bodies the endpoint never reads; chunked
+        # uploads are counted as they are received
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        request_bytes = int(content_length) if content_length.isdigit() else 0
+        count_received = not content_length
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if count_received and message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(time.perf_counter() - start, stats).encode("latin-1")))
+                if self.query_debug:
+                    route = getattr(scope.get("route"), "path", None)
+                    headers.extend(check_request(scope["method"], route, stats))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            current_request.reset(token)
+            # The router stores the matched route in the scope; use its path
+            # template so ids do not explode the label cardinality
+            route = scope.get("route")
+            self.registry.observe(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - start,
+                stats,
+                request_bytes,
+                response_bytes,
+            )
@@ -5,5 +5,9 @@ from .review import Review
 from .review_assignment import ReviewAssignment
 from .checklist import Checklist
 from .checklist_answer import ChecklistAnswer
+from .checklist_answer_set import ChecklistAnswerSet
+from .seed_state import SeedState
+from .sync_tombstone import SyncTombstone
+from .refresh_token import RefreshToken
 
-__all__ = ["User", "Project", "ProjectMember", "Review", "ReviewAssignment", "Checklist", "ChecklistAnswer"]
+__all__ = ["User", "Project", "ProjectMember", "Review", "ReviewAssignment", "Checklist", "ChecklistAnswer", "ChecklistAnswerSet", "SeedState", "SyncTombstone", "RefreshToken"]
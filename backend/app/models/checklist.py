@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Index, CheckConstraint
+from sqlalchemy import BigInteger, Column, String, DateTime, FetchedValue, ForeignKey, Index, CheckConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -15,12 +15,14 @@ class Checklist(Base):
     """
     __tablename__ = "checklists"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    review_id = Column(UUID(as_uuid=True), ForeignKey("reviews.id", ondelete="CASCADE"), nullable=False, index=True)
-    reviewer_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    review_id = Column(UUID(as_uuid=True), ForeignKey("reviews.id", ondelete="CASCADE"), nullable=False)
+    reviewer_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     type = Column(String(50), nullable=False, default='amstar')
     completed_at = Column(DateTime(timezone=True), nullable=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Version for delta sync, set by a trigger to the writing transaction's id (app.utils.sync)
+    sync_version = Column(BigInteger, nullable=False, server_default=text("0"), server_onupdate=FetchedValue())
 
     # Relationships
     review = relationship("Review", back_populates="checklists")
@@ -29,7 +31,16 @@ class Checklist(Base):
 
     __table_args__ = (
         Index('ix_checklists_review_id', 'review_id'),
-        Index('ix_checklists_reviewer_id', 'reviewer_id'),
+        # A reviewer's checklists in work-queue order (keyset pages on
+        # updated_at, id). completed_at and the other listed columns ride
+        # along, so the pending list is an index-only scan too; one index
+        # rather than a second, partial one, since updated_at changes on
+        # every answer write and each index on it costs that write
+        Index(
+            'ix_checklists_reviewer_queue',
+            'reviewer_id', 'updated_at', 'id',
+            postgresql_include=['review_id', 'type', 'completed_at'],
+        ),
         CheckConstraint("type IN ('amstar')", name='check_checklist_type'),
     )
 
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Index
+from sqlalchemy import BigInteger, Column, String, DateTime, FetchedValue, ForeignKey, Boolean, Index, SmallInteger, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -15,19 +15,23 @@ class ChecklistAnswer(Base):
     """
     __tablename__ = "checklist_answers"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    checklist_id = Column(UUID(as_uuid=True), ForeignKey("checklists.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    checklist_id = Column(UUID(as_uuid=True), ForeignKey("checklists.id", ondelete="CASCADE"), nullable=False)
     question_key = Column(String(50), nullable=False)  # e.g., 'q1', 'q2', etc.
     answers = Column(JSONB, nullable=False)  # Nested arrays like [[false, false], [true]]
+    # Bit-packed copy of answers (app.utils.answer_codec); NULL when they do not fit the AMSTAR shape
+    answers_mask = Column(SmallInteger, nullable=True)
     critical = Column(Boolean, nullable=False, default=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Version for delta sync, set by a trigger to the writing transaction's id (app.utils.sync)
+    sync_version = Column(BigInteger, nullable=False, server_default=text("0"), server_onupdate=FetchedValue())
 
     # Relationships
     checklist = relationship("Checklist", back_populates="answers")
 
     __table_args__ = (
-        Index('ix_checklist_answers_checklist_id', 'checklist_id'),
-        # Composite index for efficient lookup by checklist + question
+        # Composite index for efficient lookup by checklist + question; its leading
+        # column also serves lookups by checklist alone
         Index('ix_checklist_answers_checklist_question', 'checklist_id', 'question_key'),
     )
 
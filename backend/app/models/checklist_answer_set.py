@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, DateTime, FetchedValue, ForeignKey, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ChecklistAnswerSet(Base):
+    """
+    All answers of one checklist in a single row, used when ANSWER_STORAGE is
+    "document" (see app.utils.answer_storage). ``answers`` maps question keys
+    to {"answers": [[...]], "critical": bool, "updated_at": iso timestamp}.
+    """
+    __tablename__ = "checklist_answer_sets"
+
+    checklist_id = Column(UUID(as_uuid=True), ForeignKey("checklists.id", ondelete="CASCADE"), primary_key=True)
+    answers = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Version for delta sync, set by a trigger to the writing transaction's id (app.utils.sync)
+    sync_version = Column(BigInteger, nullable=False, server_default=text("0"), server_onupdate=FetchedValue())
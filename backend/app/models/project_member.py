@@ -24,6 +24,5 @@ class ProjectMember(Base):
     __table_args__ = (
         PrimaryKeyConstraint('project_id', 'user_id'),
         CheckConstraint("role IN ('owner', 'member')", name='valid_role'),
-        Index('ix_project_members_project_id', 'project_id'),
         Index('ix_project_members_user_id', 'user_id'),
     )
\ No newline at end of file
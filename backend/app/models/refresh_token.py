@@ -0,0 +1,30 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class RefreshToken(Base):
+    """
+    One issued refresh token, keyed by its JWT ``jti``. The tokens of one
+    sign-in share a family_id: each refresh marks the presented token rotated
+    and issues its successor, and revoking sets revoked_at on the whole
+    family (see app.utils.refresh_tokens).
+    """
+    __tablename__ = "refresh_tokens"
+
+    jti = Column(UUID(as_uuid=True), primary_key=True)
+    family_id = Column(UUID(as_uuid=True), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    rotated_at = Column(DateTime(timezone=True), nullable=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_refresh_tokens_family_id', 'family_id'),
+        Index('ix_refresh_tokens_user_id', 'user_id'),
+        # Workers load recently revoked families at startup
+        Index('ix_refresh_tokens_revoked_at', revoked_at, postgresql_where=revoked_at.isnot(None)),
+    )
@@ -22,6 +22,5 @@ class ReviewAssignment(Base):
 
     __table_args__ = (
         PrimaryKeyConstraint('review_id', 'user_id'),
-        Index('ix_review_assignments_review_id', 'review_id'),
         Index('ix_review_assignments_user_id', 'user_id'),
     )
\ No newline at end of file
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class SeedState(Base):
+    """
+    Marker rows recording which version of a seed data set has been applied.
+    Seeding checks this single row instead of counting rows in every table.
+    """
+    __tablename__ = "seed_state"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -0,0 +1,26 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class SyncTombstone(Base):
+    """
+    Records a deleted review, checklist or checklist answer so delta sync
+    (GET /projects/{id}/changes) can tell clients to drop it. Rows are written
+    by an AFTER DELETE trigger; rows deleted along with their parent get no
+    tombstone of their own, since the parent's covers them.
+    """
+    __tablename__ = "sync_tombstones"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(UUID(as_uuid=True), nullable=False)
+    sync_version = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_sync_tombstones_project_version', 'project_id', 'sync_version'),
+    )
@@ -12,7 +12,7 @@ from app.db.base import Base
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=False)
     hashed_password = Column(String(255), nullable=False)
@@ -31,7 +31,15 @@ class User(Base):
     project_memberships = relationship("ProjectMember", back_populates="user", cascade="all, delete-orphan")
     review_assignments = relationship("ReviewAssignment", back_populates="user", cascade="all, delete-orphan")
 
-    # Create a composite index on email for faster lookups
     __table_args__ = (
-        Index('ix_users_email', 'email'),
-    )
\ No newline at end of file
+        # Trigram index for the substring search in GET /users/search, which
+        # only ever returns verified users
+        Index(
+            'ix_users_verified_search',
+            func.lower(name).label('name_lower'),
+            func.lower(email).label('email_lower'),
+            postgresql_using='gin',
+            postgresql_ops={'name_lower': 'gin_trgm_ops', 'email_lower': 'gin_trgm_ops'},
+            postgresql_where=email_verified_at.isnot(None),
+        ),
+    )
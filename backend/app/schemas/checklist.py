@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel, Field
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
 
 
 class ChecklistAnswerData(BaseModel):
@@ -70,6 +70,46 @@ class ChecklistWithAnswersResponse(BaseModel):
         from_attributes = True
 
 
+class VersionedChecklistResponse(ChecklistWithAnswersResponse):
+    """Checklist with answers and the ETag of this version"""
+    etag: str
+
+
+class ChecklistBatchRequest(BaseModel):
+    """Checklists to fetch, each mapped to the ETag the client holds (null if none)"""
+    checklists: Dict[UUID, Optional[str]] = Field(..., max_length=100)
+
+
+class ChecklistBatchResponse(BaseModel):
+    """Result of a batch fetch: only checklists whose ETag changed carry a body"""
+    changed: List[VersionedChecklistResponse] = []
+    unchanged: List[UUID] = []
+    missing: List[UUID] = Field(default=[], description="Not found or not readable by the current user")
+
+
+class QueueItemResponse(BaseModel):
+    """One checklist in a reviewer's work queue"""
+    checklist_id: UUID
+    review_id: UUID
+    review_name: str
+    project_id: UUID
+    project_name: str
+    type: str
+    completed_at: Optional[datetime]
+    updated_at: datetime
+    answered: int = Field(..., description="Questions with a saved answer")
+    total: int = Field(..., description="Questions in the checklist")
+
+    class Config:
+        from_attributes = True
+
+
+class QueuePageResponse(BaseModel):
+    """A page of the work queue; pass next_cursor back as `cursor` for the next page"""
+    items: List[QueueItemResponse]
+    next_cursor: Optional[str] = None
+
+
 class ChecklistFrontendFormat(BaseModel):
     """
     Schema matching the frontend checklist structure.
@@ -0,0 +1,22 @@
+from uuid import UUID
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Annotated, Any, Dict, Literal, Union
+
+from app.schemas.checklist import ChecklistAnswerCreate
+
+
+class AnswerPatchMessage(ChecklistAnswerCreate):
+    """An answer edit made while merging, relayed to the other participants"""
+    type: Literal["patch"]
+    checklist_id: UUID
+
+
+class PresenceMessage(BaseModel):
+    """What a participant is looking at, e.g. {"question_key": "q4"}"""
+    type: Literal["presence"]
+    state: Dict[str, Any] = Field(default_factory=dict)
+
+
+LiveMessage = Annotated[Union[AnswerPatchMessage, PresenceMessage], Field(discriminator="type")]
+
+live_message_adapter = TypeAdapter(LiveMessage)
@@ -1,7 +1,9 @@
 from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
+
+from app.schemas.checklist import ChecklistResponse
 
 
 class ReviewCreate(BaseModel):
@@ -25,3 +27,7 @@ class ReviewResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class ReviewWithChecklistsResponse(ReviewResponse):
+    """Schema for review response with its checklists included"""
+    checklists: List[ChecklistResponse] = []
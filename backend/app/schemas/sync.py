@@ -0,0 +1,95 @@
+from datetime import datetime
+from uuid import UUID
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Literal, Optional, Union
+
+from app.schemas.checklist import ChecklistAnswerResponse, ChecklistResponse
+from app.schemas.review import ReviewResponse
+
+
+class SyncedReview(ReviewResponse):
+    """Review with its sync version"""
+    sync_version: int
+
+
+class SyncedChecklist(ChecklistResponse):
+    """Checklist with its sync version"""
+    sync_version: int
+
+
+class SyncedAnswer(ChecklistAnswerResponse):
+    """Checklist answer with its sync version"""
+    sync_version: int
+
+
+class Tombstone(BaseModel):
+    """A row deleted since the watermark"""
+    table_name: str = Field(..., description="reviews, checklists or checklist_answers")
+    row_id: UUID
+    sync_version: int
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectChangesResponse(BaseModel):
+    """Rows of a project changed since a watermark"""
+    watermark: int = Field(..., description="Pass as `since` on the next pull")
+    reviews: List[SyncedReview] = []
+    checklists: List[SyncedChecklist] = []
+    answers: List[SyncedAnswer] = []
+    deleted: List[Tombstone] = []
+
+
+class SyncOperationBase(BaseModel):
+    op_id: str = Field(..., max_length=100, description="Client id of the operation, echoed in its result")
+    client_timestamp: Optional[datetime] = Field(None, description="When the client made the change")
+
+
+class CreateChecklistOperation(SyncOperationBase):
+    """Create a checklist for the current user; the client picks the id so later operations can use it"""
+    type: Literal["create_checklist"]
+    checklist_id: UUID
+    review_id: UUID
+
+
+class UpsertAnswerOperation(SyncOperationBase):
+    """Save one question's answer if the server still has the version the client edited"""
+    type: Literal["upsert_answer"]
+    checklist_id: UUID
+    question_key: str
+    answers: List[List[bool]]
+    critical: bool = False
+    base_version: Optional[int] = Field(
+        None, description="sync_version of the answer the client edited; null if it had none"
+    )
+
+
+class CompleteChecklistOperation(SyncOperationBase):
+    """Mark a checklist completed at client_timestamp (or now)"""
+    type: Literal["complete_checklist"]
+    checklist_id: UUID
+
+
+SyncOperation = Annotated[
+    Union[CreateChecklistOperation, UpsertAnswerOperation, CompleteChecklistOperation],
+    Field(discriminator="type"),
+]
+
+
+class SyncBatchRequest(BaseModel):
+    """A journal of offline operations, applied in order"""
+    operations: List[SyncOperation] = Field(..., max_length=500)
+
+
+class SyncOperationResult(BaseModel):
+    """Outcome of one operation"""
+    op_id: str
+    status: Literal["applied", "conflict", "rejected"]
+    detail: Optional[str] = None
+    sync_version: Optional[int] = Field(None, description="Version of the written row, for the next base_version")
+    current: Optional[SyncedAnswer] = Field(None, description="The server's answer, on conflict")
+
+
+class SyncBatchResponse(BaseModel):
+    results: List[SyncOperationResult]
@@ -0,0 +1,275 @@
+"""
+Production server.
+
+    python -m app.server [--workers N] [--host HOST] [--port PORT]
+
+A small pre-forking supervisor around uvicorn. The master process imports
+the app once, binds the listening socket, applies the seed data when
+SEED_ON_STARTUP is set and then forks the workers, so module import, route
+and schema compilation happen once and are shared copy-on-write. Workers
+share the socket (the kernel spreads connections between them) and each
+runs uvicorn on uvloop with the httptools parser.
+
+Each worker runs the app lifespan itself, so per-process resources (the
+database pool, the LISTEN connection, the live review hub) are created
+after the fork and closed when the worker exits. Seeding is the exception:
+it runs once in the master, which turns SEED_ON_STARTUP off for the
+workers it forks.
+
+Signals sent to the master:
+
+* TERM, INT: graceful shutdown. Workers stop accepting connections and get
+  GRACEFUL_TIMEOUT seconds to finish in-flight requests.
+* HUP: graceful restart. A new set of workers is forked, then the old ones
+  are drained. The app is preloaded, so new code needs a new master (e.g.
+  restarting the container), not a HUP.
+* TTIN, TTOU: one worker more or less.
+
+Workers that die are replaced. If a worker fails during startup the master
+shuts down rather than restarting it in a loop.
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import math
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+import uvicorn
+
+from app.core.config import settings
+from app.db.session import engine
+from app.main import app
+from app.utils.seed import seed_database
+
+logger = logging.getLogger("uvicorn.error")
+
+# Exit status of a worker whose startup failed (the same as uvicorn's)
+STARTUP_FAILURE = 3
+
+# Seconds between checks on the workers when no signal arrives
+TICK = 1.0
+
+# Time on top of GRACEFUL_TIMEOUT for the lifespan shutdown before a worker is killed
+KILL_MARGIN = 5.0
+
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+SHUTDOWN_SIGNALS = (signal.SIGTERM, signal.SIGINT, signal.SIGQUIT)
+MASTER_SIGNALS = SHUTDOWN_SIGNALS + (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU, signal.SIGCHLD)
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: the affinity mask, capped by a cgroup v2 quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cpus = os.cpu_count() or 1
+    try:
+        with open(CGROUP_CPU_MAX) as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+def worker_count(requested: int = 0) -> int:
+    return requested if requested > 0 else available_cpus()
+
+
+def seed_once() -> None:
+    """Apply the seed in the master, so the workers do not each attempt it."""
+    if not settings.SEED_ON_STARTUP:
+        return
+
+    async def seed() -> None:
+        try:
+            await seed_database()
+        except Exception as e:
+            logger.error(f"Failed to seed database: {e}")
+        finally:
+            # The workers must not inherit pooled connections
+            await engine.dispose()
+
+    asyncio.run(seed())
+    # Forked workers inherit this and skip seeding in their lifespan
+    settings.SEED_ON_STARTUP = False
+
+
+def make_config() -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        log_level=settings.LOG_LEVEL.lower(),
+        proxy_headers=True,
+        timeout_keep_alive=settings.KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT,
+    )
+
+
+def bind(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+
+class Arbiter:
+    """Forks the workers and keeps the configured number of them running."""
+
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int):
+        self.config = config
+        self.sock = sock
+        self.num_workers = workers
+        self.kill_after = config.timeout_graceful_shutdown + KILL_MARGIN
+        # pid -> time started, oldest first
+        self.workers: Dict[int, float] = {}
+        # pid -> time after which a draining worker is killed
+        self.retiring: Dict[int, float] = {}
+        self.stopping = False
+        self.failed = False
+        self._wakeup_r = self._wakeup_w = -1
+
+    def run(self) -> int:
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        # Handlers only need to exist; the signal numbers arrive on the pipe
+        for sig in MASTER_SIGNALS:
+            signal.signal(sig, lambda sig, frame: None)
+        signal.set_wakeup_fd(self._wakeup_w)
+
+        while not self.stopping:
+            self.maintain()
+            for sig in self.wait():
+                self.handle(sig)
+            self.reap()
+
+        self.shutdown()
+        return STARTUP_FAILURE if self.failed else 0
+
+    def wait(self) -> bytes:
+        """Signals received within one tick."""
+        readable, _, _ = select.select([self._wakeup_r], [], [], TICK)
+        if not readable:
+            return b""
+        try:
+            return os.read(self._wakeup_r, 64)
+        except BlockingIOError:
+            return b""
+
+    def handle(self, sig: int) -> None:
+        if sig in SHUTDOWN_SIGNALS:
+            self.stopping = True
+        elif sig == signal.SIGHUP:
+            logger.info("Restarting %d workers", self.num_workers)
+            old = list(self.workers)
+            for _ in range(self.num_workers):
+                self.spawn()
+            for pid in old:
+                self.retire(pid)
+        elif sig == signal.SIGTTIN:
+            self.num_workers += 1
+        elif sig == signal.SIGTTOU:
+            self.num_workers = max(self.num_workers - 1, 1)
+
+    def maintain(self) -> None:
+        while len(self.workers) < self.num_workers:
+            self.spawn()
+        while len(self.workers) > self.num_workers:
+            self.retire(next(iter(self.workers)))
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = time.monotonic()
+            return
+
+        status = 1
+        try:
+            signal.set_wakeup_fd(-1)
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            for sig in MASTER_SIGNALS:
+                signal.signal(sig, signal.SIG_DFL)
+            server = uvicorn.Server(self.config)
+            server.run(sockets=[self.sock])
+            status = 0 if server.started else STARTUP_FAILURE
+        except Exception:
+            logger.exception("Worker [%d] crashed", os.getpid())
+        finally:
+            os._exit(status)
+
+    def retire(self, pid: int) -> None:
+        """Ask a worker to finish its requests and exit."""
+        self.workers.pop(pid, None)
+        self.retiring[pid] = time.monotonic() + self.kill_after
+        os.kill(pid, signal.SIGTERM)
+
+    def reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                break
+            if self.retiring.pop(pid, None) is not None or self.workers.pop(pid, None) is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if code == STARTUP_FAILURE:
+                logger.error("Worker [%d] failed to start; shutting down", pid)
+                self.failed = self.stopping = True
+            elif not self.stopping:
+                logger.warning("Worker [%d] exited with status %d; replacing it", pid, code)
+
+        now = time.monotonic()
+        for pid, deadline in list(self.retiring.items()):
+            if now > deadline:
+                logger.warning("Worker [%d] did not stop in time; killing it", pid)
+                os.kill(pid, signal.SIGKILL)
+                self.retiring[pid] = math.inf
+
+    def shutdown(self) -> None:
+        logger.info("Stopping %d workers", len(self.workers))
+        for pid in list(self.workers):
+            self.retire(pid)
+        while self.retiring:
+            self.wait()
+            self.reap()
+        self.sock.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the API with several worker processes")
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY, help="0 starts one per available CPU")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    args = parser.parse_args()
+
+    config = make_config()
+    sock = bind(args.host, args.port, config.backlog)
+    seed_once()
+    workers = worker_count(args.workers)
+    logger.info("Listening on %s:%d with %d workers", args.host, args.port, workers)
+
+    # Keep the preloaded objects out of the collector's passes, which would
+    # otherwise copy their pages into every worker
+    gc.collect()
+    gc.freeze()
+    sys.exit(Arbiter(config, sock, workers).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+AMSTAR 2 checklist structure.
+
+Mirrors the default answers built by ``createChecklist`` in
+frontend/src/offline/AMSTAR2Checklist.js (question text lives in
+checklistMap.js). Each question's answers are stored as a list of columns,
+each column a list of checkbox/radio booleans; the last column is the
+one-of-N rating (Yes / Partial Yes / No / No MA).
+"""
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class QuestionShape(NamedTuple):
+    columns: Tuple[int, ...]  # number of options in each column
+    critical: bool
+    ratings: Tuple[str, ...]  # labels of the last column, in order
+
+
+_YES_NO = ("Yes", "No")
+_YES_PARTIAL_NO = ("Yes", "Partial Yes", "No")
+_YES_NO_MA = ("Yes", "No", "No MA")
+
+AMSTAR_QUESTIONS: Dict[str, QuestionShape] = {
+    "q1": QuestionShape((4, 1, 2), False, _YES_NO),
+    "q2": QuestionShape((4, 3, 3), True, _YES_PARTIAL_NO),
+    "q3": QuestionShape((3, 2), False, _YES_NO),
+    "q4": QuestionShape((3, 5, 3), True, _YES_PARTIAL_NO),
+    "q5": QuestionShape((2, 2), False, _YES_NO),
+    "q6": QuestionShape((2, 2), False, _YES_NO),
+    "q7": QuestionShape((1, 1, 3), True, _YES_PARTIAL_NO),
+    "q8": QuestionShape((5, 4, 3), False, _YES_PARTIAL_NO),
+    "q9a": QuestionShape((2, 2, 4), True, ("Yes", "Partial Yes", "No", "No MA")),
+    "q9b": QuestionShape((2, 2, 4), True, ("Yes", "Partial Yes", "No", "No MA")),
+    "q10": QuestionShape((1, 2), False, _YES_NO),
+    "q11a": QuestionShape((3, 3), True, _YES_NO_MA),
+    "q11b": QuestionShape((4, 3), True, _YES_NO_MA),
+    "q12": QuestionShape((2, 3), False, _YES_NO_MA),
+    "q13": QuestionShape((2, 2), True, _YES_NO),
+    "q14": QuestionShape((2, 2), False, _YES_NO),
+    "q15": QuestionShape((1, 3), True, _YES_NO_MA),
+    "q16": QuestionShape((2, 2), False, _YES_NO),
+}
+
+QUESTION_KEYS: List[str] = list(AMSTAR_QUESTIONS)
+
+
+def empty_answers(question_key: str) -> List[List[bool]]:
+    """Return an all-false answer grid for a question."""
+    return [[False] * size for size in AMSTAR_QUESTIONS[question_key].columns]
+
+
+def matches_shape(question_key: str, answers: List[List[bool]]) -> bool:
+    """Check that an answer grid has the column shape of the question."""
+    shape = AMSTAR_QUESTIONS.get(question_key)
+    if shape is None or len(answers) != len(shape.columns):
+        return False
+    return all(len(column) == size for column, size in zip(answers, shape.columns))
@@ -0,0 +1,221 @@
+"""
+Checklist answer storage layouts.
+
+"rows" (default) keeps one ``checklist_answers`` row per question, which is
+what Electric-synced clients read. "document" keeps all answers of a
+checklist in one ``checklist_answer_sets`` row, so loading a checklist reads
+a single tuple through its primary key, and saving patches the document in
+place with jsonb ``||``.
+
+Document mode is incompatible with Electric-synced clients: answer writes no
+longer touch ``checklist_answers``, so its shapes would go stale without
+warning. The Electric proxy therefore refuses them in document mode, and
+clients must read answers through the API and the project change feed
+(/projects/{id}/changes) instead.
+
+Reads are dual: in document mode, checklists without a document yet fall back
+to their rows. The first document-mode write folds existing rows into the new
+document in the same statement, so switching modes needs no downtime. To
+convert everything up front run:
+
+    python -m app.utils.answer_storage
+"""
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import case, exists, func, literal, select, text
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.checklist_answer import ChecklistAnswer
+from app.models.checklist_answer_set import ChecklistAnswerSet
+from app.utils.amstar import QUESTION_KEYS
+
+logger = logging.getLogger(__name__)
+
+_KEY_ORDER = {key: index for index, key in enumerate(QUESTION_KEYS)}
+
+
+@dataclass
+class StoredAnswer:
+    """One question's answer read from a document, shaped like ChecklistAnswer."""
+    id: uuid.UUID
+    checklist_id: uuid.UUID
+    question_key: str
+    answers: List[List[bool]]
+    critical: bool
+    updated_at: datetime
+    answers_mask: Optional[int] = None
+    sync_version: Optional[int] = None
+
+
+def document_answer_id(checklist_id: uuid.UUID, question_key: str) -> uuid.UUID:
+    """Stable id for a question inside a document (documents have no per-answer keys)."""
+    return uuid.uuid5(checklist_id, question_key)
+
+
+def from_document(
+    checklist_id: uuid.UUID, document: Dict[str, Any], sync_version: Optional[int] = None
+) -> List[StoredAnswer]:
+    answers = [
+        StoredAnswer(
+            id=document_answer_id(checklist_id, key),
+            checklist_id=checklist_id,
+            question_key=key,
+            answers=entry["answers"],
+            critical=entry["critical"],
+            updated_at=datetime.fromisoformat(entry["updated_at"]),
+            sync_version=sync_version,
+        )
+        for key, entry in document.items()
+    ]
+    answers.sort(key=lambda answer: (_KEY_ORDER.get(answer.question_key, len(_KEY_ORDER)), answer.question_key))
+    return answers
+
+
+def _fold_rows(checklist_id):
+    """Scalar subquery building a document from a checklist's rows (NULL if none)."""
+    return (
+        select(func.jsonb_object_agg(
+            ChecklistAnswer.question_key,
+            func.jsonb_build_object(
+                "answers", ChecklistAnswer.answers,
+                "critical", ChecklistAnswer.critical,
+                "updated_at", ChecklistAnswer.updated_at,
+            ),
+        ))
+        .where(ChecklistAnswer.checklist_id == checklist_id)
+        .scalar_subquery()
+    )
+
+
+def answered_count(checklist_id):
+    """
+    Scalar subquery counting the questions of a checklist that have an answer,
+    read from whichever layout holds them (for listing progress in SQL).
+    """
+    rows = (
+        select(func.count())
+        .where(ChecklistAnswer.checklist_id == checklist_id)
+        .scalar_subquery()
+    )
+    if settings.ANSWER_STORAGE != "document":
+        return rows
+    has_document = exists().where(ChecklistAnswerSet.checklist_id == checklist_id)
+    keys = (
+        select(func.count())
+        .select_from(ChecklistAnswerSet, func.jsonb_object_keys(ChecklistAnswerSet.answers).table_valued("key"))
+        .where(ChecklistAnswerSet.checklist_id == checklist_id)
+        .scalar_subquery()
+    )
+    return case((has_document, keys), else_=rows)
+
+
+async def load_answers(db: AsyncSession, checklist_id: uuid.UUID) -> List[Union[ChecklistAnswer, StoredAnswer]]:
+    """All answers of a checklist from whichever layout holds them."""
+    if settings.ANSWER_STORAGE == "document":
+        result = await db.execute(
+            select(ChecklistAnswerSet.answers).where(ChecklistAnswerSet.checklist_id == checklist_id)
+        )
+        document = result.scalar_one_or_none()
+        if document is not None:
+            return from_document(checklist_id, document)
+
+    result = await db.execute(
+        select(ChecklistAnswer)
+        .where(ChecklistAnswer.checklist_id == checklist_id)
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars().all())
+
+
+async def load_answers_many(
+    db: AsyncSession, checklist_ids: List[uuid.UUID]
+) -> Dict[uuid.UUID, List[Union[ChecklistAnswer, StoredAnswer]]]:
+    """load_answers for several checklists in at most two queries."""
+    loaded: Dict[uuid.UUID, List[Union[ChecklistAnswer, StoredAnswer]]] = {checklist_id: [] for checklist_id in checklist_ids}
+    remaining = list(checklist_ids)
+    if settings.ANSWER_STORAGE == "document" and remaining:
+        result = await db.execute(
+            select(ChecklistAnswerSet.checklist_id, ChecklistAnswerSet.answers)
+            .where(ChecklistAnswerSet.checklist_id.in_(remaining))
+        )
+        documents = dict(result.all())
+        for checklist_id, document in documents.items():
+            loaded[checklist_id] = from_document(checklist_id, document)
+        remaining = [checklist_id for checklist_id in remaining if checklist_id not in documents]
+
+    if remaining:
+        result = await db.execute(
+            select(ChecklistAnswer)
+            .where(ChecklistAnswer.checklist_id.in_(remaining))
+            .execution_options(populate_existing=True)
+        )
+        for answer in result.scalars().all():
+            loaded[answer.checklist_id].append(answer)
+    return loaded
+
+
+async def patch_document(
+    db: AsyncSession,
+    checklist_id: uuid.UUID,
+    answers: Dict[str, Tuple[List[List[bool]], bool]],
+) -> List[StoredAnswer]:
+    """
+    Set the given questions (key -> (answers, critical)) in the checklist's
+    document, creating it from existing rows if needed. Returns every answer.
+    The caller commits.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    patch = literal(
+        {key: {"answers": grid, "critical": critical, "updated_at": now} for key, (grid, critical) in answers.items()},
+        JSONB,
+    )
+    statement = (
+        insert(ChecklistAnswerSet)
+        .values(
+            checklist_id=checklist_id,
+            answers=func.coalesce(_fold_rows(checklist_id), text("'{}'::jsonb")).op("||")(patch),
+        )
+        .on_conflict_do_update(
+            index_elements=[ChecklistAnswerSet.checklist_id],
+            set_={"answers": ChecklistAnswerSet.answers.op("||")(patch), "updated_at": func.now()},
+        )
+        .returning(ChecklistAnswerSet.answers)
+    )
+    result = await db.execute(statement)
+    return from_document(checklist_id, result.scalar_one())
+
+
+async def convert_to_documents(db: AsyncSession) -> int:
+    """Create documents for every checklist that has rows but no document yet."""
+    result = await db.execute(text("""
+        INSERT INTO checklist_answer_sets (checklist_id, answers, updated_at)
+        SELECT checklist_id,
+               jsonb_object_agg(question_key, jsonb_build_object(
+                   'answers', answers, 'critical', critical, 'updated_at', updated_at)),
+               max(updated_at)
+        FROM checklist_answers
+        GROUP BY checklist_id
+        ON CONFLICT (checklist_id) DO NOTHING
+    """))
+    await db.commit()
+    return result.rowcount
+
+
+async def _main() -> None:
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        count = await convert_to_documents(db)
+    logger.info(f"Created {count} checklist answer documents")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
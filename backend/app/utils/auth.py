@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.config import settings
+from app.core.revocations import revocations
 from app.db.session import get_session
 from app.models.user import User
 
@@ -67,6 +68,14 @@ def verify_token(token: str, token_type: str = "access") -> dict:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        # Tokens of a revoked sign-in, checked in memory (app.core.revocations)
+        if revocations.is_revoked(payload.get("fam")):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
         # Check expiration
         exp = payload.get("exp")
         if exp is None or datetime.utcnow() > datetime.fromtimestamp(exp):
@@ -142,3 +151,13 @@ async def get_current_user_optional(
         return await get_current_user(credentials, db)
     except HTTPException:
         return None
+
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Require the current user to be listed in ADMIN_EMAILS."""
+    if current_user.email.lower() not in {email.lower() for email in settings.ADMIN_EMAILS}:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
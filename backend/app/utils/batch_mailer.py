@@ -0,0 +1,227 @@
+"""
+Bulk notification mailer.
+
+Recipients are selected with a single query, messages are rendered up front
+from the cached MIME skeletons in app.utils.email_templates, and delivery goes
+over one reused SMTP session with a per-relay rate limit.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.checklist import Checklist
+from app.models.review import Review
+from app.models.user import User
+from app.utils.email import build_templated_message
+from app.utils.lazy import lazy_import
+
+# Loaded on first send
+aiosmtplib = lazy_import("aiosmtplib")
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` sends per second, with bursts up to ``burst``."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# One limiter per relay so concurrent batches share the relay's budget
+_relay_limiters: Dict[Tuple[str, int], RateLimiter] = {}
+
+
+def get_relay_limiter(hostname: str, port: int) -> RateLimiter:
+    """Return the shared rate limiter for an SMTP relay."""
+    key = (hostname, port)
+    if key not in _relay_limiters:
+        _relay_limiters[key] = RateLimiter(settings.SMTP_RATE_LIMIT_PER_SECOND)
+    return _relay_limiters[key]
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch send."""
+    sent: int = 0
+    failed: List[str] = field(default_factory=list)
+
+
+class SMTPBatchSender:
+    """
+    Deliver many pre-built messages over a single SMTP session.
+
+    The session is opened on enter and reused for every message; if the relay
+    drops the connection mid-batch it is reopened once per failure.
+    """
+
+    def __init__(
+        self,
+        hostname: Optional[str] = None,
+        port: Optional[int] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        sender: Optional[str] = None,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.hostname = hostname or settings.SMTP_HOST
+        self.port = port or settings.SMTP_PORT
+        self.sender = sender or settings.EMAIL_FROM or settings.SMTP_USER
+        self.limiter = limiter or get_relay_limiter(self.hostname, self.port)
+        # Port 587 uses STARTTLS, Port 465 uses implicit TLS
+        self.smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=username or None,
+            password=password or None,
+            use_tls=self.port == 465,
+            start_tls=True if self.port == 587 else False,
+            timeout=60,
+        )
+
+    async def __aenter__(self) -> "SMTPBatchSender":
+        await self.smtp.connect()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        if self.smtp.is_connected:
+            try:
+                await self.smtp.quit()
+            except aiosmtplib.SMTPException:
+                self.smtp.close()
+
+    async def send(self, to_email: str, message: bytes) -> bool:
+        """Send one message, reconnecting if the relay dropped the session."""
+        await self.limiter.acquire()
+        try:
+            if not self.smtp.is_connected:
+                await self.smtp.connect()
+            await self.smtp.sendmail(self.sender, [to_email], message)
+            return True
+        except aiosmtplib.SMTPServerDisconnected:
+            try:
+                await self.smtp.connect()
+                await self.smtp.sendmail(self.sender, [to_email], message)
+                return True
+            except aiosmtplib.SMTPException as e:
+                logger.error(f"SMTP error sending email to {to_email}: {str(e)}")
+                return False
+        except aiosmtplib.SMTPException as e:
+            logger.error(f"SMTP error sending email to {to_email}: {str(e)}")
+            return False
+
+    async def send_all(self, messages: Iterable[Tuple[str, bytes]]) -> BatchResult:
+        """Send (recipient, message) pairs in order."""
+        result = BatchResult()
+        for to_email, message in messages:
+            if await self.send(to_email, message):
+                result.sent += 1
+            else:
+                result.failed.append(to_email)
+        return result
+
+
+async def deliver(messages: Sequence[Tuple[str, bytes]], sender: Optional[SMTPBatchSender] = None) -> BatchResult:
+    """
+    Deliver pre-built messages over one SMTP session.
+
+    Returns an empty result without connecting when SMTP is not configured.
+    """
+    if not messages:
+        return BatchResult()
+    if sender is None:
+        if not settings.SMTP_USER or not settings.SMTP_PASS:
+            logger.warning("SMTP credentials not configured. Batch of %d emails not sent.", len(messages))
+            return BatchResult(failed=[to_email for to_email, _ in messages])
+        sender = SMTPBatchSender(username=settings.SMTP_USER, password=settings.SMTP_PASS)
+
+    try:
+        async with sender:
+            result = await sender.send_all(messages)
+    except (aiosmtplib.SMTPException, OSError) as e:
+        logger.error(f"Could not open SMTP session to {sender.hostname}:{sender.port}: {str(e)}")
+        return BatchResult(failed=[to_email for to_email, _ in messages])
+
+    logger.info(f"Batch email delivery finished: {result.sent} sent, {len(result.failed)} failed")
+    return result
+
+
+def project_link(project_id: UUID) -> str:
+    return f"{settings.FRONTEND_URL}/projects/{project_id}"
+
+
+async def get_pending_reviewers(db: AsyncSession, project_id: UUID) -> List[Tuple[str, str, int]]:
+    """
+    Return (email, name, pending checklist count) for every verified reviewer
+    with incomplete checklists in the project, in one query.
+    """
+    result = await db.execute(
+        select(User.email, User.name, func.count(Checklist.id))
+        .join(Checklist, Checklist.reviewer_id == User.id)
+        .join(Review, Review.id == Checklist.review_id)
+        .where(
+            Review.project_id == project_id,
+            Checklist.completed_at.is_(None),
+            User.email_verified_at.isnot(None),
+        )
+        .group_by(User.id, User.email, User.name)
+        .order_by(User.email)
+    )
+    return [(email, name, pending) for email, name, pending in result.all()]
+
+
+def build_reminder_messages(
+    project_id: UUID, project_name: str, reviewers: Iterable[Tuple[str, str, int]]
+) -> List[Tuple[str, bytes]]:
+    """Render checklist reminder messages for (email, name, pending) rows."""
+    link = project_link(project_id)
+    return [
+        (email, build_templated_message(
+            "checklist_reminder", email, name=name, pending=str(pending), project=project_name, link=link
+        ))
+        for email, name, pending in reviewers
+    ]
+
+
+def build_invite_messages(
+    project_id: UUID, project_name: str, inviter_name: str, invitees: Iterable[Tuple[str, str]]
+) -> List[Tuple[str, bytes]]:
+    """Render project invitation messages for (email, name) rows."""
+    link = project_link(project_id)
+    return [
+        (email, build_templated_message(
+            "project_invite", email, name=name, inviter=inviter_name, project=project_name, link=link
+        ))
+        for email, name in invitees
+    ]
+
+
+async def send_project_invitations(
+    project_id: UUID, project_name: str, inviter_name: str, invitees: Sequence[Tuple[str, str]]
+) -> BatchResult:
+    """Notify newly added project members."""
+    return await deliver(build_invite_messages(project_id, project_name, inviter_name, invitees))
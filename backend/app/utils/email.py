@@ -1,15 +1,33 @@
 import logging
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.utils import formataddr
 from typing import Optional
 
-import aiosmtplib
-
 from app.core.config import settings
+from app.utils.email_templates import (
+    PASSWORD_RESET_HTML,
+    PASSWORD_RESET_SUBJECT,
+    PASSWORD_RESET_TEXT,
+    VERIFICATION_HTML,
+    VERIFICATION_SUBJECT,
+    VERIFICATION_TEXT,
+    get_skeleton,
+)
+from app.utils.lazy import lazy_import
+
+# Loaded on first send
+aiosmtplib = lazy_import("aiosmtplib")
 
 logger = logging.getLogger(__name__)
 
 
+def get_sender() -> str:
+    """Return the From header value for outgoing mail."""
+    # Quotes or RFC 2047-encodes the display name as needed
+    return formataddr((settings.EMAIL_FROM_NAME, settings.EMAIL_FROM or settings.SMTP_USER), charset="utf-8")
+
+
 async def send_email(
     to_email: str,
     subject: str,
@@ -37,7 +55,7 @@ async def send_email(
         # Create message
         message = MIMEMultipart("alternative")
         message["Subject"] = subject
-        message["From"] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM or settings.SMTP_USER}>"
+        message["From"] = get_sender()
         message["To"] = to_email
         
         # Add plain text version if provided, otherwise convert HTML to basic text
@@ -91,120 +109,13 @@ async def send_verification_email(email: str, code: str) -> bool:
     Returns:
         bool: True if email sent successfully, False otherwise
     """
-    subject = "Verify Your Email - CoRATES"
-    
     # Create verification link that will trigger auto-verification in frontend
     verification_link = f"{settings.FRONTEND_URL}/verify-email?codeSent=true&code={code}"
     
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-            }}
-            .container {{
-                background-color: #ffffff;
-                border-radius: 8px;
-                padding: 40px;
-                border: 1px solid #e5e7eb;
-            }}
-            .header {{
-                text-align: center;
-                margin-bottom: 30px;
-            }}
-            .button {{
-                display: inline-block;
-                background-color: #4f46e5;
-                color: white !important;
-                text-decoration: none;
-                padding: 14px 32px;
-                border-radius: 8px;
-                margin: 20px 0;
-                font-weight: 600;
-                text-align: center;
-            }}
-            .code {{
-                background-color: #f3f4f6;
-                color: #1f2937;
-                font-size: 24px;
-                font-weight: bold;
-                text-align: center;
-                padding: 16px;
-                border-radius: 8px;
-                letter-spacing: 4px;
-                margin: 20px 0;
-                font-family: 'Courier New', monospace;
-            }}
-            .footer {{
-                text-align: center;
-                font-size: 12px;
-                color: #6b7280;
-                margin-top: 30px;
-                padding-top: 20px;
-                border-top: 1px solid #e5e7eb;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1 style="color: #1f2937; margin: 0;">Verify Your Email</h1>
-            </div>
-            
-            <p>Hello,</p>
-            
-            <p>Thank you for signing up with CoRATES! Click the button below to verify your email address:</p>
-            
-            <div style="text-align: center;">
-                <a href="{verification_link}" class="button">Verify Email</a>
-            </div>
-            
-            <p style="text-align: center; color: #6b7280; font-size: 14px; margin: 20px 0;">
-                Or enter this code manually:
-            </p>
-            
-            <div class="code">{code}</div>
-            
-            <p style="font-size: 14px; color: #6b7280;">This code will expire in 15 minutes.</p>
-            
-            <p style="font-size: 14px; color: #6b7280;">If you didn't create an account with CoRATES, please ignore this email.</p>
-            
-            <div class="footer">
-                <p>This is an automated message from CoRATES. Please do not reply to this email.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-    
-    text_content = f"""
-Verify Your Email - CoRATES
-
-Hello,
-
-Thank you for signing up with CoRATES! 
-
-Click the link below to verify your email address:
-{verification_link}
-
-Or enter this verification code manually: {code}
-
-This code will expire in 15 minutes.
-
-If you didn't create an account with CoRATES, please ignore this email.
-
----
-This is an automated message from CoRATES. Please do not reply to this email.
-    """
+    html_content = VERIFICATION_HTML.render(link=verification_link, code=code)
+    text_content = VERIFICATION_TEXT.render(link=verification_link, code=code)
     
-    return await send_email(email, subject, html_content, text_content)
+    return await send_email(email, VERIFICATION_SUBJECT, html_content, text_content)
 
 
 async def send_password_reset_email(email: str, code: str) -> bool:
@@ -218,130 +129,29 @@ async def send_password_reset_email(email: str, code: str) -> bool:
     Returns:
         bool: True if email sent successfully, False otherwise
     """
-    subject = "Reset Your Password - CoRATES"
-    
     # Create reset link that directs to frontend reset password page
     reset_link = f"{settings.FRONTEND_URL}/reset-password?codeSent=true&code={code}"
     
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-            }}
-            .container {{
-                background-color: #ffffff;
-                border-radius: 8px;
-                padding: 40px;
-                border: 1px solid #e5e7eb;
-            }}
-            .header {{
-                text-align: center;
-                margin-bottom: 30px;
-            }}
-            .button {{
-                display: inline-block;
-                background-color: #dc2626;
-                color: white !important;
-                text-decoration: none;
-                padding: 14px 32px;
-                border-radius: 8px;
-                margin: 20px 0;
-                font-weight: 600;
-                text-align: center;
-            }}
-            .code {{
-                background-color: #f3f4f6;
-                color: #1f2937;
-                font-size: 24px;
-                font-weight: bold;
-                text-align: center;
-                padding: 16px;
-                border-radius: 8px;
-                letter-spacing: 4px;
-                margin: 20px 0;
-                font-family: 'Courier New', monospace;
-            }}
-            .warning {{
-                background-color: #fef3c7;
-                border-left: 4px solid #f59e0b;
-                padding: 16px;
-                margin: 20px 0;
-                border-radius: 4px;
-            }}
-            .footer {{
-                text-align: center;
-                font-size: 12px;
-                color: #6b7280;
-                margin-top: 30px;
-                padding-top: 20px;
-                border-top: 1px solid #e5e7eb;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1 style="color: #1f2937; margin: 0;">Reset Your Password</h1>
-            </div>
-            
-            <p>Hello,</p>
-            
-            <p>We received a request to reset the password for your CoRATES account. Click the button below to reset your password:</p>
-            
-            <div style="text-align: center;">
-                <a href="{reset_link}" class="button">Reset Password</a>
-            </div>
-            
-            <p style="text-align: center; color: #6b7280; font-size: 14px; margin: 20px 0;">
-                Or enter this code manually:
-            </p>
-            
-            <div class="code">{code}</div>
-            
-            <p style="font-size: 14px; color: #6b7280;">This code will expire in 15 minutes.</p>
-            
-            <div class="warning">
-                <strong style="color: #92400e;">⚠️ Security Notice:</strong>
-                <p style="margin: 8px 0 0 0; color: #78350f; font-size: 14px;">
-                    If you didn't request a password reset, please ignore this email and ensure your account is secure.
-                </p>
-            </div>
-            
-            <div class="footer">
-                <p>This is an automated message from CoRATES. Please do not reply to this email.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    html_content = PASSWORD_RESET_HTML.render(link=reset_link, code=code)
+    text_content = PASSWORD_RESET_TEXT.render(link=reset_link, code=code)
     
-    text_content = f"""
-Reset Your Password - CoRATES
-
-Hello,
-
-We received a request to reset the password for your CoRATES account.
-
-Click the link below to reset your password:
-{reset_link}
-
-Or enter this reset code manually: {code}
-
-This code will expire in 15 minutes.
+    return await send_email(email, PASSWORD_RESET_SUBJECT, html_content, text_content)
 
-⚠️ SECURITY NOTICE: If you didn't request a password reset, please ignore this email and ensure your account is secure.
 
----
-This is an automated message from CoRATES. Please do not reply to this email.
+def build_templated_message(template_name: str, to_email: str, **values: str) -> bytes:
     """
+    Build a ready-to-send message from a cached MIME skeleton.
     
-    return await send_email(email, subject, html_content, text_content)
-
+    Used by bulk senders, which pass the bytes straight to an SMTP session
+    instead of building a MIMEMultipart per recipient.
+    
+    Args:
+        template_name: Key in app.utils.email_templates.TEMPLATES
+        to_email: Recipient email address
+        **values: Template placeholder values (e.g. code, link)
+    
+    Returns:
+        bytes: The encoded message
+    """
+    skeleton = get_skeleton(template_name, get_sender())
+    return skeleton.build(to_email, **values)
@@ -0,0 +1,481 @@
+"""
+Precompiled email templates.
+
+Templates are parsed once at import into static chunks and placeholder names,
+so rendering a message only joins the pre-built pieces with the per-recipient
+values (code, link). The MIME skeletons cache the encoded headers and part
+headers for a sender, which keeps bulk sends cheap; only the Date,
+Message-ID and To headers and a random part boundary are generated per
+message.
+"""
+import html
+import re
+import secrets
+from email.header import Header
+from email.utils import formataddr, formatdate, make_msgid, parseaddr
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Placeholders look like {{ code }}; single braces are left alone for CSS
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Values may come from users (project and user names); a line break in one
+# could otherwise start a line that reads as a MIME boundary
+_LINE_BREAK_RE = re.compile(r"[\r\n]+")
+
+
+class EmailTemplate:
+    """
+    A template compiled into alternating static chunks and placeholder names.
+
+    Values are rendered on one line, CR/LF replaced by a space, and are
+    otherwise verbatim unless ``autoescape`` is set, so HTML templates
+    without it must only receive server generated values (codes, links).
+    """
+
+    def __init__(self, source: str, autoescape: bool = False):
+        self.autoescape = autoescape
+        pieces = _PLACEHOLDER_RE.split(source)
+        self.chunks: List[str] = pieces[0::2]
+        self.names: List[str] = pieces[1::2]
+        self.encoded_chunks: List[bytes] = [
+            chunk.replace("\r\n", "\n").replace("\n", "\r\n").encode("utf-8")
+            for chunk in self.chunks
+        ]
+
+    def _value(self, values: Dict[str, str], name: str) -> str:
+        value = _LINE_BREAK_RE.sub(" ", str(values[name]))
+        return html.escape(value) if self.autoescape else value
+
+    def render(self, **values: str) -> str:
+        """Render the template to a string."""
+        out = [self.chunks[0]]
+        for name, chunk in zip(self.names, self.chunks[1:]):
+            out.append(self._value(values, name))
+            out.append(chunk)
+        return "".join(out)
+
+    def render_bytes(self, **values: str) -> bytes:
+        """Render the template to CRLF-terminated UTF-8 bytes."""
+        out = [self.encoded_chunks[0]]
+        for name, chunk in zip(self.names, self.encoded_chunks[1:]):
+            out.append(self._value(values, name).encode("utf-8"))
+            out.append(chunk)
+        return b"".join(out)
+
+
+def make_boundary() -> str:
+    """A random part boundary, so no rendered value can close a part early."""
+    return "===============" + secrets.token_hex(16) + "=="
+
+
+class MessageSkeleton:
+    """
+    Pre-encoded multipart/alternative message for one template and sender.
+
+    Only the Date, Message-ID and To headers, the boundary and the template
+    values change per message; everything else is encoded once. Parts use
+    8bit transfer encoding so the encoded static chunks can be concatenated
+    with the rendered values directly.
+    """
+
+    def __init__(self, subject: str, sender: str, text: EmailTemplate, html: EmailTemplate):
+        self.text = text
+        self.html = html
+        name, address = parseaddr(sender)
+        # Message-IDs are generated in the sender's domain
+        self.domain = address.rpartition("@")[2] or "localhost"
+        self.header_prefix = (
+            f"From: {formataddr((name, address), charset='utf-8')}\r\n"
+            f"Subject: {Header(subject, 'utf-8').encode()}\r\n"
+            "MIME-Version: 1.0\r\n"
+        ).encode("utf-8")
+        part_headers = (
+            'Content-Type: text/{subtype}; charset="utf-8"\r\n'
+            "Content-Transfer-Encoding: 8bit\r\n"
+            "\r\n"
+        )
+        self.text_headers = part_headers.format(subtype="plain").encode("ascii")
+        self.html_headers = part_headers.format(subtype="html").encode("ascii")
+
+    def build(self, to_email: str, **values: str) -> bytes:
+        """Build the full RFC 5322 message for one recipient."""
+        boundary = make_boundary()
+        # Guard against header injection from the recipient address
+        to_header = to_email.replace("\r", "").replace("\n", "")
+        headers = (
+            f"Date: {formatdate(usegmt=True)}\r\n"
+            f"Message-ID: {make_msgid(domain=self.domain)}\r\n"
+            f'Content-Type: multipart/alternative; boundary="{boundary}"\r\n'
+            f"To: {to_header}"
+        ).encode("utf-8")
+        delimiter = f"\r\n--{boundary}".encode("ascii")
+        return b"".join((
+            self.header_prefix,
+            headers,
+            b"\r\n", delimiter, b"\r\n",
+            self.text_headers,
+            self.text.render_bytes(**values),
+            delimiter, b"\r\n",
+            self.html_headers,
+            self.html.render_bytes(**values),
+            delimiter, b"--\r\n",
+        ))
+
+
+VERIFICATION_SUBJECT = "Verify Your Email - CoRATES"
+
+VERIFICATION_HTML = EmailTemplate("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
+                line-height: 1.6;
+                color: #333;
+                max-width: 600px;
+                margin: 0 auto;
+                padding: 20px;
+            }
+            .container {
+                background-color: #ffffff;
+                border-radius: 8px;
+                padding: 40px;
+                border: 1px solid #e5e7eb;
+            }
+            .header {
+                text-align: center;
+                margin-bottom: 30px;
+            }
+            .button {
+                display: inline-block;
+                background-color: #4f46e5;
+                color: white !important;
+                text-decoration: none;
+                padding: 14px 32px;
+                border-radius: 8px;
+                margin: 20px 0;
+                font-weight: 600;
+                text-align: center;
+            }
+            .code {
+                background-color: #f3f4f6;
+                color: #1f2937;
+                font-size: 24px;
+                font-weight: bold;
+                text-align: center;
+                padding: 16px;
+                border-radius: 8px;
+                letter-spacing: 4px;
+                margin: 20px 0;
+                font-family: 'Courier New', monospace;
+            }
+            .footer {
+                text-align: center;
+                font-size: 12px;
+                color: #6b7280;
+                margin-top: 30px;
+                padding-top: 20px;
+                border-top: 1px solid #e5e7eb;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1 style="color: #1f2937; margin: 0;">Verify Your Email</h1>
+            </div>
+
+            <p>Hello,</p>
+
+            <p>Thank you for signing up with CoRATES! Click the button below to verify your email address:</p>
+
+            <div style="text-align: center;">
+                <a href="{{ link }}" class="button">Verify Email</a>
+            </div>
+
+            <p style="text-align: center; color: #6b7280; font-size: 14px; margin: 20px 0;">
+                Or enter this code manually:
+            </p>
+
+            <div class="code">{{ code }}</div>
+
+            <p style="font-size: 14px; color: #6b7280;">This code will expire in 15 minutes.</p>
+
+            <p style="font-size: 14px; color: #6b7280;">If you didn't create an account with CoRATES, please ignore this email.</p>
+
+            <div class="footer">
+                <p>This is an automated message from CoRATES. Please do not reply to this email.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """)
+
+VERIFICATION_TEXT = EmailTemplate("""
+Verify Your Email - CoRATES
+
+Hello,
+
+Thank you for signing up with CoRATES!
+
+Click the link below to verify your email address:
+{{ link }}
+
+Or enter this verification code manually: {{ code }}
+
+This code will expire in 15 minutes.
+
+If you didn't create an account with CoRATES, please ignore this email.
+
+---
+This is an automated message from CoRATES. Please do not reply to this email.
+    """)
+
+PASSWORD_RESET_SUBJECT = "Reset Your Password - CoRATES"
+
+PASSWORD_RESET_HTML = EmailTemplate("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
+                line-height: 1.6;
+                color: #333;
+                max-width: 600px;
+                margin: 0 auto;
+                padding: 20px;
+            }
+            .container {
+                background-color: #ffffff;
+                border-radius: 8px;
+                padding: 40px;
+                border: 1px solid #e5e7eb;
+            }
+            .header {
+                text-align: center;
+                margin-bottom: 30px;
+            }
+            .button {
+                display: inline-block;
+                background-color: #dc2626;
+                color: white !important;
+                text-decoration: none;
+                padding: 14px 32px;
+                border-radius: 8px;
+                margin: 20px 0;
+                font-weight: 600;
+                text-align: center;
+            }
+            .code {
+                background-color: #f3f4f6;
+                color: #1f2937;
+                font-size: 24px;
+                font-weight: bold;
+                text-align: center;
+                padding: 16px;
+                border-radius: 8px;
+                letter-spacing: 4px;
+                margin: 20px 0;
+                font-family: 'Courier New', monospace;
+            }
+            .warning {
+                background-color: #fef3c7;
+                border-left: 4px solid #f59e0b;
+                padding: 16px;
+                margin: 20px 0;
+                border-radius: 4px;
+            }
+            .footer {
+                text-align: center;
+                font-size: 12px;
+                color: #6b7280;
+                margin-top: 30px;
+                padding-top: 20px;
+                border-top: 1px solid #e5e7eb;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1 style="color: #1f2937; margin: 0;">Reset Your Password</h1>
+            </div>
+
+            <p>Hello,</p>
+
+            <p>We received a request to reset the password for your CoRATES account. Click the button below to reset your password:</p>
+
+            <div style="text-align: center;">
+                <a href="{{ link }}" class="button">Reset Password</a>
+            </div>
+
+            <p style="text-align: center; color: #6b7280; font-size: 14px; margin: 20px 0;">
+                Or enter this code manually:
+            </p>
+
+            <div class="code">{{ code }}</div>
+
+            <p style="font-size: 14px; color: #6b7280;">This code will expire in 15 minutes.</p>
+
+            <div class="warning">
+                <strong style="color: #92400e;">⚠️ Security Notice:</strong>
+                <p style="margin: 8px 0 0 0; color: #78350f; font-size: 14px;">
+                    If you didn't request a password reset, please ignore this email and ensure your account is secure.
+                </p>
+            </div>
+
+            <div class="footer">
+                <p>This is an automated message from CoRATES. Please do not reply to this email.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """)
+
+PASSWORD_RESET_TEXT = EmailTemplate("""
+Reset Your Password - CoRATES
+
+Hello,
+
+We received a request to reset the password for your CoRATES account.
+
+Click the link below to reset your password:
+{{ link }}
+
+Or enter this reset code manually: {{ code }}
+
+This code will expire in 15 minutes.
+
+⚠️ SECURITY NOTICE: If you didn't request a password reset, please ignore this email and ensure your account is secure.
+
+---
+This is an automated message from CoRATES. Please do not reply to this email.
+    """)
+
+_NOTIFICATION_HTML = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
+                line-height: 1.6;
+                color: #333;
+                max-width: 600px;
+                margin: 0 auto;
+                padding: 20px;
+            }
+            .container {
+                background-color: #ffffff;
+                border-radius: 8px;
+                padding: 40px;
+                border: 1px solid #e5e7eb;
+            }
+            .header {
+                text-align: center;
+                margin-bottom: 30px;
+            }
+            .button {
+                display: inline-block;
+                background-color: #4f46e5;
+                color: white !important;
+                text-decoration: none;
+                padding: 14px 32px;
+                border-radius: 8px;
+                margin: 20px 0;
+                font-weight: 600;
+                text-align: center;
+            }
+            .footer {
+                text-align: center;
+                font-size: 12px;
+                color: #6b7280;
+                margin-top: 30px;
+                padding-top: 20px;
+                border-top: 1px solid #e5e7eb;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1 style="color: #1f2937; margin: 0;">%(heading)s</h1>
+            </div>
+
+            <p>Hello {{ name }},</p>
+
+            <p>%(body)s</p>
+
+            <div style="text-align: center;">
+                <a href="{{ link }}" class="button">%(button)s</a>
+            </div>
+
+            <div class="footer">
+                <p>This is an automated message from CoRATES. Please do not reply to this email.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+PROJECT_INVITE_SUBJECT = "You've Been Added to a Project - CoRATES"
+
+PROJECT_INVITE_HTML = EmailTemplate(_NOTIFICATION_HTML % {
+    "heading": "You've Been Added to a Project",
+    "body": "{{ inviter }} added you to the project <strong>{{ project }}</strong> on CoRATES.",
+    "button": "Open Project",
+}, autoescape=True)
+
+PROJECT_INVITE_TEXT = EmailTemplate("""
+You've Been Added to a Project - CoRATES
+
+Hello {{ name }},
+
+{{ inviter }} added you to the project "{{ project }}" on CoRATES.
+
+Open the project:
+{{ link }}
+
+---
+This is an automated message from CoRATES. Please do not reply to this email.
+    """)
+
+CHECKLIST_REMINDER_SUBJECT = "Checklists Awaiting Your Review - CoRATES"
+
+CHECKLIST_REMINDER_HTML = EmailTemplate(_NOTIFICATION_HTML % {
+    "heading": "Checklists Awaiting Your Review",
+    "body": "You have <strong>{{ pending }}</strong> incomplete checklist(s) in the project <strong>{{ project }}</strong>.",
+    "button": "Continue Reviewing",
+}, autoescape=True)
+
+CHECKLIST_REMINDER_TEXT = EmailTemplate("""
+Checklists Awaiting Your Review - CoRATES
+
+Hello {{ name }},
+
+You have {{ pending }} incomplete checklist(s) in the project "{{ project }}".
+
+Continue reviewing:
+{{ link }}
+
+---
+This is an automated message from CoRATES. Please do not reply to this email.
+    """)
+
+# name -> (subject, text template, html template)
+TEMPLATES: Dict[str, Tuple[str, EmailTemplate, EmailTemplate]] = {
+    "verification": (VERIFICATION_SUBJECT, VERIFICATION_TEXT, VERIFICATION_HTML),
+    "password_reset": (PASSWORD_RESET_SUBJECT, PASSWORD_RESET_TEXT, PASSWORD_RESET_HTML),
+    "project_invite": (PROJECT_INVITE_SUBJECT, PROJECT_INVITE_TEXT, PROJECT_INVITE_HTML),
+    "checklist_reminder": (CHECKLIST_REMINDER_SUBJECT, CHECKLIST_REMINDER_TEXT, CHECKLIST_REMINDER_HTML),
+}
+
+
+@lru_cache(maxsize=64)
+def get_skeleton(template_name: str, sender: str) -> MessageSkeleton:
+    """Return the cached MIME skeleton for a template and sender."""
+    subject, text, html = TEMPLATES[template_name]
+    return MessageSkeleton(subject, sender, text, html)
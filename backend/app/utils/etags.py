@@ -0,0 +1,62 @@
+"""
+Weak ETags and conditional GET.
+
+A checklist's version is its ``updated_at``, which every answer write bumps
+(see app.api.v1.endpoints.checklist_answers), plus the columns a bulk update
+could change without touching it. Endpoints compute the ETag from the
+checklist row alone and answer ``If-None-Match`` with 304 before loading any
+answers. ETags are weak: the JSON and packed representations of the same
+version share one.
+"""
+import hashlib
+from datetime import timezone
+from typing import Any, Optional, Set
+
+from fastapi import Request, Response, status
+
+# Clients must revalidate, but may keep the body and send If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1("|".join("" if part is None else str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def checklist_etag(checklist) -> str:
+    """ETag of a checklist row (or any row with the same columns)."""
+    updated_at = checklist.updated_at.astimezone(timezone.utc).isoformat()
+    return make_etag(checklist.id, updated_at, checklist.completed_at, checklist.reviewer_id)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def parse_if_none_match(header: str) -> Set[str]:
+    """The entity tags of an If-None-Match header, compared weakly (W/ dropped)."""
+    return {_opaque(tag) for tag in header.split(",") if tag.strip()}
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = parse_if_none_match(header)
+    return "*" in tags or _opaque(etag) in tags
+
+
+def same_etag(etag: str, other: Optional[str]) -> bool:
+    """Weak comparison of two entity tags; a missing tag matches nothing."""
+    return bool(other) and _opaque(etag) == _opaque(other)
+
+
+def set_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def not_modified(etag: str) -> Response:
+    return set_etag(Response(status_code=status.HTTP_304_NOT_MODIFIED), etag)
@@ -0,0 +1,323 @@
+"""
+Index advisor for the local database.
+
+Reads the statistics views Postgres keeps for the current schema and reports:
+
+- redundant indexes, whose columns are a leading prefix of another index on
+  the same table (including the primary key)
+- unused indexes, never scanned since statistics were last reset
+- missing indexes, for foreign keys with no index leading on their columns
+  (cascading deletes and joins scan the referencing table) and for columns
+  our statements filter or join on that no index leads with
+- tables read mostly by sequential scans
+
+Statements come from ``pg_stat_statements`` when the extension is installed
+(``CREATE EXTENSION pg_stat_statements``; the docker-compose Postgres preloads
+the library). Run the app or ``python -m benchmarks.api_load`` against the
+database first so the statistics reflect our query mix, then:
+
+    python -m app.utils.index_advisor
+"""
+import argparse
+import asyncio
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Tables smaller than this are cheap to scan sequentially, so scans of them
+# are not reported
+MIN_ROWS = 1000
+
+INDEXES_QUERY = """
+    SELECT s.relname AS table, s.indexrelname AS name,
+           ARRAY(
+               SELECT a.attname
+               FROM unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, position)
+               JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+               ORDER BY k.position
+           ) AS columns,
+           i.indisunique AS unique, i.indisprimary AS primary, i.indpred IS NOT NULL AS partial,
+           s.idx_scan AS scans, pg_relation_size(s.indexrelid) AS size_bytes
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    WHERE s.schemaname = current_schema()
+"""
+
+TABLES_QUERY = """
+    SELECT relname AS name, seq_scan, seq_tup_read, coalesce(idx_scan, 0) AS idx_scan, n_live_tup AS live_rows
+    FROM pg_stat_user_tables
+    WHERE schemaname = current_schema()
+"""
+
+FOREIGN_KEYS_QUERY = """
+    SELECT c.conrelid::regclass::text AS table, c.conname AS name,
+           ARRAY(
+               SELECT a.attname
+               FROM unnest(c.conkey) WITH ORDINALITY AS k(attnum, position)
+               JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+               ORDER BY k.position
+           ) AS columns
+    FROM pg_constraint c
+    WHERE c.contype = 'f' AND c.connamespace = current_schema()::regnamespace
+"""
+
+STATEMENTS_QUERY = """
+    SELECT query, calls, total_exec_time AS total_ms
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+    ORDER BY total_exec_time DESC
+    LIMIT :limit
+"""
+
+_QUALIFIED_COLUMN = r'"?([a-z_][a-z0-9_]*)"?\."?([a-z_][a-z0-9_]*)"?'
+# table.column followed by a comparison, or preceded by "=" (the probed side of a join)
+_COMPARED_COLUMNS = (
+    re.compile(_QUALIFIED_COLUMN + r'\s*(?:=|<>|!=|<=|>=|<|>|\bIN\b|\bIS\b)', re.IGNORECASE),
+    re.compile(r'=\s*' + _QUALIFIED_COLUMN, re.IGNORECASE),
+)
+_ALIAS_SUFFIX = re.compile(r"_\d+$")
+
+
+@dataclass
+class IndexInfo:
+    table: str
+    name: str
+    columns: Tuple[str, ...]
+    unique: bool = False
+    primary: bool = False
+    partial: bool = False
+    scans: int = 0
+    size_bytes: int = 0
+
+
+@dataclass
+class TableInfo:
+    name: str
+    seq_scan: int
+    seq_tup_read: int
+    idx_scan: int
+    live_rows: int
+
+
+@dataclass
+class ForeignKeyInfo:
+    table: str
+    name: str
+    columns: Tuple[str, ...]
+
+
+@dataclass
+class StatementInfo:
+    query: str
+    calls: int
+    total_ms: float
+
+
+@dataclass
+class Finding:
+    kind: str  # "redundant", "unused", "missing" or "seq_scan"
+    table: str
+    columns: Tuple[str, ...]
+    detail: str
+    index: Optional[str] = None
+    statements: List[str] = field(default_factory=list)
+
+
+def redundant_indexes(indexes: Sequence[IndexInfo]) -> List[Finding]:
+    """Non-unique indexes whose columns lead another index of the same table."""
+    findings = []
+    for index in indexes:
+        if index.unique or index.primary or index.partial:
+            continue
+        for other in indexes:
+            if other is index or other.table != index.table or other.partial:
+                continue
+            if other.columns[:len(index.columns)] != index.columns:
+                continue
+            # Of two identical plain indexes keep the first by name
+            if other.columns == index.columns and not (other.unique or other.primary) and other.name > index.name:
+                continue
+            findings.append(Finding(
+                kind="redundant",
+                table=index.table,
+                columns=index.columns,
+                index=index.name,
+                detail=f"covered by {other.name} ({', '.join(other.columns)}); {index.size_bytes} bytes",
+            ))
+            break
+    return findings
+
+
+def unused_indexes(indexes: Sequence[IndexInfo]) -> List[Finding]:
+    """Indexes never scanned. Unique and primary key indexes enforce constraints, so they stay."""
+    return [
+        Finding(
+            kind="unused",
+            table=index.table,
+            columns=index.columns,
+            index=index.name,
+            detail=f"0 scans since statistics were reset; {index.size_bytes} bytes",
+        )
+        for index in indexes
+        if index.scans == 0 and not (index.unique or index.primary)
+    ]
+
+
+def compared_columns(query: str) -> Set[Tuple[str, str]]:
+    """(table, column) pairs a statement filters or joins on, as SQLAlchemy writes them."""
+    return {
+        (table.lower(), column.lower())
+        for pattern in _COMPARED_COLUMNS
+        for table, column in pattern.findall(query)
+    }
+
+
+def _resolve_table(name: str, known: Set[str]) -> Optional[str]:
+    if name in known:
+        return name
+    # SQLAlchemy aliases tables as <table>_1, <table>_2, ...
+    base = _ALIAS_SUFFIX.sub("", name)
+    return base if base in known else None
+
+
+def _leading_columns(indexes: Iterable[IndexInfo]) -> Dict[str, Set[str]]:
+    leading = defaultdict(set)
+    for index in indexes:
+        if index.columns:
+            leading[index.table].add(index.columns[0])
+    return leading
+
+
+def missing_indexes(
+    indexes: Sequence[IndexInfo],
+    foreign_keys: Sequence[ForeignKeyInfo],
+    statements: Sequence[StatementInfo],
+    tables: Sequence[TableInfo] = (),
+) -> List[Finding]:
+    """Foreign keys and compared columns that no index leads with, heaviest statements first."""
+    leading = _leading_columns(indexes)
+    known = {index.table for index in indexes} | {table.name for table in tables} | {fk.table for fk in foreign_keys}
+    findings = []
+
+    for fk in foreign_keys:
+        if fk.columns and fk.columns[0] not in leading[fk.table]:
+            findings.append(Finding(
+                kind="missing",
+                table=fk.table,
+                columns=fk.columns,
+                detail=f"foreign key {fk.name} has no index; deletes of the referenced row scan {fk.table}",
+            ))
+    reported = {(finding.table, finding.columns[0]) for finding in findings}
+
+    usage: Dict[Tuple[str, str], List[StatementInfo]] = defaultdict(list)
+    for statement in statements:
+        for table, column in compared_columns(statement.query):
+            table = _resolve_table(table, known)
+            if table and column not in leading[table] and (table, column) not in reported:
+                usage[(table, column)].append(statement)
+
+    for (table, column), used_by in sorted(usage.items(), key=lambda item: -sum(s.total_ms for s in item[1])):
+        findings.append(Finding(
+            kind="missing",
+            table=table,
+            columns=(column,),
+            detail=(
+                f"compared in {len(used_by)} statement(s), {sum(s.calls for s in used_by)} calls, "
+                f"{sum(s.total_ms for s in used_by):.1f} ms total"
+            ),
+            statements=[s.query for s in used_by],
+        ))
+    return findings
+
+
+def sequential_scans(tables: Sequence[TableInfo], min_rows: int = MIN_ROWS) -> List[Finding]:
+    """Tables of at least min_rows rows scanned sequentially more often than through an index."""
+    return [
+        Finding(
+            kind="seq_scan",
+            table=table.name,
+            columns=(),
+            detail=f"{table.seq_scan} sequential vs {table.idx_scan} index scans, {table.live_rows} rows",
+        )
+        for table in sorted(tables, key=lambda table: -table.seq_tup_read)
+        if table.live_rows >= min_rows and table.seq_scan > table.idx_scan
+    ]
+
+
+def advise(
+    indexes: Sequence[IndexInfo],
+    tables: Sequence[TableInfo],
+    foreign_keys: Sequence[ForeignKeyInfo],
+    statements: Sequence[StatementInfo],
+    min_rows: int = MIN_ROWS,
+) -> List[Finding]:
+    redundant = redundant_indexes(indexes)
+    flagged = {finding.index for finding in redundant}
+    return (
+        redundant
+        + [finding for finding in unused_indexes(indexes) if finding.index not in flagged]
+        + missing_indexes(indexes, foreign_keys, statements, tables)
+        + sequential_scans(tables, min_rows)
+    )
+
+
+def format_report(findings: Sequence[Finding], statements_available: bool) -> str:
+    if not findings:
+        lines = ["No index findings."]
+    else:
+        lines = []
+        for finding in findings:
+            target = finding.index or f"{finding.table}({', '.join(finding.columns)})"
+            lines.append(f"[{finding.kind}] {target}: {finding.detail}")
+            for query in finding.statements[:3]:
+                lines.append(f"    {' '.join(query.split())[:160]}")
+    if not statements_available:
+        lines.append("pg_stat_statements is not available; statement-based suggestions were skipped.")
+    return "\n".join(lines)
+
+
+async def collect(db: AsyncSession, limit: int = 200):
+    """Read index, table, foreign key and statement statistics for the current schema."""
+    indexes = [
+        IndexInfo(**{**row._asdict(), "columns": tuple(row.columns)})
+        for row in (await db.execute(text(INDEXES_QUERY))).all()
+    ]
+    tables = [TableInfo(**row._asdict()) for row in (await db.execute(text(TABLES_QUERY))).all()]
+    foreign_keys = [
+        ForeignKeyInfo(table=row.table, name=row.name, columns=tuple(row.columns))
+        for row in (await db.execute(text(FOREIGN_KEYS_QUERY))).all()
+    ]
+
+    statements: Optional[List[StatementInfo]] = None
+    installed = await db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'"))
+    if installed.scalar_one_or_none():
+        try:
+            async with db.begin_nested():
+                result = await db.execute(text(STATEMENTS_QUERY), {"limit": limit})
+                statements = [StatementInfo(row.query, row.calls, float(row.total_ms)) for row in result.all()]
+        except DBAPIError:
+            # Extension created but the library is not in shared_preload_libraries
+            statements = None
+    return indexes, tables, foreign_keys, statements
+
+
+async def _main(limit: int, min_rows: int) -> None:
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        indexes, tables, foreign_keys, statements = await collect(db, limit)
+    findings = advise(indexes, tables, foreign_keys, statements or [], min_rows)
+    print(format_report(findings, statements is not None))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statements", type=int, default=200, help="Heaviest statements to analyse")
+    parser.add_argument("--min-rows", type=int, default=MIN_ROWS, help="Ignore sequential scans of smaller tables")
+    args = parser.parse_args()
+    asyncio.run(_main(args.statements, args.min_rows))
@@ -0,0 +1,25 @@
+"""
+Deferred imports for dependencies that only some requests need.
+
+``lazy_import("httpx")`` returns a module object whose code runs on first
+attribute access, so ``import app.main`` (and test collection) does not pay
+for the HTTP client, SMTP client or docs stacks until a request uses them.
+Modules already imported are returned as they are.
+"""
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,30 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is the sort key of the last row of a page, ``(updated_at, id)``,
+encoded as an opaque URL-safe string. The next page continues strictly after
+it, so each page is one index range scan however deep the client has paged,
+unlike OFFSET which reads and discards every earlier row.
+"""
+import base64
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(updated_at: datetime, row_id: uuid.UUID) -> str:
+    raw = f"{updated_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        updated_at, row_id = raw.split("|")
+        parsed = datetime.fromisoformat(updated_at)
+        if parsed.tzinfo is None:
+            raise ValueError("Cursor timestamp has no time zone")
+        return parsed, uuid.UUID(row_id)
+    except (UnicodeDecodeError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
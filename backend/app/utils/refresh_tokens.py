@@ -0,0 +1,153 @@
+"""
+Refresh-token families with rotation.
+
+Sign-in starts a family; every refresh consumes the presented token and
+issues its successor in the same family, so each refresh token works once.
+Presenting a token that was already rotated means it was copied, and the
+whole family is revoked, signing out the copy and the original alike. The
+exception is a refresh racing another one with the same cookie (e.g. two
+tabs): within REFRESH_REUSE_GRACE_SECONDS of the rotation it gets a new
+access token but no new refresh token, and the family stays valid.
+
+Rotated rows are deleted once past that grace period, so a family keeps at
+most a few rows. A validly signed token whose row is gone while its family
+is still live must have been rotated, and counts as reuse all the same.
+
+Revocation marks the family's rows and notifies every worker in the same
+transaction; see app.core.revocations for the in-memory side.
+"""
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.revocations import CHANNEL, revocations
+from app.models.refresh_token import RefreshToken
+from app.utils.auth import create_refresh_token
+
+logger = logging.getLogger(__name__)
+
+# Revokes the live tokens matching a condition and notifies each family once;
+# notifications are delivered when the transaction commits
+REVOKE_SQL = """
+    WITH revoked AS (
+        UPDATE refresh_tokens SET revoked_at = now()
+        WHERE {condition} AND revoked_at IS NULL
+        RETURNING family_id
+    ),
+    families AS (SELECT DISTINCT family_id FROM revoked)
+    SELECT family_id, pg_notify(:channel, family_id::text) FROM families
+"""
+
+REVOKE_FAMILY = text(REVOKE_SQL.format(condition="family_id = :id"))
+REVOKE_USER = text(REVOKE_SQL.format(condition="user_id = :id"))
+
+
+def invalid_refresh_token(detail: str = "Invalid refresh token") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+    )
+
+
+async def issue_refresh_token(db: AsyncSession, user_id: uuid.UUID, family_id: Optional[uuid.UUID] = None) -> Tuple[str, uuid.UUID]:
+    """
+    Record a new refresh token, starting a family unless one is given.
+    Returns the token and its family id; the caller commits.
+    """
+    if family_id is None:
+        family_id = uuid.uuid4()
+        # A sign-in is a good moment to drop the user's expired tokens
+        await db.execute(
+            delete(RefreshToken).where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.expires_at < func.now(),
+            )
+        )
+    jti = uuid.uuid4()
+    db.add(RefreshToken(
+        jti=jti,
+        family_id=family_id,
+        user_id=user_id,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    token = create_refresh_token({"sub": str(user_id), "jti": str(jti), "fam": str(family_id)})
+    return token, family_id
+
+
+async def rotate_refresh_token(db: AsyncSession, payload: dict) -> Tuple[uuid.UUID, uuid.UUID, Optional[str]]:
+    """
+    Consume the refresh token described by a verified ``payload``.
+
+    Returns the user id, the family id and the successor token, which is
+    None for a concurrent refresh within the grace period. The caller
+    commits. Reuse of a rotated token revokes the family, commits that and
+    raises.
+    """
+    try:
+        jti = uuid.UUID(payload["jti"])
+        family_id = uuid.UUID(payload["fam"])
+    except (KeyError, TypeError, ValueError):
+        # Includes tokens issued before rotation existed
+        raise invalid_refresh_token()
+
+    result = await db.execute(select(RefreshToken).where(RefreshToken.jti == jti).with_for_update())
+    token = result.scalar_one_or_none()
+    if token is None:
+        # A validly signed token whose row is gone was rotated and pruned;
+        # presenting it while its family is live is reuse
+        result = await db.execute(
+            select(RefreshToken.jti)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .limit(1)
+        )
+        if result.scalar_one_or_none() is not None:
+            await revoke_reused_family(db, family_id)
+        raise invalid_refresh_token()
+    if token.family_id != family_id or token.revoked_at is not None:
+        raise invalid_refresh_token()
+
+    now = datetime.now(timezone.utc)
+    grace = timedelta(seconds=settings.REFRESH_REUSE_GRACE_SECONDS)
+    if token.rotated_at is not None:
+        if now - token.rotated_at <= grace:
+            return token.user_id, family_id, None
+        await revoke_reused_family(db, family_id)
+
+    token.rotated_at = now
+    # Keep only the tokens still within the grace window; older predecessors
+    # are recognised as reused by their family above
+    await db.execute(
+        delete(RefreshToken).where(
+            RefreshToken.family_id == family_id,
+            RefreshToken.rotated_at < now - grace,
+        )
+    )
+    successor, _ = await issue_refresh_token(db, token.user_id, family_id)
+    return token.user_id, family_id, successor
+
+
+async def revoke_reused_family(db: AsyncSession, family_id: uuid.UUID) -> None:
+    """Revoke a family whose rotated token was presented again, commit and raise."""
+    logger.warning(f"Rotated refresh token reused; revoking family {family_id}")
+    revoked = await revoke_family(db, family_id)
+    await db.commit()
+    revocations.add(revoked)
+    raise invalid_refresh_token("Refresh token reuse detected")
+
+
+async def revoke_family(db: AsyncSession, family_id: uuid.UUID) -> List[uuid.UUID]:
+    """Revoke one family; returns it if it was live. The caller commits."""
+    result = await db.execute(REVOKE_FAMILY, {"id": family_id, "channel": CHANNEL})
+    return [row.family_id for row in result]
+
+
+async def revoke_user_tokens(db: AsyncSession, user_id: uuid.UUID) -> List[uuid.UUID]:
+    """Revoke every family of a user; returns those that were live. The caller commits."""
+    result = await db.execute(REVOKE_USER, {"id": user_id, "channel": CHANNEL})
+    return [row.family_id for row in result]
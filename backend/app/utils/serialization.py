@@ -0,0 +1,60 @@
+"""
+Fast JSON responses for list and bulk endpoints.
+
+When an endpoint returns rows, FastAPI validates each one against the
+``response_model`` (building a pydantic model per row and per nested answer
+list), dumps the models back to dicts and encodes them with the stdlib json
+module. For rows read straight from our own tables the validation proves
+nothing, and for checklist answers, with their ``List[List[bool]]`` grids,
+it dominates the cost of the request.
+
+Hot endpoints instead copy the response schema's fields off each row
+(``Row`` tuples, ORM objects and StoredAnswer all work) into plain dicts and
+return them in an ``ORJSONResponse``, which FastAPI sends as is. The
+``response_model`` stays on the route for the OpenAPI schema, and
+tests/test_serialization.py checks that both paths produce the same JSON.
+"""
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Type
+
+import orjson
+from asyncpg.pgproto.pgproto import UUID as AsyncpgUUID
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+# asyncpg returns its own UUID subclass, which orjson does not accept. Its
+# C-level __str__ is the whole fallback, called without a Python frame for
+# each of the two UUIDs per answer row; any other type raises TypeError
+_default = AsyncpgUUID.__str__
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson, formatted like pydantic's JSON mode."""
+
+    def render(self, content: Any) -> bytes:
+        # pydantic writes UTC datetimes with a "Z" suffix
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+@lru_cache
+def schema_fields(model: Type[BaseModel], exclude: Tuple[str, ...] = ()) -> Tuple[str, ...]:
+    """Field names of a response schema, in the order pydantic writes them."""
+    return tuple(name for name in model.model_fields if name not in exclude)
+
+
+def row_to_dict(row: Any, fields: Sequence[str]) -> dict:
+    return {name: getattr(row, name) for name in fields}
+
+
+def rows_to_dicts(rows: Iterable[Any], model: Type[BaseModel]) -> List[dict]:
+    """Rows shaped like ``model``, without validating them."""
+    fields = schema_fields(model)
+    values = attrgetter(*fields)
+    return [dict(zip(fields, values(row))) for row in rows]
+
+
+def rows_response(rows: Iterable[Any], model: Type[BaseModel], status_code: int = 200, headers: Optional[dict] = None) -> ORJSONResponse:
+    """A JSON list of ``model`` built directly from rows."""
+    return ORJSONResponse(rows_to_dicts(rows, model), status_code=status_code, headers=headers)
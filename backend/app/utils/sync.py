@@ -0,0 +1,265 @@
+"""
+Delta sync for offline clients.
+
+Reviews, checklists and answers carry ``sync_version``: a trigger sets it to
+the id of the transaction that last wrote the row. A client's watermark is
+the ``xmin`` of a snapshot taken before its last read, i.e. the oldest
+transaction that was still running then. Every transaction below it had
+committed and was seen, so the next pull asks for rows with
+``sync_version >= watermark``. Unlike a sequence or a timestamp, this cannot
+miss a row that committed late; at worst a few rows are sent twice, which
+clients apply idempotently.
+
+Deleted rows are reported from ``sync_tombstones`` (see SyncTombstone).
+
+Offline edits come back as a journal (``apply_operations``). Each answer
+upsert names the ``sync_version`` it was based on and is applied only if the
+server still has that version, so concurrent edits of one question are
+reported as conflicts instead of silently overwritten. In "document" answer
+storage every question shares the document's version, so any change to the
+checklist since the client's pull conflicts.
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import exists, func, insert, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.checklist import Checklist
+from app.models.checklist_answer import ChecklistAnswer
+from app.models.checklist_answer_set import ChecklistAnswerSet
+from app.models.review import Review
+from app.models.review_assignment import ReviewAssignment
+from app.models.sync_tombstone import SyncTombstone
+from app.models.user import User
+from app.schemas.sync import (
+    CompleteChecklistOperation,
+    CreateChecklistOperation,
+    SyncOperationResult,
+    UpsertAnswerOperation,
+)
+from app.utils.answer_codec import try_encode
+from app.utils.answer_storage import from_document, patch_document
+
+
+async def current_watermark(db: AsyncSession) -> int:
+    """Watermark to hand out with the rows read after this call."""
+    result = await db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))
+    return result.scalar_one()
+
+
+async def project_changes(db: AsyncSession, project_id: uuid.UUID, since: int) -> Dict[str, List]:
+    """
+    Reviews, checklists, answers and tombstones of a project written by
+    transactions at or after ``since`` (0 for everything).
+    """
+    reviews = (await db.execute(
+        select(Review).where(Review.project_id == project_id, Review.sync_version >= since)
+    )).scalars().all()
+
+    checklists = (await db.execute(
+        select(Checklist)
+        .join(Review, Review.id == Checklist.review_id)
+        .where(Review.project_id == project_id, Checklist.sync_version >= since)
+    )).scalars().all()
+
+    in_project = (
+        select(Checklist.id)
+        .join(Review, Review.id == Checklist.review_id)
+        .where(Review.project_id == project_id)
+    )
+    answers = []
+    if settings.ANSWER_STORAGE == "document":
+        result = await db.execute(
+            select(ChecklistAnswerSet.checklist_id, ChecklistAnswerSet.answers, ChecklistAnswerSet.sync_version)
+            .where(ChecklistAnswerSet.checklist_id.in_(in_project), ChecklistAnswerSet.sync_version >= since)
+        )
+        for checklist_id, document, version in result.all():
+            answers.extend(from_document(checklist_id, document, sync_version=version))
+
+    query = select(ChecklistAnswer).where(
+        ChecklistAnswer.checklist_id.in_(in_project),
+        ChecklistAnswer.sync_version >= since,
+    )
+    if settings.ANSWER_STORAGE == "document":
+        # Rows of checklists that have a document are superseded by it
+        query = query.where(~exists().where(ChecklistAnswerSet.checklist_id == ChecklistAnswer.checklist_id))
+    answers.extend((await db.execute(query)).scalars().all())
+
+    deleted = []
+    if since > 0:
+        deleted = (await db.execute(
+            select(SyncTombstone)
+            .where(SyncTombstone.project_id == project_id, SyncTombstone.sync_version >= since)
+            .order_by(SyncTombstone.id)
+        )).scalars().all()
+
+    return {"reviews": reviews, "checklists": checklists, "answers": answers, "deleted": deleted}
+
+
+class OperationRejected(Exception):
+    """An operation that cannot be applied at all (missing rows, permissions)."""
+
+
+class _Batch:
+    """State of one journal being applied in the caller's transaction."""
+
+    def __init__(self, db: AsyncSession, user: User):
+        self.db = db
+        self.user = user
+        # checklist id -> {question key: version} as it was before this batch
+        # wrote to the checklist, so several edits of one question in a
+        # journal all compare against the version the client started from
+        self.base_versions: Dict[uuid.UUID, Dict[str, int]] = {}
+
+    async def lock_checklist(self, checklist_id: uuid.UUID, action: str):
+        """Lock a checklist the current user reviews; serializes writes to its answers."""
+        result = await self.db.execute(
+            select(Checklist.reviewer_id, Checklist.completed_at, Checklist.sync_version)
+            .where(Checklist.id == checklist_id)
+            .with_for_update()
+        )
+        checklist = result.one_or_none()
+        if checklist is None:
+            raise OperationRejected("Checklist not found")
+        if checklist.reviewer_id != self.user.id:
+            raise OperationRejected(f"Only the assigned reviewer can {action}")
+        return checklist
+
+    async def load_answers(self, checklist_id: uuid.UUID) -> Tuple[Dict[str, object], Dict[str, int]]:
+        """Current answers of a checklist by question key, and their versions."""
+        if settings.ANSWER_STORAGE == "document":
+            result = await self.db.execute(
+                select(ChecklistAnswerSet.answers, ChecklistAnswerSet.sync_version)
+                .where(ChecklistAnswerSet.checklist_id == checklist_id)
+            )
+            document = result.one_or_none()
+            if document is not None:
+                answers = from_document(checklist_id, document.answers, sync_version=document.sync_version)
+                return {a.question_key: a for a in answers}, {a.question_key: a.sync_version for a in answers}
+
+        result = await self.db.execute(
+            select(ChecklistAnswer)
+            .where(ChecklistAnswer.checklist_id == checklist_id)
+            .execution_options(populate_existing=True)
+        )
+        answers = result.scalars().all()
+        return {a.question_key: a for a in answers}, {a.question_key: a.sync_version for a in answers}
+
+    async def create_checklist(self, op: CreateChecklistOperation) -> SyncOperationResult:
+        result = await self.db.execute(
+            select(Checklist.review_id, Checklist.reviewer_id, Checklist.sync_version).where(Checklist.id == op.checklist_id)
+        )
+        existing = result.one_or_none()
+        if existing is not None:
+            # A journal replayed after a lost response
+            if existing.review_id == op.review_id and existing.reviewer_id == self.user.id:
+                return SyncOperationResult(op_id=op.op_id, status="applied", sync_version=existing.sync_version)
+            raise OperationRejected("Checklist id is already in use")
+
+        result = await self.db.execute(
+            select(Review.id, ReviewAssignment.user_id)
+            .outerjoin(
+                ReviewAssignment,
+                (ReviewAssignment.review_id == Review.id) & (ReviewAssignment.user_id == self.user.id)
+            )
+            .where(Review.id == op.review_id)
+        )
+        review = result.one_or_none()
+        if review is None:
+            raise OperationRejected("Review not found")
+        # Same rule as POST /checklists: the creator becomes an assigned reviewer
+        if review.user_id is None:
+            await self.db.execute(insert(ReviewAssignment).values(review_id=op.review_id, user_id=self.user.id))
+        await self.db.execute(
+            insert(Checklist).values(id=op.checklist_id, review_id=op.review_id, reviewer_id=self.user.id, type="amstar")
+        )
+        return SyncOperationResult(op_id=op.op_id, status="applied")
+
+    async def upsert_answer(self, op: UpsertAnswerOperation) -> SyncOperationResult:
+        await self.lock_checklist(op.checklist_id, "create or update answers")
+        current, versions = await self.load_answers(op.checklist_id)
+        base_versions = self.base_versions.setdefault(op.checklist_id, versions)
+
+        if op.base_version != base_versions.get(op.question_key):
+            answer = current.get(op.question_key)
+            if answer is not None and answer.answers == op.answers and answer.critical == op.critical:
+                # Already holds this edit, e.g. a journal replayed after a lost response
+                return SyncOperationResult(op_id=op.op_id, status="applied", sync_version=answer.sync_version)
+            return SyncOperationResult(
+                op_id=op.op_id,
+                status="conflict",
+                detail="The answer changed on the server since base_version",
+                current=answer,
+            )
+
+        if settings.ANSWER_STORAGE == "document":
+            await patch_document(self.db, op.checklist_id, {op.question_key: (op.answers, op.critical)})
+        elif op.question_key in current:
+            await self.db.execute(
+                update(ChecklistAnswer)
+                .where(ChecklistAnswer.id == current[op.question_key].id)
+                .values(answers=op.answers, answers_mask=try_encode(op.question_key, op.answers), critical=op.critical)
+            )
+        else:
+            await self.db.execute(
+                insert(ChecklistAnswer).values(
+                    id=uuid.uuid4(),
+                    checklist_id=op.checklist_id,
+                    question_key=op.question_key,
+                    answers=op.answers,
+                    answers_mask=try_encode(op.question_key, op.answers),
+                    critical=op.critical,
+                )
+            )
+        # Touch the parent checklist to update its updated_at
+        await self.db.execute(update(Checklist).where(Checklist.id == op.checklist_id).values(updated_at=func.now()))
+        return SyncOperationResult(op_id=op.op_id, status="applied")
+
+    async def complete_checklist(self, op: CompleteChecklistOperation) -> SyncOperationResult:
+        checklist = await self.lock_checklist(op.checklist_id, "mark a checklist as completed")
+        if checklist.completed_at is not None:
+            return SyncOperationResult(op_id=op.op_id, status="applied", sync_version=checklist.sync_version)
+
+        now = datetime.now(timezone.utc)
+        completed_at = op.client_timestamp or now
+        if completed_at.tzinfo is None:
+            completed_at = completed_at.replace(tzinfo=timezone.utc)
+        await self.db.execute(
+            update(Checklist).where(Checklist.id == op.checklist_id).values(completed_at=min(completed_at, now))
+        )
+        return SyncOperationResult(op_id=op.op_id, status="applied")
+
+
+async def apply_operations(db: AsyncSession, user: User, operations: List) -> List[SyncOperationResult]:
+    """
+    Apply a journal in order, each operation in its own savepoint so a
+    rejected one leaves the others in place. The caller commits.
+    """
+    batch = _Batch(db, user)
+    handlers = {
+        "create_checklist": batch.create_checklist,
+        "upsert_answer": batch.upsert_answer,
+        "complete_checklist": batch.complete_checklist,
+    }
+    results = []
+    for op in operations:
+        try:
+            async with db.begin_nested():
+                result = await handlers[op.type](op)
+        except OperationRejected as e:
+            result = SyncOperationResult(op_id=op.op_id, status="rejected", detail=str(e))
+        except IntegrityError:
+            result = SyncOperationResult(op_id=op.op_id, status="rejected", detail="Conflicts with existing data")
+        results.append(result)
+
+    # Every row written here gets this transaction's id as its version
+    if any(result.status == "applied" and result.sync_version is None for result in results):
+        version = (await db.execute(text("SELECT pg_current_xact_id_if_assigned()::text::bigint"))).scalar_one()
+        for result in results:
+            if result.status == "applied" and result.sync_version is None:
+                result.sync_version = version
+    return results
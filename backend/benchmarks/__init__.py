@@ -0,0 +1,4 @@
+"""
+Micro and end-to-end benchmarks. Run from the backend directory, e.g.
+``python -m benchmarks.email_build``.
+"""
@@ -0,0 +1,124 @@
+"""
+Compare the two checklist answer layouts (see app.utils.answer_storage).
+
+Loads the same synthetic answers (benchmarks.datagen) into temporary copies
+of ``checklist_answers`` (one row per question) and ``checklist_answer_sets``
+(one document per checklist), created with ``LIKE ... INCLUDING ALL`` so
+they carry the real indexes, then reports table and index sizes plus the
+latency of loading a whole checklist and of saving one question.
+
+Nothing is written to the real tables.
+
+Usage:
+    python -m benchmarks.answer_storage --projects 500 --samples 2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List
+
+from benchmarks.api_load import percentile
+from benchmarks.datagen import Dataset, Scale, dsn
+
+ROWS_COLUMNS = ("id", "checklist_id", "question_key", "answers", "answers_mask", "critical", "updated_at")
+
+QUERIES = {
+    "rows": {
+        "load": "SELECT question_key, answers, critical, updated_at FROM bench_rows WHERE checklist_id = $1",
+        "save": "UPDATE bench_rows SET answers = $3::jsonb, updated_at = now() WHERE checklist_id = $1 AND question_key = $2",
+    },
+    "document": {
+        "load": "SELECT answers FROM bench_documents WHERE checklist_id = $1",
+        "save": (
+            "UPDATE bench_documents SET answers = answers || jsonb_build_object($2::text, $3::jsonb), "
+            "updated_at = now() WHERE checklist_id = $1"
+        ),
+    },
+}
+
+
+def documents(dataset: Dataset):
+    """One (checklist_id, document, updated_at) record per checklist."""
+    for checklist, answers in dataset.checklists_and_answers():
+        checklist_id, updated_at = checklist[0], checklist[-1]
+        document = {
+            key: {"answers": json.loads(grid), "critical": critical, "updated_at": updated.isoformat()}
+            for _, _, key, grid, _, critical, updated in answers
+        }
+        yield checklist_id, json.dumps(document, separators=(",", ":")), updated_at
+
+
+async def sizes(conn, table: str) -> Dict[str, int]:
+    row = await conn.fetchrow(
+        "SELECT pg_table_size($1::regclass) AS table_bytes, pg_indexes_size($1::regclass) AS index_bytes",
+        table,
+    )
+    return dict(row)
+
+
+async def time_queries(conn, query: str, argument_sets: List[tuple]) -> Dict[str, float]:
+    statement = await conn.prepare(query)
+    samples = []
+    for args in argument_sets:
+        start = time.perf_counter()
+        await statement.fetch(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+    }
+
+
+async def run(scale: Scale, samples: int) -> dict:
+    import asyncpg
+
+    dataset = Dataset(scale)
+    conn = await asyncpg.connect(dsn())
+    try:
+        await conn.execute("CREATE TEMP TABLE bench_rows (LIKE checklist_answers INCLUDING ALL)")
+        await conn.execute("CREATE TEMP TABLE bench_documents (LIKE checklist_answer_sets INCLUDING ALL)")
+
+        await conn.copy_records_to_table(
+            "bench_rows",
+            records=(row for _, rows in dataset.checklists_and_answers() for row in rows),
+            columns=ROWS_COLUMNS,
+        )
+        await conn.copy_records_to_table(
+            "bench_documents", records=documents(dataset), columns=("checklist_id", "answers", "updated_at"),
+        )
+        await conn.execute("ANALYZE bench_rows")
+        await conn.execute("ANALYZE bench_documents")
+
+        checklist_ids = [row["checklist_id"] for row in await conn.fetch("SELECT checklist_id FROM bench_documents")]
+        rng = random.Random(scale.seed)
+        picks = [rng.choice(checklist_ids) for _ in range(samples)]
+        patch = json.dumps([[True, False, False, False], [True], [False, True]])
+
+        report = {"checklists": len(checklist_ids), "samples": samples}
+        for layout, table in (("rows", "bench_rows"), ("document", "bench_documents")):
+            report[layout] = {
+                **await sizes(conn, table),
+                "load": await time_queries(conn, QUERIES[layout]["load"], [(pick,) for pick in picks]),
+                "save": await time_queries(conn, QUERIES[layout]["save"], [(pick, "q1", patch) for pick in picks]),
+            }
+    finally:
+        await conn.close()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--samples", type=int, default=2000, help="Checklists loaded and saved per layout")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    scale = Scale(users=max(50, args.projects // 2), projects=args.projects, seed=args.seed)
+    print(json.dumps(asyncio.run(run(scale, args.samples)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+End-to-end API benchmark with latency percentiles.
+
+Concurrent virtual users each sign in, create a project and review, then
+repeatedly create a checklist, save every AMSTAR answer and complete it.
+By default the real ASGI app is driven in-process through
+httpx.ASGITransport, inside the app's lifespan so the worker has warmed up,
+listens for notifications and has loaded its revocation index like a served
+one; pass --url to benchmark a running server instead. Either way the clock
+starts once /healthz/ready reports ready.
+
+Virtual users sign in as the accounts created by ``python -m benchmarks.datagen``
+(loadtest0000000@example.com, ... with password Test111!).
+
+Results (throughput and p50/p95/p99 per endpoint) are printed as JSON and can
+be saved as a baseline; later runs compared against it exit non-zero when an
+endpoint regresses beyond the tolerance. Percentiles cover successful
+responses only; failed ones are counted as errors. A virtual user whose
+sign-in, project, review or checklist could not be created stops, and is
+counted under ``setup_failures`` by step; any such failure fails the run.
+
+Usage:
+    python -m benchmarks.api_load --users 20 --iterations 5 --output results.json
+    python -m benchmarks.api_load --baseline baseline.json --tolerance 0.25
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.utils.amstar import AMSTAR_QUESTIONS, empty_answers
+
+API = "/api/v1"
+PASSWORD = "Test111!"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of unsorted samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class SetupFailed(Exception):
+    """A request a virtual user depends on did not succeed."""
+
+    def __init__(self, step: str, response: httpx.Response):
+        super().__init__(f"{step} failed with {response.status_code}: {response.text[:200]}")
+        self.step = step
+
+
+class Recorder:
+    """Collects per-endpoint latencies of successful calls, and failures."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.setup_failures: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if response.is_success:
+            self.latencies[name].append(elapsed_ms)
+        else:
+            # Fast rejections would otherwise flatter the percentiles
+            self.errors[name] += 1
+        return response
+
+    async def setup(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> dict:
+        """A call the virtual user cannot continue without; its JSON body, or SetupFailed."""
+        response = await self.call(client, name, method, url, **kwargs)
+        if not response.is_success:
+            raise SetupFailed(name, response)
+        return response.json()
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            samples = self.latencies.get(name, [])
+            requests = len(samples) + self.errors.get(name, 0)
+            endpoints[name] = {
+                "requests": requests,
+                "errors": self.errors.get(name, 0),
+                "throughput_rps": round(requests / elapsed, 2),
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "p99_ms": round(percentile(samples, 99), 2),
+            }
+        total = sum(endpoint["requests"] for endpoint in endpoints.values())
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "setup_failures": dict(self.setup_failures),
+            "endpoints": endpoints,
+        }
+
+
+async def virtual_user(client: httpx.AsyncClient, recorder: Recorder, index: int, iterations: int) -> None:
+    try:
+        await run_virtual_user(client, recorder, index, iterations)
+    except SetupFailed as e:
+        recorder.setup_failures[e.step] += 1
+        print(f"Virtual user {index} stopped: {e}", file=sys.stderr)
+
+
+async def run_virtual_user(client: httpx.AsyncClient, recorder: Recorder, index: int, iterations: int) -> None:
+    body = await recorder.setup(
+        client, "POST /auth/signin", "POST", f"{API}/auth/signin",
+        json={"email": f"loadtest{index:07d}@example.com", "password": PASSWORD},
+    )
+    headers = {"Authorization": f"Bearer {body['accessToken']}"}
+
+    project = await recorder.setup(
+        client, "POST /projects", "POST", f"{API}/projects", headers=headers,
+        json={"name": f"Benchmark project {index}"},
+    )
+    try:
+        review = await recorder.setup(
+            client, "POST /reviews", "POST", f"{API}/reviews", headers=headers,
+            json={"name": f"Benchmark review {index}", "project_id": project["id"]},
+        )
+
+        for _ in range(iterations):
+            checklist = await recorder.setup(
+                client, "POST /checklists", "POST", f"{API}/checklists", headers=headers,
+                json={"review_id": review["id"], "type": "amstar"},
+            )
+            for key, shape in AMSTAR_QUESTIONS.items():
+                answers = empty_answers(key)
+                answers[-1][0] = True
+                await recorder.call(
+                    client, "POST /checklists/{id}/answers", "POST", f"{API}/checklists/{checklist['id']}/answers",
+                    headers=headers, json={"question_key": key, "answers": answers, "critical": shape.critical},
+                )
+            await recorder.call(
+                client, "PUT /checklists/{id}/complete", "PUT", f"{API}/checklists/{checklist['id']}/complete",
+                headers=headers,
+            )
+    finally:
+        await recorder.call(client, "DELETE /projects/{id}", "DELETE", f"{API}/projects/{project['id']}", headers=headers)
+
+
+READY_TIMEOUT = 60.0
+
+
+async def make_client(stack: AsyncExitStack, url: Optional[str]) -> httpx.AsyncClient:
+    if url:
+        return await stack.enter_async_context(httpx.AsyncClient(base_url=url, timeout=60.0))
+    from app.main import app
+
+    # ASGITransport does not run the lifespan, which starts warm-up, the
+    # LISTEN connection and the revocation index
+    await stack.enter_async_context(app.router.lifespan_context(app))
+    transport = httpx.ASGITransport(app=app)
+    return await stack.enter_async_context(
+        httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60.0)
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient) -> None:
+    deadline = time.monotonic() + READY_TIMEOUT
+    while (await client.get("/healthz/ready")).status_code != 200:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Server not ready after {READY_TIMEOUT:.0f}s")
+        await asyncio.sleep(0.2)
+
+
+async def run(users: int, iterations: int, url: Optional[str]) -> dict:
+    recorder = Recorder()
+    async with AsyncExitStack() as stack:
+        client = await make_client(stack, url)
+        await wait_ready(client)
+        start = time.perf_counter()
+        await asyncio.gather(*(virtual_user(client, recorder, i, iterations) for i in range(users)))
+        elapsed = time.perf_counter() - start
+    report = recorder.report(elapsed)
+    report["config"] = {"users": users, "iterations": iterations, "target": url or "asgi"}
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Return human readable regressions of report versus baseline."""
+    regressions = []
+    for name, base in baseline.get("endpoints", {}).items():
+        current = report["endpoints"].get(name)
+        if current is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if base[metric] and current[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name} {metric}: {base[metric]} -> {current[metric]}")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{name} errors: {base['errors']} -> {current['errors']}")
+    for step, failures in report.get("setup_failures", {}).items():
+        regressions.append(f"{step} setup failures: {failures}")
+    if baseline.get("throughput_rps") and report["throughput_rps"] < baseline["throughput_rps"] * (1 - tolerance):
+        regressions.append(f"throughput_rps: {baseline['throughput_rps']} -> {report['throughput_rps']}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=3, help="Checklists completed per virtual user")
+    parser.add_argument("--url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a previously saved report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.users, args.iterations, args.url))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+    if report["setup_failures"] and not args.baseline:
+        print(f"Virtual users failed to set up: {report['setup_failures']}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print("No regressions against baseline.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Cold import time of app.main.
+
+Each run imports the app in a fresh interpreter, timed from inside the child
+so interpreter startup is left out. The framework stack the app cannot avoid
+(FastAPI, SQLAlchemy, asyncpg, pydantic-settings) is timed the same way; the
+difference is what the app itself adds, which is compared with the budget as
+a fraction of the framework time so it holds on slower machines too.
+
+A ``python -X importtime`` profile lists the slowest app modules and any
+dependency that should only load on first use (DEFERRED) but was imported
+eagerly. The script exits non-zero when either check fails.
+
+Usage:
+    python -m benchmarks.cold_start [--runs 7]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Loaded through app.utils.lazy or inside the handlers that use them
+DEFERRED = ("httpx", "h2", "httpcore", "aiosmtplib", "scalar_fastapi")
+
+FRAMEWORK = ("fastapi", "sqlalchemy.ext.asyncio", "asyncpg", "pydantic_settings", "orjson")
+
+# What app.main may add on top of FRAMEWORK; about 0.5 at the time of writing
+APP_BUDGET_RATIO = 1.0
+
+
+def python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=BACKEND, env=os.environ.copy(), capture_output=True, text=True, check=True)
+
+
+def time_import(modules: Tuple[str, ...]) -> float:
+    """Milliseconds to import ``modules`` in a fresh interpreter."""
+    code = f"import time; t = time.perf_counter(); import {', '.join(modules)}; print(time.perf_counter() - t)"
+    return float(python("-c", code).stdout) * 1000
+
+
+def import_profile(module: str = "app.main") -> Dict[str, Tuple[int, int]]:
+    """Module -> (self, cumulative) microseconds from ``-X importtime``."""
+    profile = {}
+    for line in python("-X", "importtime", "-c", f"import {module}").stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def eager_deferred(profile: Dict[str, Tuple[int, int]]) -> List[str]:
+    return sorted(name for name in profile if name.split(".")[0] in DEFERRED)
+
+
+def run(runs: int) -> dict:
+    # Interleaved, best of each, so a noisy moment does not skew one side only
+    app_ms = framework_ms = float("inf")
+    for _ in range(runs):
+        app_ms = min(app_ms, time_import(("app.main",)))
+        framework_ms = min(framework_ms, time_import(FRAMEWORK))
+    profile = import_profile()
+    app_modules = sorted(
+        ((name, times[1]) for name, times in profile.items() if name.startswith("app.")),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return {
+        "app_main_ms": round(app_ms, 1),
+        "framework_ms": round(framework_ms, 1),
+        "app_overhead_ms": round(app_ms - framework_ms, 1),
+        "app_overhead_ratio": round((app_ms - framework_ms) / framework_ms, 2),
+        "slowest_app_modules_ms": {name: round(us / 1000, 1) for name, us in app_modules[:10]},
+        "eager_deferred": eager_deferred(profile),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    report = run(args.runs)
+    print(json.dumps(report, indent=2))
+    if report["eager_deferred"]:
+        sys.exit(f"Imported eagerly: {', '.join(report['eager_deferred'])}")
+    if report["app_overhead_ratio"] > APP_BUDGET_RATIO:
+        sys.exit(f"app.main adds {report['app_overhead_ratio']}x the framework import time (budget {APP_BUDGET_RATIO}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Bytes saved vs. CPU spent compressing typical response bodies.
+
+Payloads are built from synthetic answers (benchmarks.serialization): the
+answers list of a bulk read, and the same rows as an Electric shape log
+(one insert operation per row). Each is compressed with gzip at several
+levels and, if the ``brotli`` package is installed, brotli at several
+qualities, both in one shot and streamed in 4 KiB chunks with a flush after
+each (as the middleware does for streaming responses).
+
+Usage:
+    python -m benchmarks.compression [--answers 1000] [--repeat 20]
+"""
+import argparse
+import json
+import time
+from typing import Callable, Dict, List
+
+from app.middleware.compression import Compressor, brotli
+from app.schemas.checklist import ChecklistAnswerResponse
+from app.utils.serialization import ORJSONResponse, rows_to_dicts
+from benchmarks.serialization import make_answers
+
+STREAM_CHUNK = 4096
+
+
+def payloads(count: int) -> Dict[str, bytes]:
+    rows = rows_to_dicts(make_answers(count), ChecklistAnswerResponse)
+    shape_log = [
+        {"key": f'"public"."checklist_answers"/"{row["id"]}"', "value": row, "headers": {"operation": "insert"}}
+        for row in rows
+    ]
+    return {
+        "answers": ORJSONResponse(rows).body,
+        "shape_log": ORJSONResponse(shape_log).body,
+    }
+
+
+def settings_to_try() -> List[tuple]:
+    options = [("gzip", level) for level in (1, 6, 9)]
+    if brotli is not None:
+        options += [("br", quality) for quality in (1, 4, 6, 11)]
+    return options
+
+
+def one_shot(encoding: str, level: int) -> Callable[[bytes], int]:
+    def run(body: bytes) -> int:
+        return len(Compressor(encoding, level, level).finish(body))
+    return run
+
+
+def streamed(encoding: str, level: int) -> Callable[[bytes], int]:
+    def run(body: bytes) -> int:
+        compressor = Compressor(encoding, level, level)
+        size = 0
+        for offset in range(0, len(body), STREAM_CHUNK):
+            size += len(compressor.compress(body[offset:offset + STREAM_CHUNK]))
+        return size + len(compressor.finish())
+    return run
+
+
+def measure(compress: Callable[[bytes], int], body: bytes, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = compress(body)
+        best = min(best, time.perf_counter() - start)
+    return {
+        "bytes": size,
+        "ratio": round(len(body) / size, 1),
+        "ms": round(best * 1000, 3),
+        "mb_per_s": round(len(body) / best / 1e6, 1),
+    }
+
+
+def run(count: int, repeat: int) -> dict:
+    report = {}
+    for name, body in payloads(count).items():
+        results = {"raw_bytes": len(body)}
+        for encoding, level in settings_to_try():
+            results[f"{encoding}-{level}"] = measure(one_shot(encoding, level), body, repeat)
+            results[f"{encoding}-{level}-streamed"] = measure(streamed(encoding, level), body, repeat)
+        report[name] = results
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--answers", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.answers, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
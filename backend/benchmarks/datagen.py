@@ -0,0 +1,243 @@
+"""
+Synthetic large-dataset generator for load and scaling tests.
+
+Creates users, projects, members, reviews, assignments, checklists and
+answered AMSTAR checklists, and bulk loads them with asyncpg COPY in one
+transaction. Output is fully determined by --seed, so benchmark databases
+are comparable across runs. All users share the demo password (Test111!).
+
+Usage:
+    python -m benchmarks.datagen --users 10000 --projects 2000 --seed 42
+    python -m benchmarks.datagen --users 1000 --dry-run
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from app.utils.amstar import AMSTAR_QUESTIONS, QUESTION_KEYS
+from app.utils.answer_codec import encode_answers
+from app.utils.seed import DEMO_PASSWORD_HASH
+from tests.helpers.generators import fake, generate_project_name, generate_review_name
+
+# Fixed epoch so timestamps do not depend on when the generator runs
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+SPAN_SECONDS = 365 * 24 * 3600
+
+# Probability of each rating (in QuestionShape.ratings order, trimmed to length)
+RATING_WEIGHTS = {
+    2: (0.65, 0.35),
+    3: (0.5, 0.2, 0.3),
+    4: (0.45, 0.2, 0.25, 0.1),
+}
+# Yes/No/No MA questions weight "No MA" lower than a Partial Yes would be
+NO_MA_WEIGHTS = (0.6, 0.25, 0.15)
+
+# Chance that a supporting checkbox is ticked, given the final rating
+TICK_PROBABILITY = {"Yes": 0.9, "Partial Yes": 0.6, "No": 0.2, "No MA": 0.05}
+
+COLUMNS = {
+    "users": ("id", "email", "name", "hashed_password", "created_at", "updated_at", "email_verified_at"),
+    "projects": ("id", "owner_id", "name", "created_at", "updated_at"),
+    "project_members": ("project_id", "user_id", "role"),
+    "reviews": ("id", "project_id", "name", "created_at"),
+    "review_assignments": ("review_id", "user_id"),
+    "checklists": ("id", "review_id", "reviewer_id", "type", "completed_at", "updated_at"),
+    "checklist_answers": ("id", "checklist_id", "question_key", "answers", "answers_mask", "critical", "updated_at"),
+}
+
+
+@dataclass
+class Scale:
+    users: int = 1000
+    projects: int = 200
+    members_per_project: int = 5
+    reviews_per_project: int = 10
+    reviewers_per_review: int = 2
+    completed_ratio: float = 0.6
+    seed: int = 42
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _timestamp(rng: random.Random) -> datetime:
+    return EPOCH + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+
+
+def random_answers(rng: random.Random, question_key: str) -> List[List[bool]]:
+    """Pick a rating, then tick supporting checkboxes consistently with it."""
+    shape = AMSTAR_QUESTIONS[question_key]
+    size = shape.columns[-1]
+    weights = NO_MA_WEIGHTS if shape.ratings[-1] == "No MA" and size == 3 else RATING_WEIGHTS[size]
+    choice = rng.choices(range(size), weights=weights)[0]
+    tick = TICK_PROBABILITY[shape.ratings[choice]]
+    columns = [[rng.random() < tick for _ in range(n)] for n in shape.columns[:-1]]
+    columns.append([i == choice for i in range(size)])
+    return columns
+
+
+class Dataset:
+    """
+    Deterministic row source. Parent rows are held in memory; checklists and
+    answers are generated on demand so very large runs stay within memory.
+    """
+
+    def __init__(self, scale: Scale):
+        self.scale = scale
+        rng = random.Random(scale.seed)
+        fake.seed_instance(scale.seed)
+
+        self.users: List[tuple] = []
+        for i in range(scale.users):
+            created = _timestamp(rng)
+            self.users.append((
+                _uuid(rng), f"loadtest{i:07d}@example.com", fake.name(),
+                DEMO_PASSWORD_HASH, created, created, created,
+            ))
+        user_ids = [row[0] for row in self.users]
+
+        self.projects: List[tuple] = []
+        self.project_members: List[tuple] = []
+        self.reviews: List[tuple] = []
+        self.review_assignments: List[tuple] = []
+        for _ in range(scale.projects):
+            project_id = _uuid(rng)
+            created = _timestamp(rng)
+            team = rng.sample(user_ids, min(len(user_ids), scale.members_per_project))
+            self.projects.append((project_id, team[0], generate_project_name(), created, created))
+            self.project_members.append((project_id, team[0], "owner"))
+            self.project_members.extend((project_id, user_id, "member") for user_id in team[1:])
+
+            for _ in range(scale.reviews_per_project):
+                review_id = _uuid(rng)
+                self.reviews.append((review_id, project_id, generate_review_name(), created))
+                for user_id in rng.sample(team, min(len(team), scale.reviewers_per_review)):
+                    self.review_assignments.append((review_id, user_id))
+
+    def checklists_and_answers(self) -> Iterator[Tuple[tuple, List[tuple]]]:
+        """Yield each checklist row with its answer rows, one per assignment."""
+        rng = random.Random(self.scale.seed + 1)
+        for review_id, user_id in self.review_assignments:
+            checklist_id = _uuid(rng)
+            updated = _timestamp(rng)
+            completed = rng.random() < self.scale.completed_ratio
+            # In-progress checklists have answered a prefix of the questions
+            answered = len(QUESTION_KEYS) if completed else rng.randrange(len(QUESTION_KEYS))
+            checklist = (checklist_id, review_id, user_id, "amstar", updated if completed else None, updated)
+            answers = []
+            for key in QUESTION_KEYS[:answered]:
+                answer_id = _uuid(rng)
+                grid = random_answers(rng, key)
+                answers.append((
+                    answer_id, checklist_id, key,
+                    json.dumps(grid, separators=(",", ":")), encode_answers(key, grid),
+                    AMSTAR_QUESTIONS[key].critical, updated,
+                ))
+            yield checklist, answers
+
+
+def table_rows(dataset: Dataset) -> Dict[str, Iterable[tuple]]:
+    """
+    Row sources keyed by table, in foreign-key order. Checklists and answers
+    are two independent (identical) passes over the stream, so they never
+    need to be held in memory together.
+    """
+    return {
+        "users": dataset.users,
+        "projects": dataset.projects,
+        "project_members": dataset.project_members,
+        "reviews": dataset.reviews,
+        "review_assignments": dataset.review_assignments,
+        "checklists": (checklist for checklist, _ in dataset.checklists_and_answers()),
+        "checklist_answers": (row for _, rows in dataset.checklists_and_answers() for row in rows),
+    }
+
+
+class _Counter:
+    """Wrap an iterable and count the rows it yields."""
+
+    def __init__(self, rows: Iterable[tuple]):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self) -> Iterator[tuple]:
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def dsn() -> str:
+    from app.core.config import settings
+    # asyncpg takes a plain libpq URL, not the SQLAlchemy dialect form
+    return settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def load(tables: Dict[str, Iterable[tuple]]) -> int:
+    """COPY every table in one transaction; returns the total row count."""
+    import asyncpg
+
+    total = 0
+    conn = await asyncpg.connect(dsn())
+    try:
+        async with conn.transaction():
+            for table, rows in tables.items():
+                counter = _Counter(rows)
+                start = time.perf_counter()
+                await conn.copy_records_to_table(table, records=counter, columns=COLUMNS[table])
+                elapsed = time.perf_counter() - start
+                total += counter.count
+                print(f"{table:>20}: {counter.count:>9} rows  {counter.count / max(elapsed, 1e-9):>10.0f} rows/s")
+    finally:
+        await conn.close()
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = Scale()
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--projects", type=int, default=defaults.projects)
+    parser.add_argument("--members-per-project", type=int, default=defaults.members_per_project)
+    parser.add_argument("--reviews-per-project", type=int, default=defaults.reviews_per_project)
+    parser.add_argument("--reviewers-per-review", type=int, default=defaults.reviewers_per_review)
+    parser.add_argument("--completed-ratio", type=float, default=defaults.completed_ratio)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--dry-run", action="store_true", help="Generate rows and print counts without loading")
+    args = parser.parse_args()
+
+    scale = Scale(
+        users=args.users,
+        projects=args.projects,
+        members_per_project=args.members_per_project,
+        reviews_per_project=args.reviews_per_project,
+        reviewers_per_review=args.reviewers_per_review,
+        completed_ratio=args.completed_ratio,
+        seed=args.seed,
+    )
+
+    start = time.perf_counter()
+    tables = table_rows(Dataset(scale))
+
+    if args.dry_run:
+        total = 0
+        for table, rows in tables.items():
+            count = sum(1 for _ in rows)
+            total += count
+            print(f"{table:>20}: {count:>9} rows")
+        print(f"generated {total} rows in {time.perf_counter() - start:.2f}s (seed={scale.seed})")
+        return
+
+    total = asyncio.run(load(tables))
+    elapsed = time.perf_counter() - start
+    print(f"generated and loaded {total} rows in {elapsed:.2f}s ({total / elapsed:.0f} rows/s, seed={scale.seed})")
+
+
+if __name__ == "__main__":
+    main()
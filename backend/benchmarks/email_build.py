@@ -0,0 +1,58 @@
+"""
+Per-message build cost: MIMEMultipart per call vs. cached MIME skeleton.
+
+Usage:
+    python -m benchmarks.email_build [--messages 5000]
+"""
+import argparse
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from app.utils.email_templates import VERIFICATION_HTML, VERIFICATION_SUBJECT, VERIFICATION_TEXT, get_skeleton
+
+SENDER = "CoRATES <noreply@example.com>"
+LINK = "http://localhost:5173/verify-email?codeSent=true&code={code}"
+
+
+def build_mime(i: int) -> bytes:
+    code = f"{100000 + i % 900000}"
+    link = LINK.format(code=code)
+    message = MIMEMultipart("alternative")
+    message["Subject"] = VERIFICATION_SUBJECT
+    message["From"] = SENDER
+    message["To"] = f"user{i}@example.com"
+    message.attach(MIMEText(VERIFICATION_TEXT.render(link=link, code=code), "plain"))
+    message.attach(MIMEText(VERIFICATION_HTML.render(link=link, code=code), "html"))
+    return message.as_bytes()
+
+
+def build_skeleton(i: int) -> bytes:
+    code = f"{100000 + i % 900000}"
+    skeleton = get_skeleton("verification", SENDER)
+    return skeleton.build(f"user{i}@example.com", link=LINK.format(code=code), code=code)
+
+
+def run(builder, messages: int) -> float:
+    start = time.perf_counter()
+    for i in range(messages):
+        builder(i)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    for name, builder in (("mime", build_mime), ("skeleton", build_skeleton)):
+        builder(0)  # warm caches
+        elapsed = run(builder, args.messages)
+        print(
+            f"{name:>9}: {elapsed / args.messages * 1e6:8.1f} us/message  "
+            f"{args.messages / elapsed:10.0f} messages/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
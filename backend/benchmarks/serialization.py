@@ -0,0 +1,115 @@
+"""
+Response serialization cost: response_model validation vs. the orjson fast
+path (app.utils.serialization), for a list of checklist answers.
+
+The baseline is FastAPI's own ``response_model`` handling
+(``fastapi.routing.serialize_response``: validate the returned rows from
+attributes, dump them in JSON mode) followed by its stdlib ``JSONResponse``.
+The script exits non-zero when the fast path is less than ``--target``
+times faster.
+
+Usage:
+    python -m benchmarks.serialization [--answers 1000] [--repeat 50] [--target 5]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List
+
+from asyncpg.pgproto.pgproto import UUID as AsyncpgUUID
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.schemas.checklist import ChecklistAnswerResponse
+from app.utils.amstar import QUESTION_KEYS
+from app.utils.answer_storage import StoredAnswer
+from app.utils.serialization import ORJSONResponse, rows_to_dicts
+from benchmarks.datagen import random_answers
+
+# Speedup the fast path is expected to reach over response_model validation
+TARGET_SPEEDUP = 5.0
+
+_response_field = create_model_field(name="Response", type_=List[ChecklistAnswerResponse], mode="serialization")
+
+
+def make_answers(count: int, seed: int = 1) -> List[StoredAnswer]:
+    """
+    ``count`` answer rows spread over checklists of every question, with
+    UUIDs of the type asyncpg returns.
+    """
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    answers = []
+    checklist_id = AsyncpgUUID(str(uuid.UUID(int=rng.getrandbits(128))))
+    for i in range(count):
+        key = QUESTION_KEYS[i % len(QUESTION_KEYS)]
+        if key == QUESTION_KEYS[0]:
+            checklist_id = AsyncpgUUID(str(uuid.UUID(int=rng.getrandbits(128))))
+        answers.append(StoredAnswer(
+            id=AsyncpgUUID(str(uuid.UUID(int=rng.getrandbits(128)))),
+            checklist_id=checklist_id,
+            question_key=key,
+            answers=random_answers(rng, key),
+            critical=rng.random() < 0.3,
+            updated_at=start + timedelta(seconds=i, microseconds=rng.randrange(1_000_000)),
+        ))
+    return answers
+
+
+def pydantic_body(answers) -> bytes:
+    # serialize_response never suspends here; drive it without an event loop
+    try:
+        serialize_response(field=_response_field, response_content=answers).send(None)
+    except StopIteration as done:
+        return JSONResponse(done.value).body
+    raise RuntimeError("serialize_response did not complete synchronously")
+
+
+def fast_body(answers) -> bytes:
+    return ORJSONResponse(rows_to_dicts(answers, ChecklistAnswerResponse)).body
+
+
+def best_time(serialize: Callable, answers, repeat: int) -> float:
+    """Fastest of ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialize(answers)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(count: int, repeat: int) -> dict:
+    answers = make_answers(count)
+    pydantic_s = best_time(pydantic_body, answers, repeat)
+    fast_s = best_time(fast_body, answers, repeat)
+    return {
+        "answers": count,
+        "bytes": len(fast_body(answers)),
+        "pydantic_ms": round(pydantic_s * 1000, 3),
+        "orjson_ms": round(fast_s * 1000, 3),
+        "speedup": round(pydantic_s / fast_s, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--answers", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--target", type=float, default=TARGET_SPEEDUP, help="Minimum speedup of the fast path")
+    args = parser.parse_args()
+
+    result = compare(args.answers, args.repeat)
+    print(json.dumps(result, indent=2))
+    if result["speedup"] < args.target:
+        print(f"Speedup {result['speedup']}x is below the {args.target}x target", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
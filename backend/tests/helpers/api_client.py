@@ -5,12 +5,34 @@ import httpx
 from typing import Optional, Dict, Any
 
 
+class QueryBudgetExceeded(AssertionError):
+    """Raised when the server reports a request went over its query budget"""
+
+
+def check_query_budget(response: httpx.Response) -> None:
+    """
+    Fail on responses flagged by a server running with QUERY_DEBUG=true.
+    Servers without query debugging send no X-Query-* headers.
+    """
+    if "x-query-budget-exceeded" in response.headers:
+        request = response.request
+        raise QueryBudgetExceeded(
+            f"{request.method} {request.url.path} ran {response.headers['x-query-count']} SQL statements "
+            f"(budget {response.headers['x-query-budget']}); "
+            f"most repeated: {response.headers.get('x-query-repeated', 'none')}"
+        )
+
+
 class APIClient:
     """HTTP client wrapper for API testing"""
     
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
-        self.client = httpx.Client(base_url=base_url, timeout=30.0)
+        self.client = httpx.Client(
+            base_url=base_url,
+            timeout=30.0,
+            event_hooks={"response": [check_query_budget]},
+        )
         self._access_token: Optional[str] = None
         
     def set_token(self, token: str):
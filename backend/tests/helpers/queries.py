@@ -0,0 +1,28 @@
+"""
+Assertions on the SQL statement counts reported by a server running with
+QUERY_DEBUG=true (see app.core.query_budget). Tests using them are skipped
+when the server does not report query counts.
+"""
+import httpx
+import pytest
+
+
+def query_count(response: httpx.Response) -> int:
+    """Number of SQL statements the server ran for this response"""
+    if "x-query-count" not in response.headers:
+        pytest.skip("Server is not running with QUERY_DEBUG=true")
+    return int(response.headers["x-query-count"])
+
+
+def assert_max_queries(response: httpx.Response, expected: int):
+    """Assert the request ran at most ``expected`` SQL statements"""
+    count = query_count(response)
+    assert count <= expected, f"Expected at most {expected} SQL statements, got {count}"
+
+
+def assert_no_repeated_queries(response: httpx.Response):
+    """Assert no statement shape was repeated often enough to look like an N+1"""
+    query_count(response)
+    assert "x-query-repeated" not in response.headers, (
+        f"Repeated statement: {response.headers['x-query-repeated']}"
+    )
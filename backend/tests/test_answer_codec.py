@@ -0,0 +1,122 @@
+import json
+import random
+
+import pytest
+from starlette.requests import Request
+
+from app.api.v1.endpoints.checklist_answers import wants_packed
+from app.utils.amstar import AMSTAR_QUESTIONS, QUESTION_KEYS, empty_answers
+from app.utils.answer_codec import (
+    AMSTAR_ANSWERS_MEDIA_TYPE,
+    PackedAnswer,
+    decode_answers,
+    encode_answers,
+    pack_checklist,
+    try_encode,
+    unpack_checklist,
+)
+from benchmarks.datagen import random_answers
+
+
+def full_checklist(seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    return {key: random_answers(rng, key) for key in QUESTION_KEYS}
+
+
+def accept_request(accept: str) -> Request:
+    return Request({"type": "http", "headers": [(b"accept", accept.encode())]})
+
+
+class TestQuestionMask:
+    """Test cases for per-question bitmasks."""
+
+    def test_bits_follow_column_order(self):
+        """Checkboxes are numbered column by column, lowest bit first."""
+        assert encode_answers("q1", [[True, False, False, False], [True], [False, True]]) == 0b1010001
+
+    def test_round_trip_every_question(self):
+        """Decoding an encoded grid gives it back for every question."""
+        for key, answers in full_checklist().items():
+            assert decode_answers(key, encode_answers(key, answers)) == answers
+
+    def test_masks_fit_smallint(self):
+        """Every question's all-ticked mask fits a signed 16-bit column."""
+        for key, shape in AMSTAR_QUESTIONS.items():
+            assert (1 << sum(shape.columns)) - 1 < 2 ** 15
+
+    def test_shape_mismatch(self):
+        """Grids with the wrong shape are rejected, or skipped by try_encode."""
+        with pytest.raises(ValueError):
+            encode_answers("q1", [[True], [False]])
+        assert try_encode("q1", [[True], [False]]) is None
+        assert try_encode("q99", [[True]]) is None
+
+    def test_out_of_range_mask(self):
+        """Masks with bits beyond the question's checkboxes are rejected."""
+        with pytest.raises(ValueError):
+            decode_answers("q5", 1 << 4)
+
+
+class TestPackedChecklist:
+    """Test cases for the whole-checklist binary format."""
+
+    def test_round_trip(self):
+        """Packing then unpacking keeps masks and critical flags."""
+        packed = {
+            key: PackedAnswer(encode_answers(key, answers), AMSTAR_QUESTIONS[key].critical)
+            for key, answers in full_checklist().items()
+        }
+
+        assert unpack_checklist(pack_checklist(packed)) == packed
+
+    def test_partial_checklist(self):
+        """Unanswered questions are simply absent."""
+        packed = {"q2": PackedAnswer(encode_answers("q2", empty_answers("q2")), True)}
+
+        assert unpack_checklist(pack_checklist(packed)) == packed
+        assert pack_checklist({}) == b"\x01" + bytes(6)
+
+    def test_much_smaller_than_json(self):
+        """A full checklist packs into 28 bytes."""
+        answers = full_checklist()
+        packed = {key: PackedAnswer(encode_answers(key, grid), False) for key, grid in answers.items()}
+        as_json = json.dumps([{"question_key": key, "answers": grid, "critical": False} for key, grid in answers.items()])
+
+        assert len(pack_checklist(packed)) == 28
+        assert len(as_json) > 40 * 28
+
+    @pytest.mark.parametrize("data", [b"", b"\x02" + bytes(6), b"\x01\xff\xff\xff" + bytes(3), b"\x01\x01\x00\x00\x00\x00\x00"])
+    def test_malformed_payloads(self, data):
+        """Wrong versions, unknown questions and truncated bodies raise ValueError."""
+        with pytest.raises(ValueError):
+            unpack_checklist(data)
+
+    def test_trailing_bytes(self):
+        """Extra bytes after the last mask are rejected."""
+        with pytest.raises(ValueError):
+            unpack_checklist(pack_checklist({}) + b"\x00")
+
+
+class TestPackedNegotiation:
+    """Test cases for choosing the packed format from Accept."""
+
+    @pytest.mark.parametrize("accept", [
+        AMSTAR_ANSWERS_MEDIA_TYPE,
+        f"application/json;q=0.5, {AMSTAR_ANSWERS_MEDIA_TYPE}",
+        f"{AMSTAR_ANSWERS_MEDIA_TYPE};q=0.8, */*;q=0.1",
+    ])
+    def test_explicit_packed_is_chosen(self, accept):
+        """Naming the packed type with the highest quality selects it."""
+        assert wants_packed(accept_request(accept))
+
+    @pytest.mark.parametrize("accept", [
+        "",
+        "*/*",
+        "application/*",
+        f"{AMSTAR_ANSWERS_MEDIA_TYPE};q=0",
+        f"{AMSTAR_ANSWERS_MEDIA_TYPE} ; q=0.0, application/json",
+        f"{AMSTAR_ANSWERS_MEDIA_TYPE};q=0.5, application/json",
+    ])
+    def test_json_is_kept_otherwise(self, accept):
+        """Wildcards, q=0 and a preferred JSON keep the JSON default."""
+        assert not wants_packed(accept_request(accept))
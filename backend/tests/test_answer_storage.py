@@ -0,0 +1,58 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+
+from app import main
+from app.core.config import settings
+from app.utils.answer_storage import document_answer_id, from_document
+from benchmarks.answer_storage import documents
+from benchmarks.datagen import Dataset, Scale
+
+
+class TestDocumentLayout:
+    """Test cases for the one-row-per-checklist answer layout."""
+
+    def test_from_document_orders_questions(self):
+        """Answers come back in checklist order with stable ids."""
+        checklist_id = uuid.uuid4()
+        stamp = datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat()
+        document = {
+            key: {"answers": [[True], [False]], "critical": key == "q2", "updated_at": stamp}
+            for key in ("q10", "q2", "q9a", "q1")
+        }
+
+        answers = from_document(checklist_id, document)
+
+        assert [answer.question_key for answer in answers] == ["q1", "q2", "q9a", "q10"]
+        assert answers[1].critical is True
+        assert answers[0].id == document_answer_id(checklist_id, "q1")
+        assert answers[0].updated_at == datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def test_benchmark_documents_match_rows(self):
+        """The benchmark's documents hold exactly the generated rows."""
+        dataset = Dataset(Scale(users=10, projects=2, members_per_project=3, reviews_per_project=2, seed=3))
+        rows = {checklist[0]: answers for checklist, answers in dataset.checklists_and_answers()}
+
+        for checklist_id, document, _ in documents(dataset):
+            parsed = json.loads(document)
+            assert set(parsed) == {row[2] for row in rows[checklist_id]}
+            for row in rows[checklist_id]:
+                assert parsed[row[2]]["answers"] == json.loads(row[3])
+
+
+class TestDocumentModeElectric:
+    """Electric shapes of checklist_answers would go stale in document mode."""
+
+    async def test_answer_shapes_refused_in_document_mode(self, monkeypatch):
+        """The proxy answers 409 instead of serving a table that no longer gets writes."""
+        monkeypatch.setattr(settings, "ANSWER_STORAGE", "document")
+        transport = httpx.ASGITransport(app=main.app)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for table in ("checklist_answers", "public.checklist_answers"):
+                response = await client.get(
+                    f"{settings.API_PREFIX}/electric-proxy/v1/shape", params={"table": table, "offset": "-1"}
+                )
+                assert response.status_code == 409
@@ -0,0 +1,84 @@
+import httpx
+
+from benchmarks.api_load import Recorder, compare, percentile, virtual_user
+
+
+def make_report(p95: float, errors: int = 0, throughput: float = 100.0) -> dict:
+    return {
+        "throughput_rps": throughput,
+        "endpoints": {
+            "POST /checklists": {"p50_ms": 5.0, "p95_ms": p95, "p99_ms": 20.0, "errors": errors},
+        },
+    }
+
+
+class TestPercentile:
+    """Test cases for the nearest-rank percentile."""
+
+    def test_percentiles(self):
+        samples = list(range(1, 101))
+
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 95) == 95
+        assert percentile(samples, 99) == 99
+
+    def test_empty_samples(self):
+        assert percentile([], 95) == 0.0
+
+    def test_report_groups_by_endpoint(self):
+        recorder = Recorder()
+        recorder.latencies["GET /a"] = [1.0, 2.0, 3.0]
+        recorder.errors["GET /a"] = 1
+
+        report = recorder.report(elapsed=1.5)
+
+        assert report["requests"] == 4
+        assert report["endpoints"]["GET /a"]["errors"] == 1
+        assert report["endpoints"]["GET /a"]["throughput_rps"] == 2.67
+
+
+def failing_client(status_code: int) -> httpx.AsyncClient:
+    transport = httpx.MockTransport(lambda request: httpx.Response(status_code, json={"detail": "nope"}))
+    return httpx.AsyncClient(transport=transport, base_url="http://benchmark")
+
+
+class TestFailures:
+    """Test cases for keeping failed calls out of the latency samples."""
+
+    async def test_failed_calls_are_not_sampled(self):
+        recorder = Recorder()
+        async with failing_client(500) as client:
+            await recorder.call(client, "GET /a", "GET", "/a")
+
+        assert recorder.latencies["GET /a"] == []
+        assert recorder.report(elapsed=1.0)["endpoints"]["GET /a"]["errors"] == 1
+
+    async def test_failed_setup_stops_the_user(self):
+        recorder = Recorder()
+        async with failing_client(503) as client:
+            await virtual_user(client, recorder, index=0, iterations=1)
+
+        report = recorder.report(elapsed=1.0)
+        assert report["setup_failures"] == {"POST /auth/signin": 1}
+        assert report["requests"] == 1
+        assert "POST /auth/signin setup failures: 1" in compare(report, make_report(10.0), tolerance=0.2)
+
+
+class TestBaselineComparison:
+    """Test cases for regression detection against a stored baseline."""
+
+    def test_within_tolerance(self):
+        assert compare(make_report(11.0), make_report(10.0), tolerance=0.2) == []
+
+    def test_latency_regression_flagged(self):
+        regressions = compare(make_report(13.0), make_report(10.0), tolerance=0.2)
+
+        assert regressions == ["POST /checklists p95_ms: 10.0 -> 13.0"]
+
+    def test_new_errors_flagged(self):
+        assert compare(make_report(10.0, errors=2), make_report(10.0), tolerance=0.2)
+
+    def test_throughput_drop_flagged(self):
+        regressions = compare(make_report(10.0, throughput=70.0), make_report(10.0), tolerance=0.2)
+
+        assert regressions == ["throughput_rps: 100.0 -> 70.0"]
@@ -13,7 +13,7 @@ from tests.helpers.generators import (
     generate_weak_password_no_digit,
     generate_weak_password_too_short,
 )
-from tests.helpers.auth import extract_code_from_response
+from tests.helpers.auth import create_user_and_get_token, extract_code_from_response
 
 
 @pytest.mark.auth
@@ -464,6 +464,29 @@ class TestRefreshTokenEndpoint:
         
         assert response.status_code == 401
 
+    def test_refresh_rotates_refresh_cookie(self, api_client: APIClient):
+        """Each refresh consumes the cookie and sets its successor"""
+        create_user_and_get_token(api_client, generate_email(), generate_name(), generate_strong_password())
+        first = api_client.client.cookies.get("refresh")
+
+        response = api_client.post("/api/v1/auth/refresh")
+
+        assert response.status_code == 200
+        assert response.cookies.get("refresh") not in (None, first)
+
+    def test_concurrent_reuse_within_grace_keeps_session(self, api_client: APIClient):
+        """A second refresh with the same cookie right away gets an access token but no new cookie"""
+        create_user_and_get_token(api_client, generate_email(), generate_name(), generate_strong_password())
+        first = api_client.client.cookies.get("refresh")
+        assert api_client.post("/api/v1/auth/refresh").status_code == 200
+
+        with APIClient(base_url=api_client.base_url) as other_tab:
+            response = other_tab.post("/api/v1/auth/refresh", cookies={"refresh": first})
+
+        assert response.status_code == 200
+        assert "refresh" not in response.cookies
+        assert api_client.post("/api/v1/auth/refresh").status_code == 200
+
 
 @pytest.mark.auth
 class TestSignoutEndpoint:
@@ -501,6 +524,20 @@ class TestSignoutEndpoint:
         assert response.status_code == 200
         assert "message" in response.json()
     
+    def test_signout_revokes_access_and_refresh_tokens(self, api_client: APIClient):
+        """After signout, neither the access token nor the refresh cookie of that sign-in works"""
+        _, access_token = create_user_and_get_token(api_client, generate_email(), generate_name(), generate_strong_password())
+        refresh = api_client.client.cookies.get("refresh")
+        api_client.set_token(access_token)
+        assert api_client.get("/api/v1/users/me").status_code == 200
+
+        assert api_client.post("/api/v1/auth/signout").status_code == 200
+
+        assert api_client.get("/api/v1/users/me").status_code == 401
+        with APIClient(base_url=api_client.base_url) as client:
+            response = client.post("/api/v1/auth/refresh", cookies={"refresh": refresh})
+        assert response.status_code == 401
+
     def test_signout_works_without_authentication(self, api_client: APIClient):
         """Signout should work even without being signed in"""
         response = api_client.post("/api/v1/auth/signout")
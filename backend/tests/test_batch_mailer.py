@@ -0,0 +1,154 @@
+import asyncio
+import email
+import socket
+import time
+import uuid
+from email import policy
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.utils.batch_mailer import (
+    RateLimiter,
+    SMTPBatchSender,
+    build_invite_messages,
+    build_reminder_messages,
+    deliver,
+)
+
+
+class CollectingHandler:
+    """aiosmtpd handler that records every delivered message."""
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+        self.messages.append((envelope.rcpt_tos, envelope.content))
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_sink():
+    """Run a local SMTP sink on a free port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    handler = CollectingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, port
+    controller.stop()
+
+
+def make_sender(port: int, rate: float = 0) -> SMTPBatchSender:
+    return SMTPBatchSender(
+        hostname="127.0.0.1",
+        port=port,
+        sender="noreply@example.com",
+        limiter=RateLimiter(rate),
+    )
+
+
+@pytest.mark.asyncio
+class TestBatchDelivery:
+    """Test cases for batch delivery against a local SMTP sink."""
+
+    async def test_reminders_delivered_over_one_session(self, smtp_sink):
+        """All reminders are delivered over a single SMTP session."""
+        handler, port = smtp_sink
+        reviewers = [(f"reviewer{i}@example.com", f"Reviewer {i}", i + 1) for i in range(5)]
+        messages = build_reminder_messages(uuid.uuid4(), "ML & Health", reviewers)
+
+        result = await deliver(messages, make_sender(port))
+
+        assert result.sent == 5
+        assert result.failed == []
+        assert len(handler.messages) == 5
+        assert len(handler.sessions) == 1
+
+        rcpt_tos, content = handler.messages[2]
+        assert rcpt_tos == ["reviewer2@example.com"]
+        message = email.message_from_bytes(content, policy=policy.default)
+        assert message["Subject"] == "Checklists Awaiting Your Review - CoRATES"
+        assert "You have 3 incomplete checklist(s)" in message.get_body(preferencelist=("plain",)).get_content()
+        assert "ML &amp; Health" in message.get_body(preferencelist=("html",)).get_content()
+
+    async def test_invitations_delivered(self, smtp_sink):
+        """Invitations reach every invitee."""
+        handler, port = smtp_sink
+        messages = build_invite_messages(
+            uuid.uuid4(), "Project X", "Owner", [("a@example.com", "A"), ("b@example.com", "B")]
+        )
+
+        result = await deliver(messages, make_sender(port))
+
+        assert result.sent == 2
+        assert [rcpt for rcpt, _ in handler.messages] == [["a@example.com"], ["b@example.com"]]
+
+    async def test_unreachable_relay_reports_all_failed(self):
+        """An unreachable relay fails the batch without raising."""
+        messages = build_invite_messages(uuid.uuid4(), "P", "Owner", [("a@example.com", "A")])
+        sender = SMTPBatchSender(hostname="127.0.0.1", port=1, sender="noreply@example.com", limiter=RateLimiter(0))
+
+        result = await deliver(messages, sender)
+
+        assert result.sent == 0
+        assert result.failed == ["a@example.com"]
+
+    async def test_empty_batch_does_not_connect(self):
+        """Nothing to send means no SMTP session."""
+        result = await deliver([])
+
+        assert result.sent == 0
+        assert result.failed == []
+
+
+class TestMessageRendering:
+    """Test cases for user-supplied values in bulk messages."""
+
+    def test_project_name_cannot_inject_a_part(self):
+        """A project name carrying the old fixed boundary and CR/LF stays plain text in one part."""
+        injected = (
+            "Project\r\n--===============corates-alternative==\r\n"
+            "Content-Type: text/html\r\n\r\n<a href='http://evil'>Login</a>"
+        )
+        [(_, raw_a), (_, raw_b)] = build_invite_messages(
+            uuid.uuid4(), injected, "Owner\nBcc: x@evil.example", [("a@example.com", "A"), ("b@example.com", "B")]
+        )
+
+        message = email.message_from_bytes(raw_a, policy=policy.default)
+        parts = list(message.iter_parts())
+        assert [part.get_content_type() for part in parts] == ["text/plain", "text/html"]
+        text = parts[0].get_content()
+        assert "Project --===============corates-alternative== Content-Type: text/html" in text
+        assert "Owner Bcc: x@evil.example added you" in text
+        assert "<a href='http://evil'>" not in parts[1].get_content()
+        other = email.message_from_bytes(raw_b, policy=policy.default)
+        assert message.get_boundary() != other.get_boundary()
+
+
+@pytest.mark.asyncio
+class TestRateLimiter:
+    """Test cases for the per-relay token bucket."""
+
+    async def test_burst_then_throttle(self):
+        """Sends beyond the burst wait for new tokens."""
+        limiter = RateLimiter(rate=20, burst=2)
+
+        start = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        elapsed = time.monotonic() - start
+
+        # Two tokens available immediately, two more at 20/s
+        assert elapsed >= 0.09
+
+    async def test_zero_rate_is_unlimited(self):
+        """A rate of zero disables throttling."""
+        limiter = RateLimiter(rate=0)
+
+        await asyncio.wait_for(asyncio.gather(*(limiter.acquire() for _ in range(100))), timeout=1)
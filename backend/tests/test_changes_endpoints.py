@@ -0,0 +1,109 @@
+"""
+Project change feed (delta sync) endpoint tests
+"""
+import pytest
+from tests.helpers.generators import generate_project_name, generate_review_name
+from tests.helpers.auth import assign_reviewer, create_checklist, create_project, create_review
+
+Q1_ANSWER = {"question_key": "q1", "answers": [[True, False, False, False], [True], [False, True]]}
+
+
+def pull(api_client, project_id, since=0):
+    response = api_client.get(f"/api/v1/projects/{project_id}/changes", params={"since": since})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.project
+class TestProjectChangesEndpoint:
+    """Tests for GET /api/v1/projects/{project_id}/changes"""
+    
+    def _project_with_checklist(self, api_client, user_data):
+        project = create_project(api_client, generate_project_name())
+        review = create_review(api_client, project["id"], generate_review_name())
+        assign_reviewer(api_client, review["id"], user_data["id"])
+        checklist = create_checklist(api_client, review["id"])
+        return project, review, checklist
+    
+    def test_full_pull_returns_project_rows(self, authenticated_client):
+        """since=0 returns every review, checklist and answer of the project"""
+        api_client, user_data, access_token = authenticated_client
+        project, review, checklist = self._project_with_checklist(api_client, user_data)
+        api_client.post(f"/api/v1/checklists/{checklist['id']}/answers", json=Q1_ANSWER)
+        
+        data = pull(api_client, project["id"])
+        
+        assert data["watermark"] > 0
+        assert [item["id"] for item in data["reviews"]] == [review["id"]]
+        assert [item["id"] for item in data["checklists"]] == [checklist["id"]]
+        assert [item["question_key"] for item in data["answers"]] == ["q1"]
+        assert data["deleted"] == []
+    
+    def test_incremental_pull_returns_only_changes(self, authenticated_client):
+        """Pulling from the last watermark returns only rows written since"""
+        api_client, user_data, access_token = authenticated_client
+        project, review, checklist = self._project_with_checklist(api_client, user_data)
+        watermark = pull(api_client, project["id"])["watermark"]
+        
+        api_client.post(f"/api/v1/checklists/{checklist['id']}/answers", json=Q1_ANSWER)
+        data = pull(api_client, project["id"], watermark)
+        
+        assert data["reviews"] == []
+        assert [item["question_key"] for item in data["answers"]] == ["q1"]
+        assert [item["id"] for item in data["checklists"]] == [checklist["id"]]
+        assert data["watermark"] >= watermark
+    
+    def test_deleted_checklist_is_reported(self, authenticated_client):
+        """Deleting a checklist leaves a tombstone for incremental pulls"""
+        api_client, user_data, access_token = authenticated_client
+        project, review, checklist = self._project_with_checklist(api_client, user_data)
+        watermark = pull(api_client, project["id"])["watermark"]
+        
+        assert api_client.delete(f"/api/v1/checklists/{checklist['id']}").status_code == 204
+        data = pull(api_client, project["id"], watermark)
+        
+        assert [(item["table_name"], item["row_id"]) for item in data["deleted"]] == [("checklists", checklist["id"])]
+        assert data["checklists"] == []
+    
+    def test_non_member_gets_403(self, two_authenticated_clients):
+        """Users outside the project cannot pull its changes"""
+        (user1_data, token1), (user2_data, token2), api_client = two_authenticated_clients
+        api_client.set_token(token1)
+        project = create_project(api_client, generate_project_name())
+        
+        api_client.set_token(token2)
+        response = api_client.get(f"/api/v1/projects/{project['id']}/changes")
+        
+        assert response.status_code == 403
+    
+    def test_unknown_project_returns_404(self, authenticated_client):
+        """Unknown project ids return 404"""
+        api_client, user_data, access_token = authenticated_client
+        
+        response = api_client.get("/api/v1/projects/00000000-0000-0000-0000-000000000000/changes")
+        
+        assert response.status_code == 404
+
+
+@pytest.mark.project
+class TestProjectEventsEndpoint:
+    """Tests for GET /api/v1/projects/{project_id}/events"""
+    
+    def test_non_member_gets_403(self, two_authenticated_clients):
+        """Users outside the project cannot subscribe to its events"""
+        (user1_data, token1), (user2_data, token2), api_client = two_authenticated_clients
+        api_client.set_token(token1)
+        project = create_project(api_client, generate_project_name())
+        
+        api_client.set_token(token2)
+        response = api_client.get(f"/api/v1/projects/{project['id']}/events")
+        
+        assert response.status_code == 403
+    
+    def test_unknown_project_returns_404(self, authenticated_client):
+        """Unknown project ids return 404 before any stream is opened"""
+        api_client, user_data, access_token = authenticated_client
+        
+        response = api_client.get("/api/v1/projects/00000000-0000-0000-0000-000000000000/events")
+        
+        assert response.status_code == 404
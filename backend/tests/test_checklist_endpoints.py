@@ -8,6 +8,7 @@ from tests.helpers.auth import (
     create_project,
     create_review,
     assign_reviewer,
+    create_checklist,
 )
 
 
@@ -296,3 +297,105 @@ class TestCompleteChecklistEndpoint:
         
         assert response.status_code in [401, 403, 404]
 
+
+@pytest.mark.checklist
+class TestConditionalChecklistReads:
+    """Tests for ETags on GET /api/v1/checklists/{checklist_id} and POST /api/v1/checklists/batch"""
+    
+    def _checklist(self, api_client, user_data):
+        project = create_project(api_client, generate_project_name())
+        review = create_review(api_client, project["id"], generate_review_name())
+        assign_reviewer(api_client, review["id"], user_data["id"])
+        return create_checklist(api_client, review["id"])
+    
+    def _answer(self, api_client, checklist_id):
+        response = api_client.post(
+            f"/api/v1/checklists/{checklist_id}/answers",
+            json={"question_key": "q1", "answers": [[True, False, False, False], [True], [False, True]]}
+        )
+        assert response.status_code == 201
+    
+    def test_get_returns_etag_and_answers(self, authenticated_client):
+        """GET returns the checklist with answers and a weak ETag"""
+        api_client, user_data, access_token = authenticated_client
+        checklist = self._checklist(api_client, user_data)
+        self._answer(api_client, checklist["id"])
+        
+        response = api_client.get(f"/api/v1/checklists/{checklist['id']}")
+        
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('W/"')
+        data = response.json()
+        assert data["id"] == checklist["id"]
+        assert [answer["question_key"] for answer in data["answers"]] == ["q1"]
+    
+    def test_matching_etag_returns_304(self, authenticated_client):
+        """If-None-Match with the current ETag returns 304 with no body"""
+        api_client, user_data, access_token = authenticated_client
+        checklist = self._checklist(api_client, user_data)
+        etag = api_client.get(f"/api/v1/checklists/{checklist['id']}").headers["etag"]
+        
+        response = api_client.get(f"/api/v1/checklists/{checklist['id']}", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+    
+    def test_answer_write_changes_etag(self, authenticated_client):
+        """Saving an answer invalidates the previous ETag"""
+        api_client, user_data, access_token = authenticated_client
+        checklist = self._checklist(api_client, user_data)
+        etag = api_client.get(f"/api/v1/checklists/{checklist['id']}").headers["etag"]
+        self._answer(api_client, checklist["id"])
+        
+        response = api_client.get(f"/api/v1/checklists/{checklist['id']}", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    
+    def test_answers_endpoint_honours_etag(self, authenticated_client):
+        """GET /answers shares the checklist ETag and varies on Accept"""
+        api_client, user_data, access_token = authenticated_client
+        checklist = self._checklist(api_client, user_data)
+        etag = api_client.get(f"/api/v1/checklists/{checklist['id']}").headers["etag"]
+        
+        response = api_client.get(f"/api/v1/checklists/{checklist['id']}/answers", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        full = api_client.get(f"/api/v1/checklists/{checklist['id']}/answers")
+        assert full.headers["etag"] == etag
+        assert full.headers["vary"] == "Accept"
+    
+    def test_non_member_cannot_read(self, two_authenticated_clients):
+        """Users outside the project get 403, even with If-None-Match"""
+        (user1_data, token1), (user2_data, token2), api_client = two_authenticated_clients
+        api_client.set_token(token1)
+        checklist = self._checklist(api_client, user1_data)
+        etag = api_client.get(f"/api/v1/checklists/{checklist['id']}").headers["etag"]
+        
+        api_client.set_token(token2)
+        response = api_client.get(f"/api/v1/checklists/{checklist['id']}", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 403
+    
+    def test_batch_returns_only_changed(self, authenticated_client):
+        """Batch fetch returns bodies only for checklists whose ETag changed"""
+        api_client, user_data, access_token = authenticated_client
+        first = self._checklist(api_client, user_data)
+        second = self._checklist(api_client, user_data)
+        etags = {
+            checklist["id"]: api_client.get(f"/api/v1/checklists/{checklist['id']}").headers["etag"]
+            for checklist in (first, second)
+        }
+        self._answer(api_client, second["id"])
+        unknown = "00000000-0000-0000-0000-000000000000"
+        
+        response = api_client.post("/api/v1/checklists/batch", json={"checklists": {**etags, unknown: None}})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["unchanged"] == [first["id"]]
+        assert [checklist["id"] for checklist in data["changed"]] == [second["id"]]
+        assert data["changed"][0]["etag"] != etags[second["id"]]
+        assert data["changed"][0]["answers"][0]["question_key"] == "q1"
+        assert data["missing"] == [unknown]
@@ -0,0 +1,167 @@
+import gzip
+import json
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware import compression
+from app.middleware.compression import CompressionMiddleware, accepted_encodings, choose_encoding
+from benchmarks.compression import run
+
+PAYLOAD = [{"question_key": f"q{i % 16 + 1}", "answers": [[True, False, False], [False, True]], "critical": False} for i in range(200)]
+
+
+def stream_chunks(chunks):
+    async def body():
+        for chunk in chunks:
+            yield chunk
+    return body()
+
+
+async def large_json(request):
+    return JSONResponse(PAYLOAD, headers={"Vary": "Accept"})
+
+
+async def small_json(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def events(request):
+    return StreamingResponse(stream_chunks([b"data: x\n\n" * 200]), media_type="text/event-stream")
+
+
+async def upstream_gzip(request):
+    body = gzip.compress(json.dumps(PAYLOAD).encode())
+    return Response(body, media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+
+async def streamed_json(request):
+    chunks = [json.dumps(item).encode() + b"\n" for item in PAYLOAD]
+    return StreamingResponse(stream_chunks(chunks), media_type="application/json")
+
+
+async def binary(request):
+    return Response(bytes(4096), media_type="application/octet-stream")
+
+
+def make_client(minimum_size=500):
+    app = Starlette(routes=[
+        Route("/large", large_json),
+        Route("/small", small_json),
+        Route("/events", events),
+        Route("/upstream", upstream_gzip),
+        Route("/stream", streamed_json),
+        Route("/binary", binary),
+        Route("/text", lambda request: PlainTextResponse("word " * 1000)),
+    ])
+    return TestClient(CompressionMiddleware(app, minimum_size=minimum_size))
+
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+class TestAcceptEncoding:
+    """Test cases for Accept-Encoding negotiation."""
+
+    def test_q_values(self):
+        """Codings with q=0 are refused."""
+        assert accepted_encodings("gzip;q=0, deflate, br;q=0.5") == ["deflate", "br"]
+
+    def test_gzip_fallback(self, monkeypatch):
+        """Without the brotli package, br is ignored and gzip is used."""
+        monkeypatch.setattr(compression, "brotli", None)
+
+        assert choose_encoding("br, gzip") == "gzip"
+        assert choose_encoding("br") is None
+        assert choose_encoding("identity") is None
+
+
+class TestCompressionMiddleware:
+    """Test cases for response compression."""
+
+    def test_large_json_is_gzipped(self, monkeypatch):
+        """JSON above the threshold is compressed and Vary is extended."""
+        monkeypatch.setattr(compression, "brotli", None)
+        response = make_client().get("/large", headers=GZIP)
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept, Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(json.dumps(PAYLOAD)) / 5
+        assert response.json() == PAYLOAD
+
+    def test_small_response_is_not_compressed(self):
+        """Bodies below the threshold are sent as they are."""
+        response = make_client().get("/small", headers=GZIP)
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"status": "ok"}
+
+    def test_client_without_gzip_gets_identity(self):
+        """Nothing is compressed unless the client accepts it."""
+        response = make_client().get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+
+    def test_event_stream_is_never_compressed(self):
+        """SSE must reach the client unbuffered."""
+        response = make_client().get("/events", headers=GZIP)
+
+        assert "content-encoding" not in response.headers
+        assert response.text.startswith("data: x")
+
+    def test_long_poll_is_never_compressed(self):
+        """Electric live requests pass through untouched."""
+        response = make_client().get("/large", params={"live": "true"}, headers=GZIP)
+
+        assert "content-encoding" not in response.headers
+
+    def test_encoded_upstream_body_is_not_recompressed(self):
+        """Bodies that already carry a Content-Encoding are passed through."""
+        response = make_client().get("/upstream", headers=GZIP)
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == PAYLOAD
+
+    def test_streaming_response_is_compressed_incrementally(self, monkeypatch):
+        """Streamed JSON is compressed without a Content-Length and decodes fully."""
+        monkeypatch.setattr(compression, "brotli", None)
+        response = make_client().get("/stream", headers=GZIP)
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert [json.loads(line) for line in response.text.splitlines()] == PAYLOAD
+
+    def test_other_content_types_are_not_compressed(self):
+        """Only allowlisted content types are compressed."""
+        response = make_client().get("/binary", headers=GZIP)
+
+        assert "content-encoding" not in response.headers
+
+    def test_text_is_compressed(self, monkeypatch):
+        """text/* is in the allowlist."""
+        monkeypatch.setattr(compression, "brotli", None)
+        response = make_client().get("/text", headers=GZIP)
+
+        assert response.headers["content-encoding"] == "gzip"
+
+    @pytest.mark.skipif(compression.brotli is None, reason="brotli is not installed")
+    def test_brotli_preferred_when_installed(self):
+        """br is chosen over gzip when both are accepted."""
+        response = make_client().get("/large", headers={"Accept-Encoding": "gzip, br"})
+
+        assert response.headers["content-encoding"] == "br"
+
+
+class TestCompressionBenchmark:
+    """Sanity check of the compression benchmark."""
+
+    def test_answer_payloads_shrink(self):
+        """The default gzip level shrinks answer JSON several times over."""
+        report = run(count=200, repeat=1)
+
+        for results in report.values():
+            assert results["gzip-6"]["ratio"] >= 3
+            assert results["gzip-6-streamed"]["bytes"] < results["raw_bytes"]
@@ -0,0 +1,78 @@
+import json
+import random
+
+import pytest
+
+from app.utils.amstar import QUESTION_KEYS, matches_shape
+from app.utils.answer_codec import decode_answers
+from benchmarks.datagen import Dataset, Scale, random_answers, table_rows
+from tests.helpers.generators import fake
+
+
+SMALL = Scale(users=30, projects=6, members_per_project=4, reviews_per_project=3, seed=7)
+
+
+@pytest.fixture(autouse=True)
+def reseed_faker():
+    """The generator seeds the shared Faker; restore randomness for other tests."""
+    yield
+    fake.seed_instance(None)
+
+
+def materialize(scale: Scale) -> dict:
+    return {table: list(rows) for table, rows in table_rows(Dataset(scale)).items()}
+
+
+class TestDatasetGenerator:
+    """Test cases for the synthetic dataset generator."""
+
+    def test_same_seed_is_deterministic(self):
+        """Two runs with the same seed produce identical rows."""
+        assert materialize(SMALL) == materialize(SMALL)
+
+    def test_different_seed_differs(self):
+        """Changing the seed changes the data."""
+        other = Scale(**{**SMALL.__dict__, "seed": 8})
+
+        assert materialize(SMALL)["checklist_answers"] != materialize(other)["checklist_answers"]
+
+    def test_row_counts(self):
+        """Row counts follow the requested scale."""
+        tables = materialize(SMALL)
+
+        assert len(tables["users"]) == 30
+        assert len(tables["projects"]) == 6
+        assert len(tables["project_members"]) == 6 * 4
+        assert len(tables["reviews"]) == 6 * 3
+        assert len(tables["review_assignments"]) == 6 * 3 * 2
+        assert len(tables["checklists"]) == len(tables["review_assignments"])
+
+    def test_reviewers_are_project_members(self):
+        """Every assigned reviewer is a member of the review's project."""
+        tables = materialize(SMALL)
+        members = {(project_id, user_id) for project_id, user_id, _ in tables["project_members"]}
+        review_project = {review_id: project_id for review_id, project_id, _, _ in tables["reviews"]}
+
+        for review_id, user_id in tables["review_assignments"]:
+            assert (review_project[review_id], user_id) in members
+
+    def test_completed_checklists_fully_answered(self):
+        """Completed checklists have an answer for every AMSTAR question."""
+        tables = materialize(SMALL)
+        answered = {}
+        for _, checklist_id, key, answers, mask, _, _ in tables["checklist_answers"]:
+            assert matches_shape(key, json.loads(answers))
+            assert decode_answers(key, mask) == json.loads(answers)
+            answered.setdefault(checklist_id, []).append(key)
+
+        for checklist_id, _, _, _, completed_at, _ in tables["checklists"]:
+            if completed_at is not None:
+                assert answered[checklist_id] == QUESTION_KEYS
+
+    def test_random_answers_pick_one_rating(self):
+        """The rating column always has exactly one selection."""
+        rng = random.Random(1)
+        for key in QUESTION_KEYS:
+            answers = random_answers(rng, key)
+            assert matches_shape(key, answers)
+            assert sum(answers[-1]) == 1
@@ -0,0 +1,97 @@
+import email
+from email import policy
+
+import pytest
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.utils.email import build_templated_message
+from app.utils.email_templates import EmailTemplate, VERIFICATION_HTML, get_skeleton
+
+
+class TestEmailTemplate:
+    """Test cases for the precompiled template."""
+
+    def test_render_interpolates_placeholders(self):
+        """Placeholders are replaced and CSS braces are left alone."""
+        template = EmailTemplate("body { color: red; } {{ code }} / {{link}}")
+
+        assert template.render(code="123456", link="http://x") == "body { color: red; } 123456 / http://x"
+
+    def test_render_bytes_uses_crlf(self):
+        """Encoded output uses CRLF line endings."""
+        template = EmailTemplate("a\n{{ code }}\nb")
+
+        assert template.render_bytes(code="1") == b"a\r\n1\r\nb"
+
+    def test_missing_value_raises(self):
+        """Missing placeholder values raise KeyError."""
+        with pytest.raises(KeyError):
+            VERIFICATION_HTML.render(code="123456")
+
+
+class TestMessageSkeleton:
+    """Test cases for the cached MIME skeleton."""
+
+    def test_skeleton_is_cached_per_sender(self):
+        """The same template and sender share one skeleton."""
+        assert get_skeleton("verification", "A <a@x.com>") is get_skeleton("verification", "A <a@x.com>")
+        assert get_skeleton("verification", "A <a@x.com>") is not get_skeleton("verification", "B <b@x.com>")
+
+    def test_built_message_parses(self):
+        """The built bytes parse as a multipart/alternative message."""
+        with patch.object(settings, 'EMAIL_FROM_NAME', 'Test CoRATES'), \
+             patch.object(settings, 'EMAIL_FROM', 'test@example.com'):
+            raw = build_templated_message(
+                "password_reset",
+                "user@example.com",
+                link="http://localhost:5173/reset-password?codeSent=true&code=654321",
+                code="654321",
+            )
+
+        message = email.message_from_bytes(raw, policy=policy.default)
+        assert message["To"] == "user@example.com"
+        assert message["Subject"] == "Reset Your Password - CoRATES"
+        assert "Test CoRATES" in message["From"]
+        assert message.get_content_type() == "multipart/alternative"
+
+        text_part = message.get_body(preferencelist=("plain",))
+        html_part = message.get_body(preferencelist=("html",))
+        assert "654321" in text_part.get_content()
+        assert "⚠️ SECURITY NOTICE" in text_part.get_content()
+        assert "reset-password?codeSent=true&code=654321" in html_part.get_content()
+
+    def test_each_message_has_date_and_message_id(self):
+        """Date and a unique Message-ID in the sender's domain are set per message."""
+        skeleton = get_skeleton("verification", "A <a@x.com>")
+
+        first, second = (
+            email.message_from_bytes(skeleton.build("user@example.com", link="l", code="c"), policy=policy.default)
+            for _ in range(2)
+        )
+
+        assert first["Date"] is not None and first["Date"].datetime is not None
+        assert first["Message-ID"].endswith("@x.com>")
+        assert first["Message-ID"] != second["Message-ID"]
+
+    def test_sender_display_name_is_encoded(self):
+        """Non-ASCII and comma-containing display names yield a valid From header."""
+        for name in ("Équipe CoRATES", "CoRATES, Team"):
+            with patch.object(settings, 'EMAIL_FROM_NAME', name), \
+                 patch.object(settings, 'EMAIL_FROM', 'team@example.com'):
+                raw = build_templated_message("verification", "user@example.com", link="l", code="c")
+
+            raw.split(b"\r\n\r\n", 1)[0].decode("ascii")  # headers are plain ASCII
+            message = email.message_from_bytes(raw, policy=policy.default)
+            [address] = message["From"].addresses
+            assert address.display_name == name
+            assert address.addr_spec == "team@example.com"
+
+    def test_recipient_header_injection_stripped(self):
+        """CR/LF in the recipient cannot add headers."""
+        raw = get_skeleton("verification", "A <a@x.com>").build(
+            "user@example.com\r\nBcc: evil@example.com", link="l", code="c"
+        )
+
+        message = email.message_from_bytes(raw, policy=policy.default)
+        assert message["Bcc"] is None
@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from starlette.requests import Request
+
+from app.utils.etags import checklist_etag, etag_matches, parse_if_none_match, same_etag
+
+
+def request_with(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def checklist(**overrides):
+    fields = dict(
+        id=uuid.UUID(int=1),
+        updated_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        completed_at=None,
+        reviewer_id=uuid.UUID(int=2),
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+class TestChecklistEtag:
+    """Test cases for checklist ETags."""
+
+    def test_etag_is_weak_and_stable(self):
+        """The same version always yields the same weak ETag."""
+        etag = checklist_etag(checklist())
+
+        assert etag.startswith('W/"') and etag.endswith('"')
+        assert etag == checklist_etag(checklist())
+
+    def test_etag_changes_with_version(self):
+        """Answer writes, completion and reassignment all change the ETag."""
+        base = checklist_etag(checklist())
+        updated = checklist_etag(checklist(updated_at=datetime(2025, 1, 1, 0, 0, 0, 1, tzinfo=timezone.utc)))
+        completed = checklist_etag(checklist(completed_at=datetime(2025, 1, 2, tzinfo=timezone.utc)))
+        unassigned = checklist_etag(checklist(reviewer_id=None))
+
+        assert len({base, updated, completed, unassigned}) == 4
+
+    def test_same_instant_in_other_zone_matches(self):
+        """updated_at is compared as an instant, whatever zone the driver returns."""
+        other_zone = datetime(2025, 1, 1, 2, tzinfo=timezone(timedelta(hours=2)))
+
+        assert checklist_etag(checklist(updated_at=other_zone)) == checklist_etag(checklist())
+
+
+class TestIfNoneMatch:
+    """Test cases for If-None-Match handling."""
+
+    def test_weak_comparison(self):
+        """Weak and strong forms of the same tag match."""
+        etag = 'W/"abc"'
+
+        assert etag_matches(request_with('"abc"'), etag)
+        assert etag_matches(request_with('W/"abc"'), etag)
+        assert same_etag(etag, '"abc"')
+
+    def test_lists_and_wildcard(self):
+        """Any tag of a list, or *, matches."""
+        assert etag_matches(request_with('W/"x", W/"abc"'), 'W/"abc"')
+        assert etag_matches(request_with("*"), 'W/"abc"')
+        assert parse_if_none_match(' W/"a" ,"b",') == {'"a"', '"b"'}
+
+    def test_no_header_or_other_tag(self):
+        """A missing header, a different tag or no client tag never matches."""
+        assert not etag_matches(request_with(), 'W/"abc"')
+        assert not etag_matches(request_with('W/"abd"'), 'W/"abc"')
+        assert not same_etag('W/"abc"', None)
@@ -0,0 +1,38 @@
+import sys
+
+from app.utils.lazy import lazy_import
+from benchmarks.cold_start import DEFERRED, eager_deferred, import_profile
+
+
+class TestLazyImport:
+    """Test cases for deferred module imports."""
+
+    def test_module_loads_on_first_attribute(self, monkeypatch):
+        """The module body runs when an attribute is first used."""
+        monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+
+        module = lazy_import("colorsys")
+        assert type(module).__name__ == "_LazyModule"
+
+        assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert type(module).__name__ == "module"
+
+    def test_imported_module_is_returned(self):
+        """Already imported modules are not wrapped again."""
+        assert lazy_import("json") is sys.modules["json"]
+
+
+class TestImportTime:
+    """Import-time hygiene of app.main.
+
+    The wall-clock budget is checked by ``python -m benchmarks.cold_start``,
+    which exits non-zero over budget; it is too noise-sensitive for the suite.
+    """
+
+    def test_deferred_stacks_are_not_imported(self):
+        """The HTTP client, SMTP and docs stacks load on first use, not at import."""
+        profile = import_profile()
+
+        assert "app.main" in profile
+        assert eager_deferred(profile) == []
+        assert set(DEFERRED) >= {"httpx", "aiosmtplib", "scalar_fastapi"}
@@ -0,0 +1,129 @@
+import app.models  # noqa: F401  registers every table on Base.metadata
+from app.db.base import Base
+from app.utils.index_advisor import (
+    ForeignKeyInfo,
+    IndexInfo,
+    StatementInfo,
+    TableInfo,
+    advise,
+    compared_columns,
+    missing_indexes,
+    redundant_indexes,
+)
+
+
+def model_indexes():
+    """The indexes the models declare, primary keys included, as the advisor sees them."""
+    indexes = []
+    for table in Base.metadata.sorted_tables:
+        indexes.append(IndexInfo(
+            table=table.name,
+            name=f"{table.name}_pkey",
+            columns=tuple(column.name for column in table.primary_key.columns),
+            unique=True,
+            primary=True,
+            scans=1,
+        ))
+        for index in table.indexes:
+            indexes.append(IndexInfo(
+                table=table.name,
+                name=index.name,
+                columns=tuple(column.name for column in index.columns),
+                unique=index.unique,
+                partial=index.dialect_options["postgresql"]["where"] is not None,
+                scans=1,
+            ))
+    return indexes
+
+
+def model_foreign_keys():
+    return [
+        ForeignKeyInfo(table=table.name, name=fk.name or fk.column_keys[0], columns=tuple(fk.column_keys))
+        for table in Base.metadata.sorted_tables
+        for fk in table.foreign_key_constraints
+    ]
+
+
+class TestIndexAdvisor:
+    """Test cases for the index advisor's analysis."""
+
+    def test_prefix_of_wider_index_is_redundant(self):
+        """A plain index leading another index or the primary key is reported."""
+        indexes = [
+            IndexInfo("checklist_answers", "ix_a", ("checklist_id",)),
+            IndexInfo("checklist_answers", "ix_b", ("checklist_id", "question_key")),
+            IndexInfo("project_members", "project_members_pkey", ("project_id", "user_id"), unique=True, primary=True),
+            IndexInfo("project_members", "ix_c", ("project_id",)),
+            IndexInfo("project_members", "ix_d", ("user_id",)),
+        ]
+
+        assert {finding.index for finding in redundant_indexes(indexes)} == {"ix_a", "ix_c"}
+
+    def test_identical_indexes_keep_one(self):
+        """Of two identical plain indexes only one is reported."""
+        indexes = [IndexInfo("reviews", "ix_a", ("project_id",)), IndexInfo("reviews", "ix_b", ("project_id",))]
+
+        assert [finding.index for finding in redundant_indexes(indexes)] == ["ix_b"]
+
+    def test_unused_skips_constraint_indexes(self):
+        """Unique and primary key indexes are never reported as unused."""
+        indexes = [
+            IndexInfo("users", "users_pkey", ("id",), unique=True, primary=True),
+            IndexInfo("users", "ix_users_email", ("email",), unique=True),
+            IndexInfo("checklists", "ix_checklists_reviewer_id", ("reviewer_id",)),
+        ]
+
+        findings = advise(indexes, [], [], [])
+
+        assert [(finding.kind, finding.index) for finding in findings] == [("unused", "ix_checklists_reviewer_id")]
+
+    def test_compared_columns_from_sqlalchemy_sql(self):
+        """Filters, IN lists and join conditions are extracted, aliases included."""
+        query = (
+            "SELECT checklists.id FROM checklists JOIN reviews AS reviews_1 ON reviews_1.id = checklists.review_id "
+            "WHERE checklists.reviewer_id = $1::UUID AND checklists.type IN ($2::VARCHAR)"
+        )
+
+        assert compared_columns(query) == {
+            ("reviews_1", "id"),
+            ("checklists", "review_id"),
+            ("checklists", "reviewer_id"),
+            ("checklists", "type"),
+        }
+
+    def test_missing_index_for_statement_and_foreign_key(self):
+        """Unindexed foreign keys and compared columns are suggested, heaviest first."""
+        indexes = [IndexInfo("checklists", "checklists_pkey", ("id",), unique=True, primary=True)]
+        foreign_keys = [ForeignKeyInfo("checklists", "checklists_review_id_fkey", ("review_id",))]
+        statements = [
+            StatementInfo("SELECT 1 FROM checklists WHERE checklists.review_id = $1", calls=50, total_ms=5.0),
+            StatementInfo("SELECT 1 FROM checklists_1 WHERE checklists_1.completed_at IS NULL", calls=10, total_ms=1.0),
+            StatementInfo("SELECT 1 FROM checklists WHERE checklists.type = $1", calls=90, total_ms=9.0),
+        ]
+
+        findings = missing_indexes(indexes, foreign_keys, statements)
+
+        assert [(finding.table, finding.columns) for finding in findings] == [
+            ("checklists", ("review_id",)),
+            ("checklists", ("type",)),
+            ("checklists", ("completed_at",)),
+        ]
+
+    def test_sequential_scans_need_enough_rows(self):
+        """Only tables above the row threshold are reported for sequential scans."""
+        tables = [
+            TableInfo("seed_state", seq_scan=100, seq_tup_read=100, idx_scan=0, live_rows=1),
+            TableInfo("checklist_answers", seq_scan=40, seq_tup_read=80000, idx_scan=5, live_rows=2000),
+        ]
+
+        findings = advise([], tables, [], [], min_rows=1000)
+
+        assert [finding.table for finding in findings] == ["checklist_answers"]
+
+    def test_models_declare_no_redundant_indexes(self):
+        """The schema the models declare has no index covered by another one."""
+        assert redundant_indexes(model_indexes()) == []
+
+    def test_models_index_every_foreign_key(self):
+        """Every foreign key leads some index, so cascades and joins do not scan."""
+        assert missing_indexes(model_indexes(), model_foreign_keys(), []) == []
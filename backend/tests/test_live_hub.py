@@ -0,0 +1,311 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from starlette.websockets import WebSocketDisconnect
+
+from app import main
+from app.api.v1.endpoints import live as live_endpoint
+from app.api.v1.endpoints.live import patch_checklist_allowed, subprotocol_token
+from app.core.config import settings
+from app.core import live_hub as live_hub_module
+from app.core.live_hub import CHANNEL, MAX_NOTIFY_BYTES, LiveHub, Peer, notify_payloads
+from app.schemas.live import AnswerPatchMessage, PresenceMessage, live_message_adapter
+from app.utils.auth import create_access_token
+
+REVIEW = uuid.UUID(int=1)
+CHECKLIST = str(uuid.UUID(int=2))
+
+
+class FakeListener:
+    def __init__(self):
+        self.channels = []
+        self.notified = []
+
+    async def listen(self, channel, handler, on_reconnect=None):
+        self.channels.append(channel)
+
+    async def notify(self, channel, payload):
+        self.notified.append((channel, payload))
+        return True
+
+
+def make_peer(sent=None, flush_interval=0.01):
+    sent = sent if sent is not None else []
+
+    async def send(text):
+        sent.append(json.loads(text))
+
+    return Peer(uuid.uuid4(), "Reviewer", send, flush_interval)
+
+
+def patch(question_key, answers):
+    return {"checklist_id": CHECKLIST, "question_key": question_key, "answers": answers, "critical": False}
+
+
+class TestPeer:
+    """Test cases for per-connection batching."""
+
+    def test_patches_to_same_question_coalesce(self):
+        """Only the latest patch per question is kept until the next frame."""
+        peer = make_peer()
+        peer.enqueue([patch("q1", [[True]])], {})
+        peer.enqueue([patch("q1", [[False]]), patch("q2", [[True]])], {})
+
+        frame = peer.take()
+
+        assert frame["type"] == "batch"
+        assert [(p["question_key"], p["answers"]) for p in frame["patches"]] == [("q1", [[False]]), ("q2", [[True]])]
+        assert peer.take()["patches"] == []
+
+    async def test_burst_is_sent_as_one_frame(self):
+        """Messages arriving within the flush interval go out together."""
+        sent = []
+        peer = make_peer(sent, flush_interval=0.05)
+        sender = asyncio.create_task(peer.run_sender())
+        for n in range(20):
+            peer.enqueue([patch(f"q{n % 4 + 1}", [[n % 2 == 0]])], {})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.1)
+        sender.cancel()
+
+        assert len(sent) == 1
+        assert len(sent[0]["patches"]) == 4
+
+    async def test_sender_stops_when_send_fails(self):
+        """A send on a closed socket ends the sender task without an unretrieved exception."""
+        async def send(text):
+            raise RuntimeError("Cannot call send once a close message has been sent")
+
+        peer = Peer(uuid.uuid4(), "Reviewer", send, 0.01)
+        sender = asyncio.create_task(peer.run_sender())
+        peer.enqueue([patch("q1", [[True]])], {})
+
+        await asyncio.wait_for(sender, 1)
+
+        assert sender.exception() is None
+
+
+class TestLiveHub:
+    """Test cases for rooms and the NOTIFY bridge."""
+
+    async def test_publish_reaches_room_except_origin(self):
+        """Patches go to the other peers of the same review only."""
+        hub = LiveHub(FakeListener(), bridge=False, flush_interval=0.01)
+        author, collaborator, elsewhere = make_peer(), make_peer(), make_peer()
+        await hub.join(REVIEW, author)
+        await hub.join(REVIEW, collaborator)
+        await hub.join(uuid.UUID(int=99), elsewhere)
+        for peer in (author, collaborator, elsewhere):
+            peer.take()
+
+        hub.publish(REVIEW, patches=[patch("q1", [[True]])], origin=author.id)
+
+        assert author.take()["patches"] == []
+        assert len(collaborator.take()["patches"]) == 1
+        assert elsewhere.take()["patches"] == []
+
+    async def test_join_and_leave_update_presence(self):
+        """Joiners see who is present, and others see joins and leaves."""
+        hub = LiveHub(FakeListener(), bridge=False, flush_interval=0.01)
+        first, second = make_peer(), make_peer()
+        assert await hub.join(REVIEW, first) == {}
+
+        present = await hub.join(REVIEW, second)
+        assert list(present) == [first.id]
+        assert first.take()["presence"][second.id]["name"] == "Reviewer"
+
+        hub.leave(REVIEW, second)
+        assert first.take()["presence"] == {second.id: None}
+        hub.leave(REVIEW, first)
+        assert hub.rooms == {} and hub.presence == {}
+
+    async def test_bridge_relays_to_other_workers(self):
+        """Batches published on one worker are delivered by another."""
+        listener_a, listener_b = FakeListener(), FakeListener()
+        hub_a = LiveHub(listener_a, bridge=True, flush_interval=0.01)
+        hub_b = LiveHub(listener_b, bridge=True, flush_interval=0.01)
+        remote = make_peer()
+        await hub_b.join(REVIEW, remote)
+        remote.take()
+        author = make_peer()
+        await hub_a.join(REVIEW, author)
+
+        hub_a.publish(REVIEW, patches=[patch("q1", [[True]])], origin=author.id)
+        await hub_a.flush_outbox()
+        for channel, payload in listener_a.notified:
+            assert channel == CHANNEL
+            hub_a.receive(payload)  # own messages are ignored
+            hub_b.receive(payload)
+        await hub_a.stop()
+        await hub_b.stop()
+
+        frame = remote.take()
+        assert [p["question_key"] for p in frame["patches"]] == ["q1"]
+        assert author.id in frame["presence"]
+        assert author.take()["patches"] == []
+
+    async def test_remote_presence_is_owned_by_its_worker(self, monkeypatch):
+        """A silent worker's peers expire; re-announcing them is not resent to clients."""
+        now = 1000.0
+        monkeypatch.setattr(live_hub_module.time, "monotonic", lambda: now)
+        listener_a = FakeListener()
+        hub_a = LiveHub(listener_a, bridge=True, flush_interval=0.01, heartbeat_interval=10)
+        hub_b = LiveHub(FakeListener(), bridge=True, flush_interval=0.01, heartbeat_interval=10)
+        local = make_peer()
+        await hub_b.join(REVIEW, local)
+        remote = make_peer()
+        await hub_a.join(REVIEW, remote)
+        await hub_a.flush_outbox()
+        for _, payload in listener_a.notified:
+            hub_b.receive(payload)
+        assert remote.id in local.take()["presence"]
+
+        now += 10
+        hub_a.announce()
+        await hub_a.flush_outbox()
+        hub_b.receive(listener_a.notified[-1][1])
+        hub_b.expire_remote(now)
+        assert local.take()["presence"] == {}
+
+        now += 31
+        hub_b.expire_remote(now)
+        await hub_a.stop()
+        await hub_b.stop()
+
+        assert local.take()["presence"] == {remote.id: None}
+        assert list(hub_b.presence[REVIEW]) == [local.id]
+        assert hub_b.remote == {} and hub_b.remote_seen == {}
+
+    async def test_reconnect_drops_remote_presence(self):
+        """After a LISTEN reconnect remote peers are dropped and local ones re-announced."""
+        listener_a, listener_b = FakeListener(), FakeListener()
+        hub_a = LiveHub(listener_a, bridge=True, flush_interval=0.01)
+        hub_b = LiveHub(listener_b, bridge=True, flush_interval=0.01)
+        local = make_peer()
+        await hub_b.join(REVIEW, local)
+        await hub_b.flush_outbox()
+        listener_b.notified.clear()
+        remote = make_peer()
+        await hub_a.join(REVIEW, remote)
+        await hub_a.flush_outbox()
+        for _, payload in listener_a.notified:
+            hub_b.receive(payload)
+        local.take()
+
+        hub_b.resync_remote()
+        await hub_b.flush_outbox()
+        await hub_a.stop()
+        await hub_b.stop()
+
+        assert local.take()["presence"] == {remote.id: None}
+        [(_, payload)] = listener_b.notified
+        assert list(json.loads(payload)["presence"]) == [local.id]
+
+    async def test_batches_kept_while_bridge_is_down(self):
+        """Batches that could not be relayed are kept, under anything published since."""
+        listener = FakeListener()
+        hub = LiveHub(listener, bridge=True, flush_interval=0.01)
+        await hub.join(REVIEW, make_peer())
+        other_review = uuid.UUID(int=3)
+        await hub.join(other_review, make_peer())
+        hub.publish(REVIEW, patches=[patch("q1", [[True]]), patch("q2", [[True]])])
+
+        async def disconnected(channel, payload):
+            return False
+
+        listener.notify = disconnected
+        await hub.flush_outbox()
+        hub.publish(REVIEW, patches=[patch("q1", [[False]])])
+        del listener.notify
+        await hub.flush_outbox()
+        await hub.stop()
+
+        relayed = [json.loads(payload) for _, payload in listener.notified]
+        assert {message["review_id"] for message in relayed} == {str(REVIEW), str(other_review)}
+        [message] = [message for message in relayed if message["review_id"] == str(REVIEW)]
+        assert [(p["question_key"], p["answers"]) for p in message["patches"]] == [("q1", [[False]]), ("q2", [[True]])]
+        assert hub.outbox == {}
+
+    def test_large_batches_are_split(self):
+        """Relayed batches are split to fit the NOTIFY payload limit."""
+        patches = [patch(f"q{n}", [[True] * 50] * 10) for n in range(40)]
+
+        payloads = list(notify_payloads("worker", REVIEW, {"patches": patches, "presence": {}}))
+
+        assert len(payloads) > 1
+        assert all(len(payload.encode()) <= MAX_NOTIFY_BYTES for payload in payloads)
+        assert sum(len(json.loads(payload)["patches"]) for payload in payloads) == 40
+
+
+class TestLiveMessages:
+    """Test cases for validating client messages."""
+
+    def test_patch_and_presence_are_parsed(self):
+        """The type field selects the message schema."""
+        message = live_message_adapter.validate_json(json.dumps({"type": "patch", **patch("q1", [[True]])}))
+        assert isinstance(message, AnswerPatchMessage)
+
+        message = live_message_adapter.validate_json('{"type": "presence", "state": {"question_key": "q4"}}')
+        assert isinstance(message, PresenceMessage)
+
+    def test_unknown_type_is_rejected(self):
+        """Messages of other types fail validation."""
+        with pytest.raises(ValidationError):
+            live_message_adapter.validate_json('{"type": "delete"}')
+
+
+class TestPatchChecklists:
+    """Test cases for restricting patches to the review's checklists."""
+
+    async def test_foreign_checklist_is_rejected(self, monkeypatch):
+        """Unknown checklists are reloaded once, then rejected without further queries."""
+        loads = []
+        created_later, foreign = uuid.UUID(int=10), uuid.UUID(int=11)
+
+        class FakeSession:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        async def review_checklist_ids(db, review_id):
+            loads.append(review_id)
+            return {uuid.UUID(CHECKLIST), created_later}
+
+        monkeypatch.setattr(live_endpoint, "AsyncSessionLocal", FakeSession)
+        monkeypatch.setattr(live_endpoint, "review_checklist_ids", review_checklist_ids)
+        known, rejected = {uuid.UUID(CHECKLIST)}, set()
+
+        assert await patch_checklist_allowed(REVIEW, uuid.UUID(CHECKLIST), known, rejected)
+        assert loads == []
+        assert await patch_checklist_allowed(REVIEW, created_later, known, rejected)
+        for _ in range(3):
+            assert not await patch_checklist_allowed(REVIEW, foreign, known, rejected)
+        assert loads == [REVIEW, REVIEW]
+
+
+class TestLiveAuthentication:
+    """Test cases for passing the access token to the live session."""
+
+    def test_token_is_taken_from_subprotocols(self):
+        """The token is the second of the offered ["bearer", token] subprotocols."""
+        assert subprotocol_token(["bearer", "abc.def.ghi"]) == "abc.def.ghi"
+        assert subprotocol_token(["abc.def.ghi"]) is None
+        assert subprotocol_token(["graphql-ws", "abc.def.ghi"]) is None
+        assert subprotocol_token([]) is None
+
+    def test_query_string_token_is_refused(self):
+        """A token in the URL, which would be written to access logs, is not accepted."""
+        token = create_access_token({"sub": str(uuid.uuid4())})
+        client = TestClient(main.app)
+
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect(f"{settings.API_PREFIX}/reviews/{REVIEW}/live?token={token}") as websocket:
+                websocket.receive_text()
+        assert exc_info.value.code == status.WS_1008_POLICY_VIOLATION
@@ -0,0 +1,133 @@
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from app import main
+from app.core.metrics import MetricsRegistry, RequestStats, current_request, scrape_allowed
+from app.event_handlers.db_timing import register_query_timing
+from app.middleware import TimingMiddleware
+
+
+def make_app(registry: MetricsRegistry, engine=None) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(TimingMiddleware, registry=registry)
+
+    @app.post("/items/{item_id}")
+    async def create_item(item_id: int):
+        if engine is not None:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+        return {"id": item_id}
+
+    return app
+
+
+async def request(app: FastAPI, method: str, url: str, **kwargs) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.request(method, url, **kwargs)
+
+
+class TestMetricsRegistry:
+    """Test cases for the Prometheus text registry."""
+
+    def test_render_histogram_is_cumulative(self):
+        """Bucket counts are cumulative and end with +Inf, _sum and _count."""
+        registry = MetricsRegistry()
+        registry.duration.observe(("GET", "/a"), 0.003)
+        registry.duration.observe(("GET", "/a"), 0.2)
+
+        output = registry.render()
+
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/a",le="0.005"} 1' in output
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/a",le="0.25"} 2' in output
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/a",le="+Inf"} 2' in output
+        assert 'http_request_duration_seconds_count{method="GET",route="/a"} 2' in output
+
+    def test_label_values_are_escaped(self):
+        """Quotes and backslashes in label values are escaped."""
+        registry = MetricsRegistry()
+        registry.requests.inc(("GET", 'a"b\\c', "200"))
+
+        assert 'route="a\\"b\\\\c"' in registry.render()
+
+
+class TestTimingMiddleware:
+    """Test cases for the request timing middleware."""
+
+    async def test_server_timing_header_and_route_template(self):
+        """Responses carry Server-Timing and metrics are keyed by route template."""
+        registry = MetricsRegistry()
+        response = await request(make_app(registry), "POST", "/items/42", content=b"abc")
+
+        assert response.status_code == 200
+        assert response.headers["server-timing"].startswith("app;dur=")
+        assert 'desc="0 queries"' in response.headers["server-timing"]
+        assert registry.requests.values == {("POST", "/items/{item_id}", "200"): 1}
+        assert registry.request_bytes.values[("POST", "/items/{item_id}")] == 3
+        assert registry.response_bytes.values[("POST", "/items/{item_id}")] == len(response.content)
+
+    async def test_unmatched_route(self):
+        """Requests that match no route share one label."""
+        registry = MetricsRegistry()
+        response = await request(make_app(registry), "GET", "/missing/1")
+
+        assert response.status_code == 404
+        assert ("GET", "unmatched", "404") in registry.requests.values
+
+    async def test_counts_database_statements(self):
+        """Cursor events are attributed to the request being handled."""
+        engine = create_engine("sqlite://")
+        register_query_timing(engine)
+        register_query_timing(engine)
+        registry = MetricsRegistry()
+
+        response = await request(make_app(registry, engine), "POST", "/items/1")
+
+        assert 'desc="2 queries"' in response.headers["server-timing"]
+        assert 'http_request_db_statements_bucket{method="POST",route="/items/{item_id}",le="2"} 1' in registry.render()
+
+    def test_statements_outside_requests_are_ignored(self):
+        """Queries without an active request do not fail or get recorded."""
+        engine = create_engine("sqlite://")
+        register_query_timing(engine)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert current_request.get() is None
+
+    def test_request_stats_accumulate(self):
+        """Each recorded statement adds to the count and total time."""
+        stats = RequestStats()
+        stats.record_statement("SELECT 1", 0.5)
+        stats.record_statement("SELECT 2", 0.25)
+
+        assert (stats.db_statements, stats.db_time) == (2, 0.75)
+
+
+class TestMetricsEndpoint:
+    """Test cases for who may scrape /metrics."""
+
+    def test_scrape_allowed(self):
+        """Addresses match single hosts and networks; unparseable clients are refused."""
+        allowed = ["127.0.0.1", "::1", "10.0.0.0/8"]
+
+        assert scrape_allowed("127.0.0.1", allowed)
+        assert scrape_allowed("::1", allowed)
+        assert scrape_allowed("::ffff:10.1.2.3", allowed)
+        assert not scrape_allowed("203.0.113.5", allowed)
+        assert not scrape_allowed("testclient", allowed)
+        assert not scrape_allowed(None, allowed)
+
+    async def test_remote_clients_get_not_found(self, monkeypatch):
+        """Only allowed clients are served; everyone else sees a 404."""
+        monkeypatch.setattr(main.settings, "METRICS_ENABLED", True)
+        monkeypatch.setattr(main.settings, "METRICS_ALLOWED_IPS", ["127.0.0.1"])
+
+        for client, status in ((("127.0.0.1", 50000), 200), (("203.0.113.5", 50000), 404)):
+            transport = httpx.ASGITransport(app=main.app, client=client)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                response = await http.get("/metrics")
+            assert response.status_code == status
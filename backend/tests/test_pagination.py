@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    """Test cases for keyset pagination cursors."""
+
+    def test_round_trip_keeps_microseconds(self):
+        """A cursor decodes to exactly the key it was built from."""
+        updated_at = datetime(2025, 3, 4, 5, 6, 7, 891011, tzinfo=timezone.utc)
+        row_id = uuid.uuid4()
+
+        cursor = encode_cursor(updated_at, row_id)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (updated_at, row_id)
+
+    @pytest.mark.parametrize("cursor", ["", "x", "not a cursor", "bm8tc2VwYXJhdG9y", "MjAyNXxub3QtYS11dWlk"])
+    def test_garbage_is_rejected(self, cursor):
+        """Anything encode_cursor did not produce raises ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+    def test_naive_timestamp_is_rejected(self):
+        """Cursors must carry a time zone to compare with timestamptz columns."""
+        cursor = encode_cursor(datetime(2025, 1, 1), uuid.uuid4())
+
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
@@ -0,0 +1,93 @@
+import sys
+import time
+from collections import Counter
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.profiler import MAX_STACKS_PER_ROUTE, TRUNCATED, ProfileStore, RouteProfile, collapse
+from app.middleware import ProfilerMiddleware
+
+
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def make_app(store: ProfileStore, **kwargs) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilerMiddleware, store=store, interval_ms=1, **kwargs)
+
+    @app.get("/hash/{n}")
+    async def hash_endpoint(n: int):
+        busy_wait(0.05)
+        return {"n": n}
+
+    return app
+
+
+async def get(app: FastAPI, url: str, **kwargs) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(url, **kwargs)
+
+
+class TestCollapse:
+    """Test cases for stack collapsing."""
+
+    def test_stack_is_cut_at_root(self):
+        """Frames above the root are dropped and order is outermost first."""
+        def inner(root):
+            return collapse(sys._getframe(), root)
+
+        def outer():
+            return inner(sys._getframe())
+
+        assert outer() == (
+            "tests.test_profiler.TestCollapse.test_stack_is_cut_at_root.<locals>.outer",
+            "tests.test_profiler.TestCollapse.test_stack_is_cut_at_root.<locals>.inner",
+        )
+
+    def test_root_not_on_stack(self):
+        """Samples from unrelated stacks are rejected."""
+        def other():
+            return sys._getframe()
+
+        assert collapse(sys._getframe(), other()) is None
+
+    def test_distinct_stacks_are_bounded(self):
+        """New stacks beyond the limit are folded into one bucket."""
+        profile = RouteProfile()
+        profile.add(Counter({(f"f{i}",): 1 for i in range(MAX_STACKS_PER_ROUTE + 3)}))
+
+        assert len(profile.stacks) == MAX_STACKS_PER_ROUTE + 1
+        assert profile.stacks[TRUNCATED] == 3
+        assert profile.samples == MAX_STACKS_PER_ROUTE + 3
+
+
+class TestProfilerMiddleware:
+    """Test cases for the sampling profiler middleware."""
+
+    async def test_header_token_profiles_request(self):
+        """A request with the profiling token is sampled and stored per route."""
+        store = ProfileStore()
+        app = make_app(store, sample_rate=0, token="secret")
+
+        response = await get(app, "/hash/1", headers={"X-Profile": "secret"})
+
+        assert response.status_code == 200
+        assert store.summary()[0]["route"] == "GET /hash/{n}"
+        assert "test_profiler.busy_wait" in store.collapsed("GET /hash/{n}")
+        assert store.collapsed().startswith("GET /hash/{n};")
+
+    async def test_unsampled_requests_are_not_profiled(self):
+        """Without sampling or a valid token nothing is recorded."""
+        store = ProfileStore()
+        app = make_app(store, sample_rate=0, token="secret")
+
+        await get(app, "/hash/1")
+        await get(app, "/hash/1", headers={"X-Profile": "wrong"})
+
+        assert store.summary() == []
+        assert store.collapsed() == ""
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from app.core import project_events as project_events_module
+from app.core.listener import PgListener, listener_dsn
+from app.core.project_events import CHANNEL, RESYNC, ProjectEvents, Subscription, format_event
+
+PROJECT_A = uuid.UUID(int=1)
+PROJECT_B = uuid.UUID(int=2)
+
+
+class FakeListener:
+    def __init__(self, connected=True):
+        self.channels = []
+        self.connected = asyncio.Event()
+        if connected:
+            self.connected.set()
+
+    async def listen(self, channel, handler, on_reconnect=None):
+        self.channels.append(channel)
+
+
+def notification(project_id, **fields):
+    payload = {"project_id": str(project_id), "table": "checklist_answers", "op": "update", **fields}
+    return json.dumps(payload)
+
+
+class TestSubscription:
+    """Test cases for per-client event queues."""
+
+    async def test_events_are_delivered_in_order(self):
+        """Queued events come out in the order they were pushed."""
+        subscription = Subscription(PROJECT_A, max_queued=10)
+        subscription.push({"table": "checklists", "n": 1})
+        subscription.push({"table": "checklists", "n": 2})
+
+        assert (await subscription.get(timeout=1))["n"] == 1
+        assert (await subscription.get(timeout=1))["n"] == 2
+
+    async def test_get_times_out_when_idle(self):
+        """An idle subscription returns None so the stream can send a keep-alive."""
+        subscription = Subscription(PROJECT_A, max_queued=10)
+
+        assert await subscription.get(timeout=0.01) is None
+
+    async def test_slow_client_is_told_to_resync(self):
+        """A full queue is replaced by a single resync event instead of growing."""
+        subscription = Subscription(PROJECT_A, max_queued=3)
+        for n in range(5):
+            subscription.push({"table": "checklists", "n": n})
+
+        assert subscription.queue.qsize() <= 3
+        events = [await subscription.get(timeout=1) for _ in range(subscription.queue.qsize())]
+        assert RESYNC in events
+        assert subscription.dropped > 0
+
+
+class TestProjectEvents:
+    """Test cases for routing notifications to projects."""
+
+    async def test_events_reach_only_their_project(self):
+        """Subscribers of other projects do not see the event."""
+        events = ProjectEvents(FakeListener(), max_queued=10)
+        a = await events.subscribe(PROJECT_A)
+        b = await events.subscribe(PROJECT_B)
+
+        events.dispatch(notification(PROJECT_A, question_key="q1"))
+
+        assert (await a.get(timeout=1))["question_key"] == "q1"
+        assert await b.get(timeout=0.01) is None
+
+    async def test_single_listen_for_many_subscribers(self):
+        """All subscriptions share one LISTEN registration."""
+        fake = FakeListener()
+        events = ProjectEvents(fake, max_queued=10)
+        for _ in range(50):
+            await events.subscribe(PROJECT_A)
+
+        assert fake.channels == [CHANNEL]
+
+    async def test_subscribe_waits_for_listen(self, monkeypatch):
+        """No subscription is handed out before LISTEN is active."""
+        fake = FakeListener(connected=False)
+        events = ProjectEvents(fake, max_queued=10)
+        monkeypatch.setattr(project_events_module, "CONNECT_TIMEOUT", 0.01)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await events.subscribe(PROJECT_A)
+        assert events.subscriptions == {}
+
+        fake.connected.set()
+        subscription = await events.subscribe(PROJECT_A)
+
+        assert events.subscriptions == {PROJECT_A: {subscription}}
+        assert fake.channels == [CHANNEL]
+
+    async def test_unsubscribe_removes_empty_projects(self):
+        """The last unsubscribe forgets the project."""
+        events = ProjectEvents(FakeListener(), max_queued=10)
+        subscription = await events.subscribe(PROJECT_A)
+
+        events.unsubscribe(subscription)
+
+        assert events.subscriptions == {}
+
+    async def test_reconnect_resyncs_everyone(self):
+        """After a LISTEN reconnect every subscriber is told to resync."""
+        events = ProjectEvents(FakeListener(), max_queued=10)
+        a = await events.subscribe(PROJECT_A)
+        b = await events.subscribe(PROJECT_B)
+
+        events.resync_all()
+
+        assert await a.get(timeout=1) == RESYNC
+        assert await b.get(timeout=1) == RESYNC
+
+    async def test_malformed_notification_is_ignored(self):
+        """Payloads without a project id are dropped."""
+        events = ProjectEvents(FakeListener(), max_queued=10)
+        subscription = await events.subscribe(PROJECT_A)
+
+        events.dispatch(json.dumps({"table": "checklists"}))
+
+        assert await subscription.get(timeout=0.01) is None
+
+
+class TestFormatEvent:
+    """Test cases for text/event-stream framing."""
+
+    def test_event_name_is_table(self):
+        """The table becomes the event name and the rest the data line."""
+        text = format_event({"table": "checklist_answers", "question_key": "q1"})
+
+        assert text == 'event: checklist_answers\ndata: {"question_key":"q1"}\n\n'
+
+
+class TestPgListener:
+    """Test cases for the shared LISTEN connection's dispatch."""
+
+    def test_failing_handler_does_not_stop_others(self):
+        """One handler raising does not keep the notification from the rest."""
+        pg_listener = PgListener("postgresql://localhost/x")
+        received = []
+
+        def broken(payload):
+            raise ValueError(payload)
+
+        pg_listener.handlers["changes"] = [broken, received.append]
+        pg_listener.dispatch("changes", "payload")
+
+        assert received == ["payload"]
+
+    def test_dsn_drops_sqlalchemy_driver(self):
+        """The asyncpg DSN is the database URL without the +asyncpg driver."""
+        assert listener_dsn("postgresql+asyncpg://u:p@db:5432/app") == "postgresql://u:p@db:5432/app"
@@ -0,0 +1,130 @@
+"""
+Query budget and N+1 detection tests.
+
+The unit tests run anywhere; the endpoint tests need the API server running
+with QUERY_DEBUG=true and are skipped otherwise.
+"""
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from app.core.metrics import MetricsRegistry, RequestStats
+from app.core.query_budget import QUERY_BUDGETS, check_request
+from app.event_handlers.db_timing import register_query_timing
+from app.middleware import TimingMiddleware
+from tests.helpers.api_client import QueryBudgetExceeded, check_query_budget
+from tests.helpers.auth import create_project, create_review, assign_reviewer
+from tests.helpers.generators import generate_project_name, generate_review_name
+from tests.helpers.queries import assert_max_queries, assert_no_repeated_queries
+
+
+def stats_for(*statements: str) -> RequestStats:
+    stats = RequestStats(track_statements=True)
+    for statement in statements:
+        stats.record_statement(statement, 0.001)
+    return stats
+
+
+class TestCheckRequest:
+    """Test cases for budget and repeated statement checks."""
+
+    def test_within_budget(self):
+        """Requests within budget only report counts."""
+        headers = dict(check_request("POST", "/api/v1/checklists", stats_for("SELECT 1", "SELECT 2")))
+
+        assert headers == {b"x-query-count": b"2", b"x-query-budget": b"5"}
+
+    def test_budget_exceeded(self):
+        """Going over the route budget is flagged."""
+        stats = stats_for(*(f"SELECT {i}" for i in range(4)))
+        headers = dict(check_request("DELETE", "/api/v1/reviews/{review_id}", stats))
+
+        assert headers[b"x-query-budget-exceeded"] == b"1"
+
+    def test_repeated_statement_shape(self):
+        """The same statement run in a loop is reported, whitespace-insensitively."""
+        stats = stats_for("SELECT * FROM users\n WHERE id = $1", "SELECT * FROM users WHERE id = $1", "SELECT * FROM  users WHERE id = $1")
+        headers = dict(check_request("GET", "/x", stats))
+
+        assert headers[b"x-query-repeated"] == b"3x SELECT * FROM users WHERE id = $1"
+
+    def test_budgets_refer_to_real_routes(self):
+        """Every budget key names an existing method and route template."""
+        from app.main import app
+
+        routes = {f"{method} {route.path}" for route in app.routes for method in getattr(route, "methods", ())}
+
+        assert set(QUERY_BUDGETS) <= routes
+
+
+class TestQueryDebugMiddleware:
+    """Test cases for the middleware in query debug mode."""
+
+    async def test_headers_flag_loop_queries(self):
+        """A per-row lookup loop is reported in the response headers."""
+        engine = create_engine("sqlite://")
+        register_query_timing(engine)
+        app = FastAPI()
+        app.add_middleware(TimingMiddleware, registry=MetricsRegistry(), query_debug=True)
+
+        @app.get("/loop")
+        async def loop():
+            with engine.connect() as conn:
+                for i in range(12):
+                    conn.execute(text("SELECT :i"), {"i": i})
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/loop")
+
+        assert response.headers["x-query-count"] == "12"
+        assert response.headers["x-query-budget-exceeded"] == "1"
+        assert response.headers["x-query-repeated"].startswith("12x SELECT ?")
+        with pytest.raises(QueryBudgetExceeded):
+            check_query_budget(response)
+
+
+@pytest.mark.integration
+class TestEndpointQueryBudgets:
+    """Query counts of endpoints that used to run per-entity lookups."""
+
+    def test_assign_reviewer(self, authenticated_client):
+        """Assigning a reviewer checks permissions in one query"""
+        api_client, user_data, access_token = authenticated_client
+        project = create_project(api_client, generate_project_name())
+        review = create_review(api_client, project["id"], generate_review_name())
+
+        response = api_client.post(f"/api/v1/reviews/{review['id']}/assign/{user_data['id']}")
+
+        assert response.status_code == 201
+        assert_max_queries(response, 3)
+        assert_no_repeated_queries(response)
+
+    def test_create_checklist(self, authenticated_client):
+        """Creating a checklist looks up the review and assignment together"""
+        api_client, user_data, access_token = authenticated_client
+        project = create_project(api_client, generate_project_name())
+        review = create_review(api_client, project["id"], generate_review_name())
+
+        response = api_client.post("/api/v1/checklists", json={"review_id": review["id"], "type": "amstar"})
+
+        assert response.status_code == 201
+        assert_max_queries(response, 5)
+        assert_no_repeated_queries(response)
+
+    def test_delete_review_with_checklists(self, authenticated_client):
+        """Deleting a review does not load its checklists one by one"""
+        api_client, user_data, access_token = authenticated_client
+        project = create_project(api_client, generate_project_name())
+        review = create_review(api_client, project["id"], generate_review_name())
+        assign_reviewer(api_client, review["id"], user_data["id"])
+        for _ in range(3):
+            api_client.post("/api/v1/checklists", json={"review_id": review["id"], "type": "amstar"})
+
+        response = api_client.delete(f"/api/v1/reviews/{review['id']}")
+
+        assert response.status_code == 204
+        assert_max_queries(response, 3)
+        assert_no_repeated_queries(response)
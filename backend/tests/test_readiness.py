@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+
+from app import main
+from app.core import readiness as readiness_module
+from app.core.readiness import Readiness, warm_auth, warmup_steps
+
+
+async def get(url: str) -> httpx.Response:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(url)
+
+
+class TestReadiness:
+    """Test cases for the background warm-up."""
+
+    async def test_steps_are_timed_in_order(self):
+        """Each step gets a timing and the worker turns ready after the last one."""
+        calls = []
+
+        async def step_a():
+            calls.append("a")
+
+        async def step_b():
+            assert not state.ready
+            calls.append("b")
+
+        state = Readiness(retry_seconds=0)
+        state.start([("a", step_a), ("b", step_b)])
+        assert state.report()["status"] == "warming_up"
+        await state._task
+
+        assert calls == ["a", "b"]
+        assert state.ready
+        assert list(state.timings) == ["a", "b", "total"]
+        assert state.report()["status"] == "ready"
+
+    async def test_failing_step_is_retried(self):
+        """A step that fails, e.g. while the database is down, is retried until it succeeds."""
+        attempts = []
+        retried = asyncio.Event()
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                retried.set()
+                raise ConnectionRefusedError("database is starting up")
+
+        state = Readiness(retry_seconds=0)
+        state.start([("database", flaky)])
+        await retried.wait()
+        assert state.report() == {"status": "warming_up", "warmup_ms": {}, "retrying": "database"}
+        await state._task
+
+        assert len(attempts) == 3
+        assert state.ready
+        assert "retrying" not in state.report()
+
+    async def test_stop_cancels_warm_up(self):
+        """Shutdown cancels a pending warm-up and reports the worker as stopping."""
+        async def forever():
+            await asyncio.Event().wait()
+
+        state = Readiness(retry_seconds=0)
+        state.start([("pool", forever)])
+        await asyncio.sleep(0)
+        await state.stop()
+
+        assert not state.ready
+        assert state.report()["status"] == "stopping"
+
+    def test_steps_follow_settings(self, monkeypatch):
+        """The revocation index always loads first; seeding follows SEED_ON_STARTUP and warm-up can be switched off."""
+        monkeypatch.setattr(readiness_module.settings, "SEED_ON_STARTUP", True)
+        monkeypatch.setattr(readiness_module.settings, "WARMUP_ENABLED", False)
+        assert [name for name, _ in warmup_steps()] == ["revocations", "seed"]
+
+        monkeypatch.setattr(readiness_module.settings, "SEED_ON_STARTUP", False)
+        monkeypatch.setattr(readiness_module.settings, "WARMUP_ENABLED", True)
+        assert [name for name, _ in warmup_steps()] == ["revocations", "database", "pool", "statements", "auth"]
+
+    async def test_auth_warm_up_needs_no_database(self):
+        """The JWT and bcrypt backends load without touching the database."""
+        await warm_auth()
+
+
+class TestHealthEndpoints:
+    """Test cases for the liveness and readiness endpoints."""
+
+    async def test_liveness_is_immediate(self, monkeypatch):
+        """Liveness does not wait for warm-up."""
+        monkeypatch.setattr(main, "readiness", Readiness(retry_seconds=0))
+
+        assert (await get("/healthz/live")).json() == {"status": "ok"}
+        assert (await get("/healthz")).json() == {"status": "ok"}
+
+    async def test_readiness_flips_after_warm_up(self, monkeypatch):
+        """Readiness is 503 while warming up and 200 with the timings afterwards."""
+        state = Readiness(retry_seconds=0)
+        monkeypatch.setattr(main, "readiness", state)
+
+        response = await get("/healthz/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming_up"
+
+        async def step():
+            pass
+
+        state.start([("statements", step)])
+        await state._task
+        response = await get("/healthz/ready")
+
+        assert response.status_code == 200
+        assert set(response.json()["warmup_ms"]) == {"statements", "total"}
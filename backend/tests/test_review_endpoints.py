@@ -14,6 +14,9 @@ from tests.helpers.auth import (
     create_user_and_get_token,
     create_project,
     add_project_member_by_email,
+    create_review,
+    assign_reviewer,
+    create_checklist,
 )
 
 
@@ -209,3 +212,45 @@ class TestCreateReviewEndpoint:
         
         assert response.status_code == 422
 
+
+@pytest.mark.review
+class TestGetReviewEndpoint:
+    """Tests for GET /api/v1/reviews/{review_id}"""
+    
+    def test_returns_review_with_checklists_and_etag(self, authenticated_client):
+        """Review is returned with its checklists and a weak ETag"""
+        api_client, user_data, access_token = authenticated_client
+        project = create_project(api_client, generate_project_name())
+        review = create_review(api_client, project["id"], generate_review_name())
+        assign_reviewer(api_client, review["id"], user_data["id"])
+        checklist = create_checklist(api_client, review["id"])
+        
+        response = api_client.get(f"/api/v1/reviews/{review['id']}")
+        
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('W/"')
+        assert [item["id"] for item in response.json()["checklists"]] == [checklist["id"]]
+    
+    def test_etag_tracks_checklists(self, authenticated_client):
+        """304 while unchanged; a new checklist changes the ETag"""
+        api_client, user_data, access_token = authenticated_client
+        project = create_project(api_client, generate_project_name())
+        review = create_review(api_client, project["id"], generate_review_name())
+        assign_reviewer(api_client, review["id"], user_data["id"])
+        etag = api_client.get(f"/api/v1/reviews/{review['id']}").headers["etag"]
+        
+        unchanged = api_client.get(f"/api/v1/reviews/{review['id']}", headers={"If-None-Match": etag})
+        create_checklist(api_client, review["id"])
+        changed = api_client.get(f"/api/v1/reviews/{review['id']}", headers={"If-None-Match": etag})
+        
+        assert unchanged.status_code == 304
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+    
+    def test_unknown_review_returns_404(self, authenticated_client):
+        """Unknown review ids return 404"""
+        api_client, user_data, access_token = authenticated_client
+        
+        response = api_client.get("/api/v1/reviews/00000000-0000-0000-0000-000000000000")
+        
+        assert response.status_code == 404
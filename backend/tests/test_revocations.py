@@ -0,0 +1,132 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import revocations as revocations_module
+from app.core.revocations import RevocationIndex, revocations
+from app.core.listener import PgListener
+from app.utils.auth import create_access_token, create_refresh_token, verify_token
+from app.utils.refresh_tokens import REVOKE_FAMILY, REVOKE_USER, rotate_refresh_token
+
+
+def make_index(retention_seconds: float = 60.0) -> RevocationIndex:
+    return RevocationIndex(PgListener("postgresql://localhost/unused"), retention_seconds)
+
+
+class TestRevocationIndex:
+    """Test cases for the in-memory revoked family index."""
+
+    def test_revoked_families_are_found(self):
+        """Added families are revoked; others and tokens without a family are not."""
+        index = make_index()
+        family = uuid.uuid4()
+
+        index.add([family])
+
+        assert index.is_revoked(str(family))
+        assert not index.is_revoked(str(uuid.uuid4()))
+        assert not index.is_revoked(None)
+
+    def test_notifications_are_added(self):
+        """Family ids arriving on the channel are indexed; malformed payloads are ignored."""
+        index = make_index()
+        family = str(uuid.uuid4())
+
+        index.receive(family)
+        index.receive("not-a-uuid")
+
+        assert list(index.families) == [family]
+
+    def test_entries_expire_after_retention(self, monkeypatch):
+        """Entries are dropped once every token of the family has expired."""
+        index = make_index(retention_seconds=60)
+        now = 1_000_000.0
+        monkeypatch.setattr(revocations_module.time, "time", lambda: now)
+        index.add(["old"])
+
+        now += 61
+        index.add(["new"])
+
+        assert list(index.families) == ["new"]
+
+    def test_pruning_is_amortised(self, monkeypatch):
+        """Adds do not sweep the index until the oldest entry has expired."""
+        index = make_index(retention_seconds=600)
+        now = 1_000_000.0
+        monkeypatch.setattr(revocations_module.time, "time", lambda: now)
+        index.add(["first"])
+        sweeps = []
+        prune = index._prune
+        monkeypatch.setattr(index, "_prune", lambda at: sweeps.append(at) or prune(at))
+
+        for n in range(100):
+            now += 1
+            index.add([f"family-{n}"])
+        assert sweeps == []
+
+        now += 500
+        index.add(["late"])
+        index.add(["later"])
+
+        assert sweeps == [now]
+        assert "first" not in index.families and "family-99" in index.families
+
+    async def test_start_times_out_without_listen_connection(self, monkeypatch):
+        """start() fails instead of hanging when LISTEN never connects, so readiness retries it."""
+        index = make_index()
+        channels = []
+
+        async def listen(channel, handler, on_reconnect=None):
+            channels.append(channel)
+
+        monkeypatch.setattr(index.listener, "listen", listen)
+        monkeypatch.setattr(revocations_module, "CONNECT_TIMEOUT", 0.01)
+
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                await index.start()
+        assert channels == [revocations_module.CHANNEL]
+
+
+class TestTokenRevocation:
+    """Revoked sign-ins are rejected by verify_token without a query."""
+
+    def test_access_token_of_revoked_family_is_rejected(self, monkeypatch):
+        """Access and refresh tokens carrying a revoked family fail verification."""
+        monkeypatch.setattr(revocations, "families", {})
+        family = str(uuid.uuid4())
+        access = create_access_token({"sub": str(uuid.uuid4()), "fam": family})
+        refresh = create_refresh_token({"sub": str(uuid.uuid4()), "jti": str(uuid.uuid4()), "fam": family})
+        assert verify_token(access)["fam"] == family
+
+        revocations.add([family])
+
+        for token, token_type in ((access, "access"), (refresh, "refresh")):
+            with pytest.raises(HTTPException) as exc:
+                verify_token(token, token_type)
+            assert exc.value.status_code == 401
+            assert exc.value.detail == "Token has been revoked"
+
+    def test_tokens_without_family_still_verify(self):
+        """Tokens minted without a family are not affected by the index."""
+        token = create_access_token({"sub": str(uuid.uuid4())})
+
+        assert verify_token(token)["type"] == "access"
+
+    async def test_pre_rotation_refresh_token_is_rejected(self):
+        """Refresh tokens without jti and family cannot be rotated."""
+        payload = verify_token(create_refresh_token({"sub": str(uuid.uuid4())}), "refresh")
+
+        with pytest.raises(HTTPException) as exc:
+            await rotate_refresh_token(None, payload)
+        assert exc.value.status_code == 401
+
+    def test_revocation_notifies_in_the_same_statement(self):
+        """Revoking updates the rows and notifies each family once."""
+        for statement in (REVOKE_FAMILY, REVOKE_USER):
+            sql = str(statement)
+            assert "UPDATE refresh_tokens SET revoked_at = now()" in sql
+            assert "SELECT DISTINCT family_id FROM revoked" in sql
+            assert "pg_notify(:channel, family_id::text)" in sql
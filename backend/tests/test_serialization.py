@@ -0,0 +1,83 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from asyncpg.pgproto.pgproto import UUID as AsyncpgUUID
+from pydantic import TypeAdapter
+
+from app.api.v1.endpoints.checklists import with_answers
+from app.schemas.checklist import ChecklistAnswerResponse, ChecklistWithAnswersResponse, VersionedChecklistResponse
+from app.schemas.sync import SyncedAnswer
+from app.utils.serialization import ORJSONResponse, rows_to_dicts
+from benchmarks.serialization import fast_body, make_answers, pydantic_body
+
+
+def pydantic_json(model_type, content) -> object:
+    """What FastAPI sends for ``content`` under ``response_model=model_type``."""
+    adapter = TypeAdapter(model_type)
+    return json.loads(adapter.dump_json(adapter.validate_python(content, from_attributes=True)))
+
+
+def orjson_json(content) -> object:
+    return json.loads(ORJSONResponse(content).body)
+
+
+def checklist(**overrides):
+    fields = dict(
+        id=AsyncpgUUID(str(uuid.UUID(int=1))),
+        review_id=uuid.UUID(int=2),
+        reviewer_id=None,
+        type="amstar",
+        completed_at=datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 3, 1, 12, 30, 0, 250, tzinfo=timezone.utc),
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+class TestSerializationParity:
+    """The orjson fast path must produce the same JSON as response_model validation."""
+
+    def test_answer_lists_match(self):
+        """Answer rows, with asyncpg UUIDs and microsecond timestamps, serialize identically."""
+        answers = make_answers(50)
+
+        assert orjson_json(rows_to_dicts(answers, ChecklistAnswerResponse)) == pydantic_json(List[ChecklistAnswerResponse], answers)
+        assert json.loads(fast_body(answers)) == json.loads(pydantic_body(answers))
+
+    @pytest.mark.parametrize("tz", [timezone.utc, timezone(timedelta(0)), timezone(timedelta(hours=-5)), None])
+    def test_datetimes_match(self, tz):
+        """UTC is written with Z, other offsets and naive values as pydantic writes them."""
+        answer = make_answers(1)[0]
+        answer.updated_at = datetime(2025, 1, 2, 3, 4, 5, 600, tzinfo=tz)
+
+        assert orjson_json(rows_to_dicts([answer], ChecklistAnswerResponse)) == pydantic_json(List[ChecklistAnswerResponse], [answer])
+
+    def test_checklist_with_answers_matches(self):
+        """Nested checklist bodies, including extra fields, serialize identically."""
+        answers = make_answers(16)
+        row = checklist()
+
+        assert orjson_json(with_answers(row, answers)) == pydantic_json(ChecklistWithAnswersResponse, with_answers(row, answers))
+        versioned = with_answers(row, answers, VersionedChecklistResponse, etag='W/"abc"')
+        assert orjson_json(versioned) == pydantic_json(VersionedChecklistResponse, versioned)
+        assert list(versioned) == list(VersionedChecklistResponse.model_fields)
+
+    def test_subclassed_schema_fields_are_included(self):
+        """Fields added by subclasses such as SyncedAnswer are copied too."""
+        answer = make_answers(1)[0]
+        answer.sync_version = 42
+
+        body = rows_to_dicts([answer], SyncedAnswer)
+
+        assert body[0]["sync_version"] == 42
+        assert orjson_json(body) == pydantic_json(List[SyncedAnswer], [answer])
+
+    def test_unknown_types_are_rejected(self):
+        """Values orjson cannot encode raise instead of being stringified."""
+        with pytest.raises(TypeError):
+            ORJSONResponse({"value": object()})
+
@@ -0,0 +1,93 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app import server
+from app.server import available_cpus, worker_count
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def children(pid: int) -> set:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return set(f.read().split())
+
+
+def wait_until(predicate, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if predicate():
+                return
+        except (httpx.TransportError, OSError):
+            pass
+        time.sleep(0.1)
+    raise AssertionError("timed out")
+
+
+class TestWorkerCount:
+    """Test cases for sizing the worker pool."""
+
+    def test_explicit_count_wins(self):
+        """A positive WEB_CONCURRENCY is used as is."""
+        assert worker_count(3) == 3
+
+    def test_cgroup_quota_caps_cpus(self, tmp_path, monkeypatch):
+        """A container CPU quota of 1.5 CPUs allows at most 2 workers."""
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("150000 100000\n")
+        monkeypatch.setattr(server, "CGROUP_CPU_MAX", str(cpu_max))
+
+        assert 1 <= worker_count(0) == available_cpus() <= 2
+
+    def test_unlimited_cgroup(self, tmp_path, monkeypatch):
+        """Without a quota every CPU in the affinity mask counts."""
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("max 100000\n")
+        monkeypatch.setattr(server, "CGROUP_CPU_MAX", str(cpu_max))
+
+        assert available_cpus() == len(os.sched_getaffinity(0))
+
+
+@pytest.mark.skipif(not Path("/proc/self/task").exists(), reason="needs /proc to list worker processes")
+class TestServer:
+    """Run the production server with two workers and drive it with signals."""
+
+    def test_restart_and_shutdown(self):
+        """HUP replaces the workers without dropping the socket; TERM exits cleanly."""
+        port = free_port()
+        master = subprocess.Popen(
+            [sys.executable, "-m", "app.server", "--workers", "2", "--host", "127.0.0.1", "--port", str(port)],
+            cwd=BACKEND,
+            env={**os.environ, "SEED_ON_STARTUP": "false"},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        url = f"http://127.0.0.1:{port}/healthz"
+        try:
+            wait_until(lambda: httpx.get(url).status_code == 200 and len(children(master.pid)) == 2)
+            first = children(master.pid)
+
+            master.send_signal(signal.SIGHUP)
+            wait_until(lambda: len(children(master.pid)) == 2 and not children(master.pid) & first)
+            assert httpx.get(url).json() == {"status": "ok"}
+
+            master.send_signal(signal.SIGTERM)
+            assert master.wait(timeout=30) == 0
+        finally:
+            if master.poll() is None:
+                master.kill()
+                master.wait()
@@ -0,0 +1,115 @@
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from sqlalchemy import create_engine, text
+
+from app import main
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry
+from app.core.slow_queries import SlowQueryLog, is_explainable, parameter_shape, slow_query_log
+from app.event_handlers.db_timing import register_query_timing
+from app.middleware import TimingMiddleware
+from app.models.user import User
+from app.utils.auth import get_current_admin, get_current_user
+
+
+class TestSlowQueryLog:
+    """Test cases for the slow statement ring buffer."""
+
+    def test_parameter_shape_hides_values(self):
+        """Only parameter types are kept."""
+        assert parameter_shape(("secret@example.com", 3)) == "(str, int)"
+        assert parameter_shape({"email": "secret@example.com"}) == "{email: str}"
+        assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == "2 x (int, str)"
+
+    def test_only_reads_are_explained(self):
+        """EXPLAIN ANALYZE runs the statement, so writes are never explained."""
+        assert is_explainable("SELECT * FROM checklists WHERE completed_at IS NULL")
+        assert is_explainable("  WITH x AS (SELECT 1) SELECT * FROM x")
+        assert not is_explainable("UPDATE checklists SET completed_at = now()")
+        assert not is_explainable("SELECT * FROM checklists FOR UPDATE")
+
+    def test_ring_buffer_keeps_newest(self):
+        """Old entries are dropped once the buffer is full."""
+        log = SlowQueryLog(size=2)
+        for i in range(3):
+            log.record(f"SELECT {i}", (), 0.2, None)
+
+        assert [entry["statement"] for entry in log.snapshot()] == ["SELECT 2", "SELECT 1"]
+
+    def test_summary_groups_by_statement(self):
+        """The summary aggregates entries per statement, slowest total first."""
+        log = SlowQueryLog(size=10)
+        log.record("SELECT a", (), 0.1, "GET /a")
+        log.record("SELECT b", (), 0.5, "GET /b")
+        log.record("SELECT a", (), 0.2, "GET /c")
+
+        summary = log.summary()
+
+        assert [group["statement"] for group in summary] == ["SELECT b", "SELECT a"]
+        assert summary[1]["count"] == 2
+        assert summary[1]["max_ms"] == 200.0
+        assert summary[1]["routes"] == ["GET /a", "GET /c"]
+
+    async def test_records_calling_route(self, monkeypatch):
+        """Statements over the threshold are logged with the route that ran them."""
+        monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+        slow_query_log.clear()
+        engine = create_engine("sqlite://")
+        register_query_timing(engine)
+        app = FastAPI()
+        app.add_middleware(TimingMiddleware, registry=MetricsRegistry())
+
+        @app.get("/reviews/{review_id}")
+        async def get_review(review_id: int):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT :id"), {"id": review_id})
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/reviews/1")
+
+        entries = slow_query_log.snapshot()
+        slow_query_log.clear()
+        assert entries[0]["statement"] == "SELECT ?"
+        assert entries[0]["parameters"] == "(int)"
+        assert entries[0]["route"] == "GET /reviews/{review_id}"
+
+
+class TestAdminAccess:
+    """Test cases for the admin dependency."""
+
+    async def test_admin_email_allowed(self, monkeypatch):
+        """Users listed in ADMIN_EMAILS pass, case-insensitively."""
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", ["Admin@Example.com"])
+        user = User(email="admin@example.com")
+
+        assert await get_current_admin(user) is user
+
+    async def test_other_users_forbidden(self, monkeypatch):
+        """Everyone else gets 403."""
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", ["admin@example.com"])
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_admin(User(email="user@example.com"))
+        assert exc_info.value.status_code == 403
+
+    async def test_admin_endpoints_closed_without_admins(self, monkeypatch):
+        """With ADMIN_EMAILS unset, every admin endpoint is 403, even for the demo account."""
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", [])
+        monkeypatch.setitem(main.app.dependency_overrides, get_current_user, lambda: User(email="admin@example.com"))
+        prefix = f"{settings.API_PREFIX}/admin"
+        requests = [
+            ("GET", "/slow-queries"),
+            ("DELETE", "/slow-queries"),
+            ("GET", "/profiles"),
+            ("GET", "/profiles/collapsed"),
+            ("DELETE", "/profiles"),
+        ]
+
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for method, path in requests:
+                response = await client.request(method, prefix + path)
+                assert response.status_code == 403, f"{method} {path}"
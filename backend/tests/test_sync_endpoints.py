@@ -0,0 +1,115 @@
+"""
+Offline journal (batch sync) endpoint tests
+"""
+import uuid
+
+import pytest
+from tests.helpers.generators import generate_project_name, generate_review_name
+from tests.helpers.auth import assign_reviewer, create_checklist, create_project, create_review
+
+GRID_A = [[True, False, False, False], [True], [False, True]]
+GRID_B = [[False, True, False, False], [True], [True, False]]
+
+
+def sync(api_client, *operations):
+    response = api_client.post("/api/v1/sync/batch", json={"operations": list(operations)})
+    assert response.status_code == 200, response.text
+    return response.json()["results"]
+
+
+def upsert(checklist_id, grid, base_version=None, question_key="q1"):
+    return {
+        "op_id": str(uuid.uuid4()),
+        "type": "upsert_answer",
+        "checklist_id": checklist_id,
+        "question_key": question_key,
+        "answers": grid,
+        "base_version": base_version,
+    }
+
+
+@pytest.mark.checklist
+class TestSyncBatchEndpoint:
+    """Tests for POST /api/v1/sync/batch"""
+    
+    def _checklist(self, api_client, user_data):
+        project = create_project(api_client, generate_project_name())
+        review = create_review(api_client, project["id"], generate_review_name())
+        assign_reviewer(api_client, review["id"], user_data["id"])
+        return review, create_checklist(api_client, review["id"])
+    
+    def test_journal_is_applied_in_order(self, authenticated_client):
+        """A created checklist can be answered and completed in the same batch"""
+        api_client, user_data, access_token = authenticated_client
+        review, _ = self._checklist(api_client, user_data)
+        checklist_id = str(uuid.uuid4())
+        
+        results = sync(
+            api_client,
+            {"op_id": "1", "type": "create_checklist", "checklist_id": checklist_id, "review_id": review["id"]},
+            {**upsert(checklist_id, GRID_A), "op_id": "2"},
+            {"op_id": "3", "type": "complete_checklist", "checklist_id": checklist_id},
+        )
+        
+        assert [(r["op_id"], r["status"]) for r in results] == [("1", "applied"), ("2", "applied"), ("3", "applied")]
+        assert len({r["sync_version"] for r in results}) == 1
+        answers = api_client.get(f"/api/v1/checklists/{checklist_id}/answers").json()
+        assert [(a["question_key"], a["answers"]) for a in answers] == [("q1", GRID_A)]
+        assert api_client.get(f"/api/v1/checklists/{checklist_id}").json()["completed_at"] is not None
+    
+    def test_stale_base_version_conflicts(self, authenticated_client):
+        """An edit based on an old version is not applied and returns the server's answer"""
+        api_client, user_data, access_token = authenticated_client
+        review, checklist = self._checklist(api_client, user_data)
+        first = sync(api_client, upsert(checklist["id"], GRID_A))[0]
+        sync(api_client, upsert(checklist["id"], GRID_B, base_version=first["sync_version"]))
+        
+        result = sync(api_client, upsert(checklist["id"], GRID_A, base_version=first["sync_version"]))[0]
+        
+        assert result["status"] == "conflict"
+        assert result["current"]["answers"] == GRID_B
+    
+    def test_replayed_journal_is_idempotent(self, authenticated_client):
+        """Sending the same journal twice reports its operations as applied again"""
+        api_client, user_data, access_token = authenticated_client
+        review, checklist = self._checklist(api_client, user_data)
+        operation = upsert(checklist["id"], GRID_A)
+        first = sync(api_client, operation)[0]
+        
+        second = sync(api_client, operation)[0]
+        
+        assert second["status"] == "applied"
+        assert second["sync_version"] == first["sync_version"]
+    
+    def test_rejected_operation_does_not_undo_others(self, authenticated_client):
+        """A rejected operation is reported without rolling back the rest of the batch"""
+        api_client, user_data, access_token = authenticated_client
+        review, checklist = self._checklist(api_client, user_data)
+        
+        results = sync(
+            api_client,
+            {"op_id": "missing", "type": "complete_checklist", "checklist_id": str(uuid.uuid4())},
+            {**upsert(checklist["id"], GRID_A), "op_id": "ok"},
+        )
+        
+        assert [(r["op_id"], r["status"]) for r in results] == [("missing", "rejected"), ("ok", "applied")]
+        assert len(api_client.get(f"/api/v1/checklists/{checklist['id']}/answers").json()) == 1
+    
+    def test_other_reviewers_checklist_is_rejected(self, two_authenticated_clients):
+        """Only the assigned reviewer can write to a checklist"""
+        (user1_data, token1), (user2_data, token2), api_client = two_authenticated_clients
+        api_client.set_token(token1)
+        review, checklist = self._checklist(api_client, user1_data)
+        
+        api_client.set_token(token2)
+        result = sync(api_client, upsert(checklist["id"], GRID_A))[0]
+        
+        assert result["status"] == "rejected"
+    
+    def test_unknown_operation_type_returns_422(self, authenticated_client):
+        """Operations are validated before anything is applied"""
+        api_client, user_data, access_token = authenticated_client
+        
+        response = api_client.post("/api/v1/sync/batch", json={"operations": [{"op_id": "1", "type": "drop_table"}]})
+        
+        assert response.status_code == 422
@@ -2,9 +2,22 @@
 User API endpoint tests
 """
 import pytest
+from app.utils.amstar import QUESTION_KEYS
 from tests.helpers.api_client import APIClient
-from tests.helpers.generators import generate_email, generate_name, generate_strong_password
-from tests.helpers.auth import create_user_and_get_token
+from tests.helpers.generators import (
+    generate_email,
+    generate_name,
+    generate_project_name,
+    generate_review_name,
+    generate_strong_password,
+)
+from tests.helpers.auth import (
+    assign_reviewer,
+    create_checklist,
+    create_project,
+    create_review,
+    create_user_and_get_token,
+)
 
 
 @pytest.mark.user
@@ -285,3 +298,127 @@ class TestSearchUsersEndpoint:
         response = api_client.get("/api/v1/users/search")
         assert response.status_code == 403
 
+
+@pytest.mark.user
+class TestMyChecklistsEndpoint:
+    """Tests for GET /api/v1/users/me/checklists"""
+    
+    def _two_checklists(self, api_client, user_data):
+        project = create_project(api_client, generate_project_name())
+        checklists = []
+        for _ in range(2):
+            review = create_review(api_client, project["id"], generate_review_name())
+            assign_reviewer(api_client, review["id"], user_data["id"])
+            checklists.append(create_checklist(api_client, review["id"]))
+        return checklists
+    
+    def test_pending_excludes_completed(self, authenticated_client):
+        """status=pending lists only checklists that are not completed"""
+        api_client, user_data, access_token = authenticated_client
+        open_checklist, done_checklist = self._two_checklists(api_client, user_data)
+        api_client.put(f"/api/v1/checklists/{done_checklist['id']}/complete")
+        
+        response = api_client.get("/api/v1/users/me/checklists", params={"status": "pending"})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [checklist["id"] for checklist in data] == [open_checklist["id"]]
+        assert data[0]["completed_at"] is None
+        assert data[0]["review_id"] == open_checklist["review_id"]
+    
+    def test_completed_and_all(self, authenticated_client):
+        """status=completed lists completed checklists; no status lists both"""
+        api_client, user_data, access_token = authenticated_client
+        open_checklist, done_checklist = self._two_checklists(api_client, user_data)
+        api_client.put(f"/api/v1/checklists/{done_checklist['id']}/complete")
+        
+        completed = api_client.get("/api/v1/users/me/checklists", params={"status": "completed"}).json()
+        everything = api_client.get("/api/v1/users/me/checklists").json()
+        
+        assert [checklist["id"] for checklist in completed] == [done_checklist["id"]]
+        assert completed[0]["completed_at"] is not None
+        assert {checklist["id"] for checklist in everything} == {open_checklist["id"], done_checklist["id"]}
+    
+    def test_only_own_checklists(self, two_authenticated_clients):
+        """Checklists assigned to other users are not listed"""
+        (user1_data, token1), (user2_data, token2), api_client = two_authenticated_clients
+        api_client.set_token(token1)
+        self._two_checklists(api_client, user1_data)
+        
+        api_client.set_token(token2)
+        response = api_client.get("/api/v1/users/me/checklists", params={"status": "pending"})
+        
+        assert response.status_code == 200
+        assert response.json() == []
+    
+    def test_invalid_status_returns_422(self, authenticated_client):
+        """Unknown status values are rejected"""
+        api_client, user_data, access_token = authenticated_client
+        
+        response = api_client.get("/api/v1/users/me/checklists", params={"status": "archived"})
+        
+        assert response.status_code == 422
+
+
+@pytest.mark.user
+class TestMyQueueEndpoint:
+    """Tests for GET /api/v1/users/me/queue"""
+    
+    def _assigned_checklists(self, api_client, user_data, count):
+        project = create_project(api_client, generate_project_name())
+        checklists = []
+        for _ in range(count):
+            review = create_review(api_client, project["id"], generate_review_name())
+            assign_reviewer(api_client, review["id"], user_data["id"])
+            checklists.append(create_checklist(api_client, review["id"]))
+        return project, checklists
+    
+    def test_queue_includes_review_project_and_progress(self, authenticated_client):
+        """Queue items carry review and project names and answered/total"""
+        api_client, user_data, access_token = authenticated_client
+        project, [checklist] = self._assigned_checklists(api_client, user_data, 1)
+        api_client.post(
+            f"/api/v1/checklists/{checklist['id']}/answers",
+            json={"question_key": "q1", "answers": [[True, False, False, False], [True], [False, True]]}
+        )
+        
+        response = api_client.get("/api/v1/users/me/queue")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["next_cursor"] is None
+        [item] = data["items"]
+        assert item["checklist_id"] == checklist["id"]
+        assert item["project_id"] == project["id"]
+        assert item["project_name"] == project["name"]
+        assert item["answered"] == 1
+        assert item["total"] == len(QUESTION_KEYS)
+    
+    def test_cursor_pages_cover_queue_once(self, authenticated_client):
+        """Following next_cursor visits every checklist exactly once, newest first"""
+        api_client, user_data, access_token = authenticated_client
+        _, checklists = self._assigned_checklists(api_client, user_data, 5)
+        
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            data = api_client.get("/api/v1/users/me/queue", params=params).json()
+            assert len(data["items"]) <= 2
+            seen.extend(item["checklist_id"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        
+        assert sorted(seen) == sorted(checklist["id"] for checklist in checklists)
+        assert seen == [checklist["id"] for checklist in reversed(checklists)]
+    
+    def test_invalid_cursor_returns_400(self, authenticated_client):
+        """A cursor the server did not issue is rejected"""
+        api_client, user_data, access_token = authenticated_client
+        
+        response = api_client.get("/api/v1/users/me/queue", params={"cursor": "garbage"})
+        
+        assert response.status_code == 400